@@ -0,0 +1,227 @@
+# almacenamiento.py
+"""
+Motores de almacenamiento de catálogos.
+
+Todos los catálogos exponen la misma interfaz (CatalogoBase); lo que cambia
+es dónde y cómo se guardan las películas:
+
+    txt     catalogo_peliculas.CatalogoPeliculas → "<nombre>.txt" (formato histórico),
+                                                   o comprimido: ".txt.gz" / ".txt.xz"
+    sqlite  catalogo_sqlite.CatalogoSQLite       → "<nombre>.sqlite" (índices, WAL)
+
+abrir_catalogo() elige el motor: si el catálogo ya existe, el de su archivo;
+si es nuevo, el de la variable de entorno CATALOGO_MOTOR (por defecto "txt").
+"""
+
+import os
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from estadisticas_catalogo import Estadisticas
+from pelicula import Pelicula
+from compresion import EXTENSIONES_TXT
+from utils import BASE_DIR_CATALOGOS, a_minusculas, firma_identidad
+
+# motor → extensión del archivo principal del catálogo
+MOTORES = {"txt": ".txt", "sqlite": ".sqlite"}
+MOTOR_POR_DEFECTO = os.environ.get("CATALOGO_MOTOR", "txt")
+# todas las extensiones con las que se reconoce el archivo de cada motor
+EXTENSIONES_MOTOR = {"txt": EXTENSIONES_TXT, "sqlite": (MOTORES["sqlite"],)}
+
+
+class ResultadoLote(NamedTuple):
+    """Resumen de una carga en lote: cuántas se agregaron y cuántas se omitieron."""
+    agregadas: int
+    omitidas: int
+
+
+class CatalogoBase(ABC):
+    """
+    Interfaz común de un catálogo de películas, sin importar el motor.
+    Las claves son a_minusculas(nombre): no puede haber dos películas con el
+    mismo nombre (sin importar mayúsculas) y el orden A→Z se hace por clave.
+    """
+
+    nombre: str
+    base_dir: str
+    ruta_archivo: str  # archivo principal del catálogo (depende del motor)
+
+    # --- lectura ---
+
+    @abstractmethod
+    def iter_peliculas(self) -> Iterator[Pelicula]:
+        """Todas las películas, en el orden que le resulte más barato al motor."""
+
+    @abstractmethod
+    def iter_ordenado(self) -> Iterator[Pelicula]:
+        """Todas las películas en orden A→Z."""
+
+    @abstractmethod
+    def listar(self, offset: int = 0, limite: Optional[int] = None) -> List[Pelicula]:
+        """Una página del listado A→Z."""
+
+    @abstractmethod
+    def cantidad(self) -> int:
+        """Cuántas películas tiene el catálogo."""
+
+    @abstractmethod
+    def contiene(self, nombre: str) -> bool:
+        """True si ya hay una película con ese nombre (case-insensitive)."""
+
+    @abstractmethod
+    def buscar(self, consulta: str, limite: int = 20, aproximada: bool = True) -> List[Pelicula]:
+        """Búsqueda por título (ver busqueda.IndiceBusqueda)."""
+
+    @abstractmethod
+    def buscar_con_puntaje(self, consulta: str, limite: int = 20,
+                           aproximada: bool = True) -> List[Tuple[Pelicula, float]]:
+        """Como buscar(), con el puntaje de cada resultado (sirve para mezclar catálogos)."""
+
+    def obtener(self, posicion: int) -> Pelicula:
+        """
+        La película en esa posición del listado A→Z (negativa: desde el final,
+        como en una lista). IndexError si no existe. Los motores la resuelven
+        sin armar el listado entero.
+        """
+        if posicion < 0:
+            posicion += self.cantidad()
+        pagina = self.listar(posicion, 1) if posicion >= 0 else []
+        if not pagina:
+            raise IndexError(f"'{self.nombre}' no tiene una película en la posición {posicion}")
+        return pagina[0]
+
+    def claves(self) -> Set[str]:
+        """Claves (a_minusculas(nombre)) de todas las películas del catálogo."""
+        return {a_minusculas(p.nombre) for p in self.iter_peliculas()}
+
+    def estadisticas(self) -> Estadisticas:
+        """
+        Total, películas por año / década / género y años mínimo y máximo.
+        Esta versión recorre el catálogo; los motores la mantienen al día sin recorrer.
+        """
+        return Estadisticas(self.iter_peliculas())
+
+    def filtrar(self, genero: Optional[str] = None, anio_desde: Optional[int] = None,
+                anio_hasta: Optional[int] = None, offset: int = 0,
+                limite: Optional[int] = None) -> List[Pelicula]:
+        """
+        Página del listado A→Z con solo las películas de ese género (sin importar
+        mayúsculas) y/o en ese rango de años (inclusivo). Esta versión recorre
+        todo el catálogo; los motores con índices la reemplazan.
+        """
+        genero = genero.lower() if genero else None
+        coinciden = (
+            p for p in self.iter_ordenado()
+            if (genero is None or p.genero.lower() == genero)
+            and (anio_desde is None or p.anio >= anio_desde)
+            and (anio_hasta is None or p.anio <= anio_hasta)
+        )
+        offset = max(0, offset)
+        return list(islice(coinciden, offset, None if limite is None else offset + max(0, limite)))
+
+    # --- escritura ---
+
+    def validar(self, pelicula: Pelicula) -> None:
+        """
+        Lanza ValueError si este motor no puede guardar esa película. Esta
+        versión acepta cualquiera que se haya podido construir.
+        """
+
+    @abstractmethod
+    def agregar(self, pelicula: Pelicula) -> bool:
+        """Agrega la película si no existe. True si la agregó."""
+
+    @abstractmethod
+    def agregar_muchos(self, peliculas: Iterable[Pelicula]) -> ResultadoLote:
+        """Agrega en lote, descartando duplicadas (contra el catálogo y dentro del lote)."""
+
+    @abstractmethod
+    def eliminar(self, pelicula: Pelicula) -> bool:
+        """Da de baja la película. True si estaba."""
+
+    @abstractmethod
+    def eliminar_muchos(self, peliculas: Iterable[Pelicula]) -> int:
+        """Da de baja varias películas. Retorna cuántas se eliminaron."""
+
+    # --- ciclo de vida ---
+
+    def existe(self) -> bool:
+        return os.path.exists(self.ruta_archivo)
+
+    def firma(self) -> tuple:
+        """
+        Firma de los datos en disco: cambia con cualquier escritura (de este
+        proceso o de otro). Sirve para validar caches externos (ETags, etc.).
+        """
+        return firma_identidad(self.ruta_archivo)
+
+    def crear(self) -> None:
+        """Crea el catálogo vacío en disco (si todavía no existe)."""
+        if not self.existe():
+            open(self.ruta_archivo, "a", encoding="utf-8").close()
+
+    @abstractmethod
+    def eliminar_catalogo(self) -> bool:
+        """Borra el catálogo y todo lo derivado de él. True si existía."""
+
+    # --- memoria (ver registro_catalogos) ---
+
+    def memoria_estimada(self) -> int:
+        """Bytes aproximados que ocupan los caches en memoria."""
+        return 0
+
+    def liberar_memoria(self) -> bool:
+        """Suelta los caches en memoria. False si el catálogo estaba ocupado."""
+        return True
+
+    # --- consultas columnares ---
+
+    def _lector_binario(self):
+        """LectorBinario al día con el catálogo, si el motor tiene uno (si no, None)."""
+        return None
+
+    def vista_columnar(self):
+        """
+        Devuelve una consultas.VistaColumnar con las películas de este catálogo
+        (filtros, agrupaciones y conteos vectorizados). Requiere numpy.
+        """
+        from consultas import VistaColumnar  # import diferido: numpy es opcional
+        return VistaColumnar.desde_instancias([self])
+
+
+# ===================== elección del motor =====================
+
+def motor_de(nombre: str, base_dir: str = BASE_DIR_CATALOGOS) -> str:
+    """Motor del catálogo: el de su archivo si ya existe; si no, MOTOR_POR_DEFECTO."""
+    nombre = (nombre or "catalogo").strip()
+    for motor, extensiones in EXTENSIONES_MOTOR.items():
+        if any(os.path.exists(os.path.join(base_dir, nombre + e)) for e in extensiones):
+            return motor
+    return MOTOR_POR_DEFECTO
+
+
+def abrir_catalogo(nombre: str, base_dir: str = BASE_DIR_CATALOGOS,
+                   motor: Optional[str] = None) -> CatalogoBase:
+    """Crea la instancia del catálogo con el motor que corresponda."""
+    motor = motor or motor_de(nombre, base_dir)
+    if motor == "txt":
+        from catalogo_peliculas import CatalogoPeliculas
+        return CatalogoPeliculas(nombre, base_dir)
+    if motor == "sqlite":
+        from catalogo_sqlite import CatalogoSQLite
+        return CatalogoSQLite(nombre, base_dir)
+    raise ValueError(f"Motor desconocido: {motor} (opciones: {', '.join(MOTORES)})")
+
+
+def nombres_catalogos(base_dir: str = BASE_DIR_CATALOGOS) -> List[str]:
+    """Nombres de todos los catálogos de la carpeta (de cualquier motor), A→Z."""
+    if not os.path.isdir(base_dir):
+        return []
+    nombres = set()
+    extensiones = [e for es in EXTENSIONES_MOTOR.values() for e in es]
+    for archivo in os.listdir(base_dir):
+        for extension in extensiones:
+            if archivo.endswith(extension):
+                nombres.add(archivo[:-len(extension)])
+    return sorted(nombres, key=str.lower)
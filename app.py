@@ -1,8 +1,11 @@
 # app.py
-import os
 from pelicula import Pelicula
-from catalogo_peliculas import CatalogoPeliculas
-from utils import normalizar_espacios, BASE_DIR_CATALOGOS
+from almacenamiento import CatalogoBase
+from biblioteca import BibliotecaCatalogos
+from registro_catalogos import obtener_catalogo, registro
+from utils import normalizar_espacios, activar_volcado_metricas, BASE_DIR_CATALOGOS
+
+PELICULAS_POR_PAGINA = 20  # al elegir una película para eliminar
 
 
 def main():
@@ -14,6 +17,7 @@ def main():
         print("3) Trabajar con un catálogo")
         print("4) Eliminar un catálogo")
         print("5) Salir")
+        print("6) Buscar en todos los catálogos")  # al final: los números de siempre no cambian
 
         op = input("\nElegí una opción: ").strip()
 
@@ -22,7 +26,8 @@ def main():
             if not nombre:
                 print("⚠️ El nombre no puede estar vacío.")
                 continue
-            catalogo = CatalogoPeliculas(nombre)
+            catalogo = obtener_catalogo(nombre)
+            catalogo.crear()
             print(f"✅ Catálogo '{nombre}' creado en {catalogo.ruta_archivo}")
 
         elif op == "2":
@@ -33,7 +38,7 @@ def main():
             if not nombre:
                 print("⚠️ El nombre no puede estar vacío.")
                 continue
-            catalogo = CatalogoPeliculas(nombre)
+            catalogo = obtener_catalogo(nombre)
             submenu_catalogo(catalogo)
 
         elif op == "4":
@@ -42,24 +47,43 @@ def main():
         elif op == "5":
             print("👋 ¡Gracias por usar el Catálogo de Películas!")
             break
+
+        elif op == "6":
+            buscar_en_todos()
         else:
             print("⚠️ Opción inválida. Intentá nuevamente.")
 
 
 def mostrar_catalogos():
-    """Muestra los catálogos disponibles"""
-    if not os.path.exists(BASE_DIR_CATALOGOS):
+    """Muestra los catálogos disponibles, con cuántas películas tiene cada uno"""
+    conteos = BibliotecaCatalogos(BASE_DIR_CATALOGOS).conteos()  # se cuentan en paralelo
+    if not conteos:
         print("📂 No hay catálogos creados todavía.")
         return
 
-    archivos = [f for f in os.listdir(BASE_DIR_CATALOGOS) if f.endswith(".txt")]
-    if not archivos:
-        print("📂 No hay catálogos creados todavía.")
+    print("\n📁 Catálogos disponibles:")
+    for i, (nombre, cantidad) in enumerate(conteos.items(), start=1):
+        print(f"  {i}. {nombre} ({cantidad} películas)")
+
+
+def buscar_en_todos():
+    """Busca un título en todos los catálogos a la vez"""
+    consulta = input("🔎 Título a buscar: ").strip()
+    if not consulta:
+        print("⚠️ La búsqueda no puede estar vacía.")
         return
 
-    print("\n📁 Catálogos disponibles:")
-    for i, a in enumerate(archivos, start=1):
-        print(f"  {i}. {a[:-4]}")
+    biblioteca = BibliotecaCatalogos(BASE_DIR_CATALOGOS)
+    coincidencias = biblioteca.buscar(consulta, limite=20)
+    if not coincidencias:
+        print("❌ No se encontraron coincidencias en ningún catálogo.")
+        return
+
+    print(f"\n🔎 Resultados en {len(biblioteca.tiempos)} catálogos:")
+    for c in coincidencias:
+        print(f"  [{c.catalogo}] {c.pelicula}")
+    catalogo, segundos = biblioteca.mas_lentos(1)[0]
+    print(f"⏱️ El catálogo más lento fue '{catalogo}' ({segundos:.3f} s)")
 
 
 def eliminar_catalogo():
@@ -70,11 +94,12 @@ def eliminar_catalogo():
         print("⚠️ El nombre no puede estar vacío.")
         return
 
-    path = os.path.join(BASE_DIR_CATALOGOS, f"{nombre}.txt")
-    if os.path.exists(path):
+    catalogo = obtener_catalogo(nombre)
+    if catalogo.existe():
         confirm = input(f"¿Seguro que querés eliminar '{nombre}'? (s/n): ").strip().lower()
         if confirm == "s":
-            os.remove(path)
+            catalogo.eliminar_catalogo()
+            registro.descartar(nombre)
             print("🗑️ Catálogo eliminado correctamente.")
         else:
             print("❌ Operación cancelada.")
@@ -82,7 +107,7 @@ def eliminar_catalogo():
         print("⚠️ Ese catálogo no existe.")
 
 
-def submenu_catalogo(catalogo: CatalogoPeliculas):
+def submenu_catalogo(catalogo: CatalogoBase):
     """Submenú para trabajar con un catálogo específico"""
     while True:
         print(f"\n🎞️ === Catálogo activo: {catalogo.nombre} ===")
@@ -90,6 +115,7 @@ def submenu_catalogo(catalogo: CatalogoPeliculas):
         print("2) Listar películas")
         print("3) Eliminar película")
         print("4) Volver al menú principal")
+        print("5) Buscar película")  # al final: los números de siempre no cambian
 
         sub_op = input("\nElegí una opción: ").strip()
 
@@ -133,28 +159,57 @@ def submenu_catalogo(catalogo: CatalogoPeliculas):
 
         # ---------- Eliminar película ----------
         elif sub_op == "3":
-            peliculas = catalogo.listar()
-            if not peliculas:
+            total = catalogo.cantidad()
+            if not total:
                 print("📂 El catálogo está vacío.")
                 continue
 
+            # de a una página: no hace falta listar el catálogo entero para elegir una
             print("\n🎞️ Películas disponibles:")
-            for i, p in enumerate(peliculas, start=1):
-                print(f"  {i}. {p}")
+            offset = 0
+            while True:
+                for i, p in enumerate(catalogo.listar(offset, PELICULAS_POR_PAGINA), start=offset + 1):
+                    print(f"  {i}. {p}")
+                offset += PELICULAS_POR_PAGINA
+                hay_mas = offset < total
+                idx_str = input("\n🗑️ Ingresá el número de la película a eliminar"
+                                + (" (Enter para ver más): " if hay_mas else ": ")).strip()
+                if idx_str or not hay_mas:
+                    break
 
-            idx_str = input("\n🗑️ Ingresá el número de la película a eliminar: ").strip()
             if not idx_str.isdigit():
                 print("⚠️ Valor inválido.")
                 continue
 
             idx = int(idx_str)
-            if not (1 <= idx <= len(peliculas)):
+            if not (1 <= idx <= total):
+                print("⚠️ Número fuera de rango.")
+                continue
+
+            try:
+                peli = catalogo.obtener(idx - 1)  # va directo a esa posición
+            except IndexError:  # otro proceso la borró mientras tanto
                 print("⚠️ Número fuera de rango.")
                 continue
 
-            peli = peliculas[idx - 1]
-            catalogo.eliminar(peli)
-            print(f"🗑️ '{peli}' eliminada correctamente.")
+            if catalogo.eliminar(peli):
+                print(f"🗑️ '{peli}' eliminada correctamente.")
+            else:
+                print("⚠️ Esa película ya no estaba en el catálogo.")
+
+        # ---------- Buscar película ----------
+        elif sub_op == "5":
+            consulta = input("🔎 Buscar (título o parte, sin importar tildes): ").strip()
+            if not consulta:
+                print("⚠️ La búsqueda no puede estar vacía.")
+                continue
+            resultados = catalogo.buscar(consulta)
+            if not resultados:
+                print("🔎 No se encontraron películas.")
+            else:
+                print(f"\n🔎 Resultados para '{consulta}':")
+                for p in resultados:
+                    print(f"  - {p}")
 
         elif sub_op == "4":
             print("↩️ Volviendo al menú principal...")
@@ -164,4 +219,5 @@ def submenu_catalogo(catalogo: CatalogoPeliculas):
 
 
 if __name__ == "__main__":
+    activar_volcado_metricas()
     main()
@@ -0,0 +1,376 @@
+# benchmark.py
+"""
+Benchmarks reproducibles de las operaciones de catálogo (motor txt).
+
+1) Un generador determinista arma catálogos sintéticos de cualquier tamaño
+   (de 1k a 10M líneas) con la mezcla que aparece en catálogos reales:
+   títulos con tildes y signos, líneas viejas de solo nombre y títulos
+   repetidos (a veces con otras mayúsculas). Misma semilla → mismo archivo.
+
+2) Cada caso se mide sobre una copia recién generada, en frío (instancia
+   nueva, sin sidecars), varias repeticiones; se guarda la mejor y la
+   mediana. Aparte se corre una vez más con tracemalloc para el pico de
+   memoria (con tracemalloc activo los tiempos no sirven, por eso va aparte).
+
+   Casos: from_line, iter_peliculas, agregar, listar_pagina, listar_todo, eliminar.
+
+3) Los resultados se guardan en JSON y se pueden comparar contra una base:
+   un caso más lento (o que usa más memoria) que la base más la tolerancia
+   se marca como regresión y el comando termina con código 1.
+
+Uso:
+    python benchmark.py generar catalogos/sintetico.txt 1m
+    python benchmark.py correr --tamanios 1k,100k --salida bench.json
+    python benchmark.py correr --tamanios 1k,100k --base bench_base.json
+    python benchmark.py comparar bench.json bench_base.json --tolerancia 0.3
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from catalogo_peliculas import CatalogoPeliculas
+from pelicula import Pelicula
+
+FORMATO_RESULTADOS = "bench1"
+SEMILLA = 20240601
+TAMANIOS_POR_DEFECTO = "1k,10k,100k"
+REPETICIONES = 3
+TOLERANCIA = 0.25            # 25% más lento (o más memoria) que la base = regresión
+OPERACIONES_ESCRITURA = 200  # altas / bajas por repetición en agregar y eliminar
+TAMANIO_PAGINA = 48          # la misma página que pide la GUI
+LINEAS_POR_TANDA = 100_000   # from_line lee el archivo de a tandas (memoria constante)
+
+# ===================== generador sintético =====================
+
+_PALABRAS = (
+    "El", "La", "Los", "Las", "Un", "Noche", "Corazón", "Canción", "Niño", "Pequeño",
+    "Árbol", "Último", "Sueño", "Viaje", "Misión", "Acción", "Invierno", "Montaña",
+    "Ciudad", "Océano", "Fantasma", "Dragón", "Jardín", "Señor", "Mañana", "Camión",
+    "Pingüino", "Ñandú", "Río", "Héroe", "Música", "Guerra", "Amor", "Tiempo", "Fuego",
+    "Sombra", "Ángel", "Secreto", "Perdido", "Regreso", "Silencio", "Tormenta", "Luz",
+    "de", "del", "en", "y", "sin",
+)
+_SIGNOS = ("", "", "", "", "¿", "¡", "…", ":", "!")
+_GENEROS = (
+    "Drama", "Comedia", "Acción", "Terror", "Animación", "Documental",
+    "Ciencia ficción", "Romántica", "Suspenso", "Infantil",
+)
+
+
+class Mezcla(NamedTuple):
+    """Proporciones de líneas especiales en el catálogo generado."""
+    legado: float = 0.05        # líneas viejas "solo nombre"
+    duplicadas: float = 0.02    # repiten un título anterior (a veces en otras mayúsculas)
+
+
+def _parse_tamanio(texto: str) -> int:
+    """'1k' → 1000, '2.5m' → 2_500_000, '300' → 300."""
+    texto = texto.strip().lower()
+    multiplicador = {"k": 1_000, "m": 1_000_000}.get(texto[-1:], 1)
+    if multiplicador != 1:
+        texto = texto[:-1]
+    return int(float(texto) * multiplicador)
+
+
+def _etiqueta(lineas: int) -> str:
+    for unidad, valor in (("m", 1_000_000), ("k", 1_000)):
+        if lineas >= valor and lineas % valor == 0:
+            return f"{lineas // valor}{unidad}"
+    return str(lineas)
+
+
+def iter_lineas_sinteticas(lineas: int, semilla: int = SEMILLA,
+                           mezcla: Mezcla = Mezcla()) -> Iterator[str]:
+    """Genera 'lineas' líneas de catálogo (sin '\\n'), siempre las mismas para la misma semilla."""
+    rng = random.Random(semilla)
+    recientes: List[str] = []  # títulos candidatos a repetirse (acotado: memoria constante)
+    for i in range(lineas):
+        azar = rng.random()
+        if recientes and azar < mezcla.duplicadas:
+            titulo = rng.choice(recientes)
+            if rng.random() < 0.5:
+                titulo = titulo.upper() if rng.random() < 0.5 else titulo.lower()
+        else:
+            palabras = rng.sample(_PALABRAS, rng.randint(1, 4))
+            signo = rng.choice(_SIGNOS)
+            # el número al final garantiza títulos distintos a cualquier escala
+            titulo = f"{signo}{' '.join(palabras)} {i}"
+            if len(recientes) < 1000:
+                recientes.append(titulo)
+            else:
+                recientes[rng.randrange(1000)] = titulo
+        if mezcla.duplicadas <= azar < mezcla.duplicadas + mezcla.legado:
+            yield titulo
+        else:
+            yield f"{titulo} | {rng.choice(_GENEROS)} | {rng.randint(1920, 2025)}"
+
+
+def generar_catalogo(ruta: str, lineas: int, semilla: int = SEMILLA, mezcla: Mezcla = Mezcla()) -> str:
+    """Escribe el catálogo sintético en 'ruta' (en streaming). Retorna la ruta."""
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    with open(ruta, "w", encoding="utf-8", buffering=1 << 20) as f:
+        for linea in iter_lineas_sinteticas(lineas, semilla, mezcla):
+            f.write(linea + "\n")
+    return ruta
+
+
+# ===================== casos =====================
+
+class Caso(NamedTuple):
+    """
+    preparar(catalogo) corre sin medir y devuelve lo que necesita medir();
+    medir(catalogo, preparado) es lo cronometrado y devuelve cuántas operaciones
+    hizo; si cronometra solo una parte, devuelve (operaciones, segundos medidos).
+    """
+    nombre: str
+    preparar: Callable[[CatalogoPeliculas], object]
+    medir: Callable[[CatalogoPeliculas, object], object]
+
+
+def _nada(catalogo: CatalogoPeliculas) -> None:
+    return None
+
+
+def _medir_from_line(catalogo: CatalogoPeliculas, _) -> Tuple[int, float]:
+    # solo se cronometra el parseo: la lectura de cada tanda queda afuera
+    n, segundos = 0, 0.0
+    with open(catalogo.ruta_archivo, "r", encoding="utf-8") as f:
+        while True:
+            tanda = list(islice(f, LINEAS_POR_TANDA))
+            if not tanda:
+                break
+            inicio = time.perf_counter()
+            for linea in tanda:
+                Pelicula.from_line(linea)
+            segundos += time.perf_counter() - inicio
+            n += len(tanda)
+    return n, segundos
+
+
+def _medir_iter(catalogo: CatalogoPeliculas, _) -> int:
+    return sum(1 for _ in catalogo.iter_peliculas())
+
+
+def _preparar_escritura(catalogo: CatalogoPeliculas) -> None:
+    catalogo.contiene("")  # arma el índice de nombres: se mide el costo por alta, no la carga
+
+
+def _medir_agregar(catalogo: CatalogoPeliculas, _) -> int:
+    for j in range(OPERACIONES_ESCRITURA):
+        catalogo.agregar(Pelicula(f"Benchmark alta {j}", "Drama", 2000))
+    return OPERACIONES_ESCRITURA
+
+
+def _medir_pagina(catalogo: CatalogoPeliculas, _) -> int:
+    return len(catalogo.listar(0, TAMANIO_PAGINA))
+
+
+def _medir_todo(catalogo: CatalogoPeliculas, _) -> int:
+    return len(catalogo.listar())
+
+
+def _preparar_eliminar(catalogo: CatalogoPeliculas) -> List[Pelicula]:
+    _preparar_escritura(catalogo)
+    paso = max(1, catalogo.cantidad() // OPERACIONES_ESCRITURA)
+    return list(islice(catalogo.iter_peliculas(), 0, None, paso))[:OPERACIONES_ESCRITURA]
+
+
+def _medir_eliminar(catalogo: CatalogoPeliculas, victimas: List[Pelicula]) -> int:
+    for p in victimas:
+        catalogo.eliminar(p)
+    return len(victimas)
+
+
+CASOS = (
+    Caso("from_line", _nada, _medir_from_line),
+    Caso("iter_peliculas", _nada, _medir_iter),
+    Caso("agregar", _preparar_escritura, _medir_agregar),
+    Caso("listar_pagina", _nada, _medir_pagina),
+    Caso("listar_todo", _nada, _medir_todo),
+    Caso("eliminar", _preparar_eliminar, _medir_eliminar),
+)
+
+
+# ===================== ejecución =====================
+
+def _una_vez(caso: Caso, original: str, carpeta: str, con_memoria: bool) -> Tuple[float, int, int]:
+    """(segundos, operaciones, pico de memoria en bytes o 0) de una repetición en frío."""
+    trabajo = os.path.join(carpeta, "trabajo")
+    shutil.rmtree(trabajo, ignore_errors=True)
+    os.makedirs(trabajo)
+    shutil.copyfile(original, os.path.join(trabajo, "bench.txt"))  # sin sidecars: siempre en frío
+    catalogo = CatalogoPeliculas("bench", trabajo)
+    preparado = caso.preparar(catalogo)
+    if con_memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        operaciones = caso.medir(catalogo, preparado)
+        segundos = time.perf_counter() - inicio
+        if isinstance(operaciones, tuple):
+            operaciones, segundos = operaciones
+        pico = tracemalloc.get_traced_memory()[1] if con_memoria else 0
+    finally:
+        if con_memoria:
+            tracemalloc.stop()
+    catalogo.eliminar_catalogo()  # espera una compactación en curso antes de borrar
+    return segundos, operaciones, pico
+
+
+def medir_caso(caso: Caso, original: str, lineas: int, carpeta: str,
+               repeticiones: int = REPETICIONES) -> Dict[str, object]:
+    tiempos = []
+    operaciones = 0
+    for _ in range(max(1, repeticiones)):
+        segundos, operaciones, _ = _una_vez(caso, original, carpeta, con_memoria=False)
+        tiempos.append(segundos)
+    _, _, pico = _una_vez(caso, original, carpeta, con_memoria=True)
+    mejor = min(tiempos)
+    return {
+        "caso": caso.nombre,
+        "lineas": lineas,
+        "operaciones": operaciones,
+        "repeticiones": len(tiempos),
+        "mejor_s": round(mejor, 6),
+        "mediana_s": round(statistics.median(tiempos), 6),
+        "us_por_operacion": round(mejor / operaciones * 1e6, 3) if operaciones else None,
+        "pico_memoria_bytes": pico,
+    }
+
+
+def correr(tamanios: List[int], repeticiones: int = REPETICIONES, semilla: int = SEMILLA,
+           casos: Optional[List[str]] = None, informar: Callable[[str], None] = print) -> Dict[str, object]:
+    """Corre los casos sobre catálogos de cada tamaño. Trabaja en una carpeta temporal."""
+    elegidos = [c for c in CASOS if casos is None or c.nombre in casos]
+    resultados = []
+    with tempfile.TemporaryDirectory(prefix="bench_catalogo_") as carpeta:
+        for lineas in tamanios:
+            original = generar_catalogo(os.path.join(carpeta, f"sintetico_{lineas}.txt"), lineas, semilla)
+            for caso in elegidos:
+                r = medir_caso(caso, original, lineas, carpeta, repeticiones)
+                resultados.append(r)
+                informar(f"  {_etiqueta(lineas):>5} {caso.nombre:<15} {r['mejor_s'] * 1000:10.2f} ms"
+                         f"  pico {r['pico_memoria_bytes'] / 1e6:8.1f} MB")
+            os.remove(original)
+    return {
+        "formato": FORMATO_RESULTADOS,
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semilla": semilla,
+        "resultados": resultados,
+    }
+
+
+# ===================== comparación =====================
+
+class Regresion(NamedTuple):
+    caso: str
+    lineas: int
+    medida: str    # "mejor_s" o "pico_memoria_bytes"
+    base: float
+    actual: float
+
+    @property
+    def variacion(self) -> float:
+        return self.actual / self.base - 1 if self.base else float("inf")
+
+    def __str__(self) -> str:
+        return (f"{_etiqueta(self.lineas)} {self.caso} {self.medida}: "
+                f"{self.base:g} → {self.actual:g} (+{self.variacion:.0%})")
+
+
+def comparar(actual: Dict[str, object], base: Dict[str, object],
+             tolerancia: float = TOLERANCIA) -> List[Regresion]:
+    """Casos de 'actual' que empeoraron más que la tolerancia respecto de 'base'."""
+    de_base = {(r["caso"], r["lineas"]): r for r in base.get("resultados", ())}
+    regresiones = []
+    for r in actual.get("resultados", ()):
+        previo = de_base.get((r["caso"], r["lineas"]))
+        if previo is None:
+            continue
+        for medida in ("mejor_s", "pico_memoria_bytes"):
+            if previo[medida] and r[medida] > previo[medida] * (1 + tolerancia):
+                regresiones.append(Regresion(r["caso"], r["lineas"], medida, previo[medida], r[medida]))
+    return regresiones
+
+
+def _leer_json(ruta: str) -> Dict[str, object]:
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _informar_regresiones(regresiones: List[Regresion], tolerancia: float) -> int:
+    if not regresiones:
+        print(f"✅ Sin regresiones (tolerancia {tolerancia:.0%}).")
+        return 0
+    print(f"⚠️ {len(regresiones)} regresión(es) (tolerancia {tolerancia:.0%}):")
+    for r in regresiones:
+        print(f"  - {r}")
+    return 1
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks reproducibles de los catálogos.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_gen = sub.add_parser("generar", help="escribe un catálogo sintético")
+    p_gen.add_argument("ruta")
+    p_gen.add_argument("lineas", help="cantidad de líneas (acepta 10k, 1m, ...)")
+    p_gen.add_argument("--semilla", type=int, default=SEMILLA)
+
+    p_run = sub.add_parser("correr", help="corre los benchmarks")
+    p_run.add_argument("--tamanios", default=TAMANIOS_POR_DEFECTO, help="lista separada por comas (1k,1m,10m)")
+    p_run.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    p_run.add_argument("--semilla", type=int, default=SEMILLA)
+    p_run.add_argument("--casos", help=f"solo estos casos ({','.join(c.nombre for c in CASOS)})")
+    p_run.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    p_run.add_argument("--base", help="resultados anteriores contra los que comparar")
+    p_run.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+
+    p_cmp = sub.add_parser("comparar", help="compara dos archivos de resultados")
+    p_cmp.add_argument("actual")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+
+    args = parser.parse_args(argv)
+
+    if args.comando == "generar":
+        lineas = _parse_tamanio(args.lineas)
+        generar_catalogo(args.ruta, lineas, args.semilla)
+        print(f"✅ {lineas} línea(s) → {args.ruta}")
+        return 0
+
+    if args.comando == "comparar":
+        return _informar_regresiones(comparar(_leer_json(args.actual), _leer_json(args.base), args.tolerancia),
+                                     args.tolerancia)
+
+    tamanios = [_parse_tamanio(t) for t in args.tamanios.split(",") if t.strip()]
+    casos = args.casos.split(",") if args.casos else None
+    print(f"⏱️ Benchmarks ({args.repeticiones} repeticiones, semilla {args.semilla}):")
+    resultados = correr(tamanios, args.repeticiones, args.semilla, casos)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        print(f"💾 Resultados en {args.salida}")
+    if args.base:
+        return _informar_regresiones(comparar(resultados, _leer_json(args.base), args.tolerancia),
+                                     args.tolerancia)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+# biblioteca.py
+"""
+Consultas sobre TODOS los catálogos de la carpeta a la vez.
+
+BibliotecaCatalogos recorre los catálogos en paralelo (un pool de hilos por
+defecto) y va entregando los resultados de cada catálogo a medida que
+terminan, con lo que tardó cada uno:
+
+    biblioteca = BibliotecaCatalogos()
+    biblioteca.conteos()                    # {"Infantiles": 120, "Terror": 85, ...}
+    biblioteca.buscar("volver al futuro")   # mejores coincidencias de todos los catálogos
+    biblioteca.donde_esta("Alien")          # ["Ciencia ficcion", "Terror"]
+    biblioteca.duplicados()                 # {"alien": ["Ciencia ficcion", "Terror"], ...}
+    biblioteca.tiempos                      # segundos por catálogo del último recorrido
+
+Con hilos, cada tarea usa la instancia compartida del registro
+(registro_catalogos): los caches que arma una búsqueda global le sirven
+después al resto del programa, y viceversa. La lectura de archivos y las
+consultas SQLite sueltan el GIL, así que los hilos se solapan de verdad.
+Con procesos=True cada proceso abre sus propios catálogos: conviene para
+el primer recorrido de carpetas con cientos de catálogos .txt grandes
+(parsear es CPU), a costa de no reutilizar caches.
+"""
+
+import heapq
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from almacenamiento import CatalogoBase, nombres_catalogos
+from pelicula import Pelicula
+from registro_catalogos import obtener_catalogo
+from utils import BASE_DIR_CATALOGOS
+
+
+class ResultadoCatalogo(NamedTuple):
+    """Lo que devolvió una tarea sobre un catálogo, y cuánto tardó."""
+    catalogo: str
+    valor: Any
+    segundos: float
+    error: Optional[str] = None  # "Tipo: mensaje" si la tarea falló (valor queda en None)
+
+
+class Coincidencia(NamedTuple):
+    catalogo: str
+    pelicula: Pelicula
+    puntaje: float
+
+
+class Duplicado(NamedTuple):
+    clave: str
+    catalogos: List[str]  # todos los catálogos donde apareció hasta ahora, en orden de llegada
+
+
+# --- TAREAS POR CATÁLOGO ---
+# funciones de módulo (y no lambdas) para que también se puedan mandar a otro proceso
+
+def _ejecutar(tarea: Callable[..., Any], nombre: str, base_dir: str, args: tuple) -> ResultadoCatalogo:
+    inicio = time.perf_counter()
+    try:
+        valor, error = tarea(obtener_catalogo(nombre, base_dir), *args), None
+    except Exception as e:  # un catálogo roto no corta el recorrido de los demás
+        valor, error = None, f"{type(e).__name__}: {e}"
+    return ResultadoCatalogo(nombre, valor, time.perf_counter() - inicio, error)
+
+
+def _cantidad(catalogo: CatalogoBase) -> int:
+    return catalogo.cantidad()
+
+
+def _claves(catalogo: CatalogoBase):
+    return catalogo.claves()
+
+
+def _contiene(catalogo: CatalogoBase, titulo: str) -> bool:
+    return catalogo.contiene(titulo)
+
+
+def _buscar(catalogo: CatalogoBase, consulta: str, limite: int, aproximada: bool):
+    return catalogo.buscar_con_puntaje(consulta, limite, aproximada)
+
+
+class BibliotecaCatalogos:
+    """Todos los catálogos de una carpeta, consultados en paralelo."""
+
+    def __init__(self, base_dir: str = BASE_DIR_CATALOGOS, max_trabajadores: Optional[int] = None,
+                 procesos: bool = False):
+        self.base_dir = base_dir
+        self.max_trabajadores = max_trabajadores  # None → el default del pool
+        self.procesos = procesos
+        self.tiempos: Dict[str, float] = {}       # segundos por catálogo del último recorrido
+
+    def __repr__(self) -> str:
+        return f"BibliotecaCatalogos({self.base_dir!r})"
+
+    def nombres(self) -> List[str]:
+        return nombres_catalogos(self.base_dir)
+
+    def _pool(self) -> Executor:
+        if self.procesos:
+            from concurrent.futures import ProcessPoolExecutor  # import diferido: pesa ~20 ms
+            return ProcessPoolExecutor(max_workers=self.max_trabajadores)
+        return ThreadPoolExecutor(max_workers=self.max_trabajadores, thread_name_prefix="biblioteca")
+
+    # ===================== recorrido =====================
+
+    def recorrer(self, tarea: Callable[..., Any], *args,
+                 nombres: Optional[Iterable[str]] = None) -> Iterator[ResultadoCatalogo]:
+        """
+        Ejecuta tarea(catalogo, *args) sobre cada catálogo (todos, o los de
+        'nombres') en paralelo y entrega cada resultado apenas está listo, sin
+        esperar a los demás. Con procesos=True, 'tarea' tiene que ser una
+        función de módulo (se manda por pickle).
+        """
+        nombres = self.nombres() if nombres is None else list(nombres)
+        self.tiempos = {}
+        if not nombres:
+            return
+        with self._pool() as pool:
+            pendientes = [pool.submit(_ejecutar, tarea, n, self.base_dir, args) for n in nombres]
+            try:
+                for futuro in as_completed(pendientes):
+                    resultado = futuro.result()
+                    self.tiempos[resultado.catalogo] = resultado.segundos
+                    yield resultado
+            finally:
+                # si quien consume corta antes (break), no seguir lanzando tareas
+                for futuro in pendientes:
+                    futuro.cancel()
+
+    def mas_lentos(self, cantidad: int = 5) -> List[tuple]:
+        """(catálogo, segundos) de los que más tardaron en el último recorrido."""
+        return heapq.nlargest(cantidad, self.tiempos.items(), key=lambda kv: kv[1])
+
+    # ===================== conteos =====================
+
+    def contar(self) -> Iterator[ResultadoCatalogo]:
+        """Cantidad de películas de cada catálogo, a medida que se van contando."""
+        return self.recorrer(_cantidad)
+
+    def conteos(self) -> Dict[str, int]:
+        """{catálogo: cantidad de películas}, A→Z (los catálogos con error no aparecen)."""
+        conteos = {r.catalogo: r.valor for r in self.contar() if r.error is None}
+        return {n: conteos[n] for n in sorted(conteos, key=str.lower)}
+
+    # ===================== búsqueda global =====================
+
+    def buscar(self, consulta: str, limite: int = 20, aproximada: bool = True) -> List[Coincidencia]:
+        """
+        Las 'limite' mejores coincidencias entre todos los catálogos. Cada
+        catálogo busca en su propio índice y acá solo se mezclan los puntajes.
+        """
+        candidatas = [
+            (-puntaje, r.catalogo.lower(), j, Coincidencia(r.catalogo, pelicula, puntaje))
+            for r in self.recorrer(_buscar, consulta, limite, aproximada)
+            for j, (pelicula, puntaje) in enumerate(r.valor or ())
+        ]
+        # a lo sumo 'limite' por catálogo; el desempate no depende de qué hilo terminó primero
+        return [c[-1] for c in heapq.nsmallest(limite, candidatas, key=lambda c: c[:3])]
+
+    def donde_esta(self, titulo: str) -> List[str]:
+        """Catálogos que tienen una película con ese título exacto (sin importar mayúsculas)."""
+        return sorted((r.catalogo for r in self.recorrer(_contiene, titulo) if r.valor), key=str.lower)
+
+    # ===================== duplicados =====================
+
+    def iter_duplicados(self) -> Iterator[Duplicado]:
+        """
+        Títulos que están en más de un catálogo, en streaming: se entrega un
+        Duplicado cada vez que una clave aparece en un catálogo más (la primera
+        vez, cuando llega el segundo catálogo que la tiene).
+        """
+        vistos: Dict[str, List[str]] = {}
+        for r in self.recorrer(_claves):
+            for clave in r.valor or ():
+                catalogos = vistos.get(clave)
+                if catalogos is None:
+                    vistos[clave] = [r.catalogo]
+                    continue
+                catalogos.append(r.catalogo)
+                yield Duplicado(clave, list(catalogos))
+
+    def duplicados(self) -> Dict[str, List[str]]:
+        """{clave: catálogos A→Z} de los títulos repetidos entre catálogos."""
+        resultado: Dict[str, List[str]] = {}
+        for duplicado in self.iter_duplicados():
+            resultado[duplicado.clave] = duplicado.catalogos
+        return {clave: sorted(catalogos, key=str.lower) for clave, catalogos in sorted(resultado.items())}
+
@@ -0,0 +1,305 @@
+# busqueda.py
+"""
+Índice de búsqueda por título, insensible a tildes, mayúsculas y signos.
+
+"¿Qué pasó ayer?" y "que paso ayer" se normalizan igual: "que paso ayer".
+
+Estructuras (todas se actualizan de a una película, sin reconstruir):
+- títulos normalizados ordenados      → prefijo del título con bisect
+- vocabulario ordenado + palabra→claves → prefijo de cada palabra ("sue pos")
+- trigrama → palabras del vocabulario  → substring y errores de tipeo
+  (los trigramas se indexan por palabra, no por título: el vocabulario
+  es mucho más chico que el catálogo)
+
+Ranking: exacto > prefijo del título > prefijo de palabras > substring > aproximado.
+"""
+
+import unicodedata
+from bisect import bisect_left, insort
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pelicula import Pelicula
+
+# Puntajes base de cada tipo de coincidencia
+PUNTAJE_EXACTO = 100
+PUNTAJE_PREFIJO = 80
+PUNTAJE_PALABRAS = 60
+PUNTAJE_SUBSTRING = 40
+PUNTAJE_APROXIMADO = 20
+
+SIMILITUD_MINIMA = 0.6      # para la búsqueda aproximada (0..1)
+MAX_CANDIDATOS = 2000       # tope de candidatos por etapa (mantiene las consultas acotadas)
+
+
+class _TablaNormalizacion(dict):
+    """
+    Tabla para str.translate() que se completa sola: cada carácter distinto se
+    analiza con unicodedata UNA vez ("Á" → "a", "¿" → " ") y queda cacheado.
+    """
+
+    def __missing__(self, codigo: int) -> str:
+        descompuesto = unicodedata.normalize("NFKD", chr(codigo).lower())
+        base = "".join(c for c in descompuesto if not unicodedata.combining(c))
+        reemplazo = "".join(c if c.isalnum() else " " for c in base)
+        self[codigo] = reemplazo
+        return reemplazo
+
+
+_TABLA = _TablaNormalizacion()
+
+
+def normalizar_busqueda(texto: str) -> str:
+    """Minúsculas, sin tildes ni signos, espacios simples."""
+    return " ".join(texto.translate(_TABLA).split())
+
+
+def trigramas(texto: str) -> Set[str]:
+    """Trigramas del texto normalizado (con bordes, para que cuenten los inicios de palabra)."""
+    relleno = f" {texto} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class IndiceBusqueda:
+    """Índice invertido en memoria sobre los títulos de un catálogo."""
+
+    def __init__(self, peliculas: Iterable[Pelicula] = (), clave=lambda p: p.nombre.lower()):
+        self._clave = clave
+        self._peliculas: Dict[str, Pelicula] = {}
+        self._normalizado: Dict[str, str] = {}
+        self._titulos: List[Tuple[str, str]] = []         # (normalizado, clave), ordenado
+        self._palabras: List[str] = []                     # vocabulario, ordenado
+        self._claves_por_palabra: Dict[str, Set[str]] = {}
+        self._palabras_por_trigrama: Dict[str, Set[str]] = {}
+        self._cargar_en_bloque(peliculas)
+
+    def __len__(self) -> int:
+        return len(self._peliculas)
+
+    def __contains__(self, clave: str) -> bool:
+        return clave in self._peliculas
+
+    def pelicula(self, clave: str) -> Optional[Pelicula]:
+        return self._peliculas.get(clave)
+
+    # ===================== mantenimiento =====================
+
+    def _cargar_en_bloque(self, peliculas: Iterable[Pelicula]) -> None:
+        """Carga inicial: llena todo y ordena UNA vez (insort de a uno sería O(n²))."""
+        por_palabra = self._claves_por_palabra
+        for pelicula in peliculas:
+            clave = self._clave(pelicula)
+            if clave in self._peliculas:
+                self.quitar(clave)
+            norm = normalizar_busqueda(pelicula.nombre)
+            self._peliculas[clave] = pelicula
+            self._normalizado[clave] = norm
+            self._titulos.append((norm, clave))
+            for palabra in norm.split():
+                claves = por_palabra.get(palabra)
+                if claves is None:
+                    claves = por_palabra[palabra] = set()
+                claves.add(clave)
+        self._titulos.sort()
+        self._palabras = sorted(por_palabra)
+        for palabra in self._palabras:
+            self._indexar_palabra(palabra)
+
+    def _indexar_palabra(self, palabra: str) -> None:
+        for tri in trigramas(palabra):
+            self._palabras_por_trigrama.setdefault(tri, set()).add(palabra)
+
+    def agregar(self, pelicula: Pelicula) -> None:
+        clave = self._clave(pelicula)
+        if clave in self._peliculas:
+            self.quitar(clave)
+        norm = normalizar_busqueda(pelicula.nombre)
+        self._peliculas[clave] = pelicula
+        self._normalizado[clave] = norm
+        insort(self._titulos, (norm, clave))
+        for palabra in set(norm.split()):
+            claves = self._claves_por_palabra.get(palabra)
+            if claves is None:
+                claves = self._claves_por_palabra[palabra] = set()
+                insort(self._palabras, palabra)
+                self._indexar_palabra(palabra)
+            claves.add(clave)
+
+    def quitar(self, clave: str) -> None:
+        if clave not in self._peliculas:
+            return
+        del self._peliculas[clave]
+        norm = self._normalizado.pop(clave)
+        i = bisect_left(self._titulos, (norm, clave))
+        if i < len(self._titulos) and self._titulos[i] == (norm, clave):
+            self._titulos.pop(i)
+        for palabra in set(norm.split()):
+            claves = self._claves_por_palabra.get(palabra)
+            if claves is None:
+                continue
+            claves.discard(clave)
+            if claves:
+                continue
+            # la palabra ya no aparece en ningún título: sale del vocabulario
+            del self._claves_por_palabra[palabra]
+            j = bisect_left(self._palabras, palabra)
+            if j < len(self._palabras) and self._palabras[j] == palabra:
+                self._palabras.pop(j)
+            for tri in trigramas(palabra):
+                palabras = self._palabras_por_trigrama.get(tri)
+                if palabras is not None:
+                    palabras.discard(palabra)
+                    if not palabras:
+                        del self._palabras_por_trigrama[tri]
+
+    # ===================== búsqueda =====================
+
+    def buscar(self, consulta: str, limite: int = 20, aproximada: bool = True) -> List[Pelicula]:
+        """Películas que coinciden con la consulta, de mejor a peor."""
+        return [p for p, _ in self.buscar_con_puntaje(consulta, limite, aproximada)]
+
+    def buscar_con_puntaje(self, consulta: str, limite: int = 20,
+                           aproximada: bool = True) -> List[Tuple[Pelicula, float]]:
+        q = normalizar_busqueda(consulta or "")
+        if not q or limite <= 0:
+            return []
+        palabras = q.split()
+        puntajes: Dict[str, float] = {}
+
+        def anotar(clave: str, puntaje: float) -> None:
+            if puntaje > puntajes.get(clave, 0):
+                puntajes[clave] = puntaje
+
+        # 1) y 2) título exacto / prefijo del título
+        for clave in self._prefijo_titulo(q, limite):
+            anotar(clave, PUNTAJE_EXACTO if self._normalizado[clave] == q else PUNTAJE_PREFIJO)
+
+        # 3) cada palabra de la consulta es prefijo de alguna palabra del título
+        if len(puntajes) < limite:
+            for clave in self._por_palabras(palabras, self._palabras_con_prefijo,
+                                            lambda w, p: w.startswith(p)):
+                anotar(clave, PUNTAJE_PALABRAS)
+
+        # 4) substring: cada palabra de la consulta aparece dentro de alguna palabra del título
+        if len(puntajes) < limite:
+            for clave in self._por_palabras(palabras, self._palabras_que_contienen,
+                                            lambda w, p: p in w):
+                anotar(clave, PUNTAJE_SUBSTRING)
+
+        # 5) aproximada (errores de tipeo), solo si todavía faltan resultados
+        if aproximada and len(puntajes) < limite:
+            for clave, similitud in self._aproximada(palabras, excluir=puntajes.keys()):
+                anotar(clave, PUNTAJE_APROXIMADO * similitud)
+
+        mejores = sorted(
+            puntajes.items(),
+            key=lambda kv: (-kv[1], len(self._normalizado[kv[0]]), self._normalizado[kv[0]]),
+        )[:limite]
+        return [(self._peliculas[clave], puntaje) for clave, puntaje in mejores]
+
+    def _prefijo_titulo(self, q: str, limite: int) -> List[str]:
+        claves = []
+        i = bisect_left(self._titulos, (q, ""))
+        while i < len(self._titulos) and len(claves) < limite:
+            norm, clave = self._titulos[i]
+            if not norm.startswith(q):
+                break
+            claves.append(clave)
+            i += 1
+        return claves
+
+    # --- vocabulario ---
+
+    def _palabras_con_prefijo(self, prefijo: str) -> List[str]:
+        resultado = []
+        i = bisect_left(self._palabras, prefijo)
+        while i < len(self._palabras) and self._palabras[i].startswith(prefijo):
+            resultado.append(self._palabras[i])
+            i += 1
+        return resultado
+
+    def _palabras_que_contienen(self, fragmento: str) -> Optional[List[str]]:
+        """Palabras del vocabulario que contienen el fragmento (None si es muy corto)."""
+        if len(fragmento) < 3:
+            return None
+        tris = [fragmento[i:i + 3] for i in range(len(fragmento) - 2)]
+        listas = sorted((self._palabras_por_trigrama.get(t, set()) for t in tris), key=len)
+        candidatas = set(listas[0])
+        for palabras in listas[1:]:
+            candidatas &= palabras
+            if not candidatas:
+                break
+        return [w for w in candidatas if fragmento in w]
+
+    def _claves_de(self, palabras: Optional[List[str]]) -> Optional[Set[str]]:
+        """Unión de los títulos de esas palabras; None si son demasiados (poco selectiva)."""
+        if palabras is None:
+            return None
+        resultado: Set[str] = set()
+        for palabra in palabras:
+            claves = self._claves_por_palabra[palabra]
+            if len(resultado) + len(claves) > MAX_CANDIDATOS:
+                return None
+            resultado |= claves
+        return resultado
+
+    def _por_palabras(self, palabras: List[str], buscar_vocabulario, coincide) -> Set[str]:
+        """
+        Títulos donde CADA palabra de la consulta coincide (según 'coincide')
+        con alguna palabra del título. Los candidatos salen de las palabras
+        selectivas de la consulta; las demás se verifican contra el título.
+        """
+        candidatos: Optional[Set[str]] = None
+        for palabra in sorted(palabras, key=len, reverse=True):
+            claves = self._claves_de(buscar_vocabulario(palabra))
+            if claves is None:
+                continue
+            candidatos = claves if candidatos is None else candidatos & claves
+            if not candidatos:
+                return set()
+        if not candidatos:
+            return set()
+        return {
+            c for c in candidatos
+            if all(any(coincide(w, p) for w in self._normalizado[c].split()) for p in palabras)
+        }
+
+    def _aproximada(self, palabras: List[str], excluir: Iterable[str]) -> List[Tuple[str, float]]:
+        """
+        Para cada palabra de la consulta busca palabras parecidas del vocabulario
+        (trigramas en común + SequenceMatcher). Los candidatos salen de las
+        palabras selectivas; cada título se puntúa con el promedio de la mejor
+        similitud de cada palabra de la consulta contra sus palabras.
+        """
+        utiles = [p for p in palabras if len(p) >= 3]
+        if not utiles:
+            return []
+        parecidas = {p: dict(self._palabras_parecidas(p)) for p in utiles}
+        candidatos: Set[str] = set()
+        for p in utiles:
+            claves = self._claves_de(list(parecidas[p]))
+            if claves is not None:
+                candidatos |= claves
+        resultado = []
+        for clave in candidatos.difference(excluir):
+            palabras_titulo = self._normalizado[clave].split()
+            promedio = sum(
+                max((parecidas[p].get(w, 0.0) for w in palabras_titulo), default=0.0) for p in utiles
+            ) / len(utiles)
+            if promedio >= SIMILITUD_MINIMA:
+                resultado.append((clave, promedio))
+        return resultado
+
+    def _palabras_parecidas(self, palabra: str, maximo: int = 20) -> List[Tuple[str, float]]:
+        votos: Dict[str, int] = {}
+        for tri in trigramas(palabra):
+            for w in self._palabras_por_trigrama.get(tri, ()):
+                votos[w] = votos.get(w, 0) + 1
+        candidatas = sorted(votos, key=lambda w: -votos[w])[:100]
+        parecidas = []
+        for w in candidatas:
+            similitud = SequenceMatcher(None, palabra, w).ratio()
+            if similitud >= SIMILITUD_MINIMA:
+                parecidas.append((w, similitud))
+        parecidas.sort(key=lambda x: -x[1])
+        return parecidas[:maximo]
@@ -1,12 +1,79 @@
 # catalogo_peliculas.py
+import heapq
 import os
-from typing import List
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from almacenamiento import CatalogoBase, ResultadoLote
 from pelicula import Pelicula
-from utils import BASE_DIR_CATALOGOS, a_minusculas, log_accion, medir_tiempo
+from indice_nombres import IndiceNombres
+from estadisticas_catalogo import Estadisticas, EstadisticasPersistentes
+from filtro_bloom import FiltroBloomPersistente
+from indice_lineas import IndiceLineas
+from busqueda import IndiceBusqueda
+import compresion
+import formato_binario
+import orden_catalogo
+from escritura_segura import bloqueo_exclusivo, eliminar_lock, reemplazar_atomico, sincronizar
+from orden_catalogo import TramoOrdenado
+from utils import (BASE_DIR_CATALOGOS, a_minusculas, firma_archivo, firma_identidad, log_accion,
+                   medir_tiempo, normalizar_espacios)
 
-class CatalogoPeliculas:
+# Una baja se guarda como una línea más al final del archivo ("tombstone"):
+#     #baja | <nombre>
+# y anula a las líneas ANTERIORES con ese mismo nombre. Una película cuya
+# línea empezaría igual (el título "#baja") no se puede guardar: se leería
+# como una baja (ver _choca_con_marca_baja).
+MARCA_BAJA = "#baja |"
+
+# Tamaño aproximado en memoria de cada cosa cacheada (para el presupuesto de
+# registro_catalogos). Medido con tracemalloc; alcanza con el orden de magnitud.
+BYTES_POR_PELICULA = 160
+BYTES_POR_ENTRADA_BUSQUEDA = 800
+BYTES_POR_CLAVE = 120
+
+_clave_orden = lambda p: a_minusculas(p.nombre)
+
+
+def _choca_con_marca_baja(pelicula: Pelicula) -> bool:
+    """True si la línea de la película se confundiría con una línea de baja."""
+    return pelicula.to_line().startswith(MARCA_BAJA)
+
+
+class _Posiciones:
     """
-    Administra un catálogo de películas con persistencia en archivo .txt.
+    El listado A→Z indexable por posición (ver CatalogoPeliculas._vista_posicional):
+    las líneas del tramo ordenado menos las anuladas por bajas de la cola, mezcladas
+    con las películas vivas de la cola, que son pocas y se tienen ordenadas en memoria.
+    """
+    __slots__ = ("lineas_tramo", "muertas", "cola")
+
+    def __init__(self, lineas_tramo: int, muertas: List[int], cola: List[Pelicula]):
+        self.lineas_tramo = lineas_tramo  # líneas del tramo ordenado
+        self.muertas = muertas            # nº de línea (del tramo) de las anuladas, ordenados
+        self.cola = cola                  # películas vivas de la cola, A→Z
+
+    def __len__(self) -> int:
+        return self.lineas_tramo - len(self.muertas) + len(self.cola)
+
+
+class _AltaPendiente:
+    """Un agregar() esperando su turno en el group commit (ver CatalogoPeliculas.agregar)."""
+    __slots__ = ("pelicula", "clave", "resultado", "error")
+
+    def __init__(self, pelicula: Pelicula):
+        self.pelicula = pelicula
+        self.clave = a_minusculas(pelicula.nombre)
+        self.resultado: Optional[bool] = None
+        self.error: Optional[BaseException] = None
+
+class CatalogoPeliculas(CatalogoBase):
+    """
+    Administra un catálogo de películas con persistencia en archivo .txt
+    (el motor "txt" de almacenamiento.py).
 
     Características clave:
     - Generadores:
@@ -17,13 +84,95 @@ class CatalogoPeliculas:
     - Lambdas:
         * a_minusculas() para comparaciones case-insensitive
         * sort(key=lambda ...) para ordenar A→Z
+    - Índice de nombres:
+        * set en memoria + sidecar "<catalogo>.txt.idx" para detectar duplicados en O(1)
+    - Catálogos muy grandes (más de MAX_CLAVES_EN_MEMORIA películas):
+        * en vez del set de nombres se usa un filtro de Bloom en disco (sidecar
+          "<catalogo>.txt.bloom", vía mmap); un título que el filtro descarta es
+          nuevo sin recorrer el archivo, y solo los "quizás" se confirman con una pasada
+    - Acceso por posición:
+        * sidecar "<catalogo>.txt.lineas" con el byte donde empieza cada línea (vía mmap):
+          obtener(i), una página de listar() y cantidad() saltan directo al tramo
+          ordenado, sin parsear el archivo; los appends solo agregan posiciones
+    - Formato binario opcional:
+        * compilar_binario() genera "<catalogo>.catb"; mientras siga al día con el
+          .txt, iter_peliculas() lee de ahí vía mmap (sin parsear ni normalizar)
+    - Búsqueda:
+        * buscar() sobre un índice invertido (prefijos + trigramas) que se
+          mantiene al día con cada alta y baja
+    - Bajas append-only:
+        * eliminar() agrega una línea "#baja | nombre" en vez de reescribir el archivo
+        * cuando las líneas muertas superan UMBRAL_COMPACTACION, se compacta en segundo plano
+    - Orden en disco:
+        * compactar() deja el archivo ordenado A→Z (tramo ordenado + sidecar ".orden");
+          las altas nuevas quedan en una cola al final
+        * iter_ordenado() / listar(offset, limite) mezclan el tramo con la cola ya
+          ordenada, sin cargar ni ordenar todo el catálogo
+    - Escrituras seguras:
+        * toda modificación toma un lock advisory (fcntl) sobre "<catalogo>.txt.lock",
+          así la consola y la GUI pueden escribir a la vez sin duplicar películas
+        * cada append termina con fsync; los agregar() concurrentes se juntan en
+          un solo append + fsync (group commit)
+        * las reescrituras van a un temporal + os.replace (nunca se trunca el catálogo)
+    - Compresión transparente:
+        * el archivo puede ser "<catalogo>.txt", ".txt.gz" o ".txt.xz" (ver compresion.py);
+          se lee y se agrega igual en los tres, y compactar() respeta el formato
+        * cambiar_compresion() pasa de uno a otro; si otro proceso lo hizo, la
+          instancia se entera sola (_seguir_archivo)
+    - Caches en memoria:
+        * películas ordenadas, índice de búsqueda, nombres y bajas; se validan con la
+          firma del archivo y se mantienen al día con cada alta y baja propias
+        * registro_catalogos.obtener_catalogo() entrega una sola instancia por
+          catálogo (y libera estos caches bajo un presupuesto de memoria)
     """
 
+    UMBRAL_COMPACTACION = 0.3     # proporción de líneas muertas que dispara la compactación
+    MIN_LINEAS_COMPACTACION = 64  # por debajo de esto no vale la pena compactar
+    UMBRAL_COLA = 0.1             # cola desordenada (proporción del archivo) que dispara la compactación
+    MIN_LINEAS_COLA = 256         # ...pero nunca por menos líneas que estas
+    MAX_PELICULAS_EN_CACHE = 200_000  # catálogos más grandes se listan sin cachear las películas
+    SINCRONIZAR_DISCO = True      # fsync después de cada escritura (False: más rápido, menos seguro)
+    MAX_CLAVES_EN_MEMORIA = 1_000_000  # más películas que esto: filtro de Bloom en vez del set de nombres
+    TASA_FALSOS_POSITIVOS = 0.01  # del filtro de Bloom (cada falso positivo cuesta una pasada)
+
     def __init__(self, nombre: str, base_dir: str = BASE_DIR_CATALOGOS):
         self.nombre = (nombre or "catalogo").strip()
         self.base_dir = base_dir
         os.makedirs(self.base_dir, exist_ok=True)
-        self.ruta_archivo = os.path.join(self.base_dir, f"{self.nombre}.txt")
+        # ruta_base ("<nombre>.txt") nombra el catálogo aunque esté comprimido: el lock va ahí
+        self.ruta_base = os.path.join(self.base_dir, f"{self.nombre}.txt")
+        self.ruta_archivo = compresion.ruta_datos(self.ruta_base)
+        self.ruta_binario = os.path.join(self.base_dir, f"{self.nombre}{formato_binario.EXTENSION}")
+        self._indice = IndiceNombres(self.ruta_archivo)
+        self._estadisticas = EstadisticasPersistentes(self.ruta_archivo)
+        self._lineas = IndiceLineas(self.ruta_base)  # solo sirve mientras el catálogo no esté comprimido
+        self._bloom = FiltroBloomPersistente(self.ruta_base + FiltroBloomPersistente.EXTENSION,
+                                             self.TASA_FALSOS_POSITIVOS)
+        self._lock = threading.RLock()
+        self._nivel_bloqueo = 0  # anidamiento de bloqueo_escritura() (el flock no es reentrante)
+        self._altas_pendientes: List[_AltaPendiente] = []
+        self._lock_pendientes = threading.Lock()
+        self._compactador: Optional[threading.Thread] = None
+        # cache de bajas: firma del archivo → {clave: nº de línea de su última baja}
+        self._bajas_firma: Optional[Tuple[int, int]] = None
+        self._bajas: Dict[str, int] = {}
+        self._lineas_totales = 0
+        # índice de búsqueda (se arma recién con el primer buscar())
+        self._busqueda: Optional[IndiceBusqueda] = None
+        self._busqueda_firma: Optional[Tuple[int, int]] = None
+        # tramo ordenado del archivo (se lee del sidecar .orden)
+        self._tramo: TramoOrdenado = TramoOrdenado(0, 0)
+        self._tramo_firma: Optional[Tuple[int, int]] = None
+        # películas vivas ordenadas A→Z (las arma listar(); firma con inodo)
+        self._ordenadas: Optional[List[Pelicula]] = None
+        self._ordenadas_firma: Optional[Tuple[int, int, int]] = None
+        # listado A→Z por posición (lo arma la primera página de listar() o cantidad())
+        self._posiciones: Optional[_Posiciones] = None
+        self._posiciones_firma: Optional[Tuple[int, int]] = None
+
+    def __repr__(self) -> str:
+        # corto a propósito: es lo que aparece en acciones.log
+        return f"CatalogoPeliculas({self.nombre!r})"
 
     # --- GENERADORES ---
 
@@ -32,58 +181,932 @@ class CatalogoPeliculas:
         Generador que devuelve una línea 'limpia' por vez del archivo del catálogo.
         Ventaja: lectura perezosa (no carga todo en memoria).
         """
-        if not os.path.exists(self.ruta_archivo):
+        if not self._seguir_archivo():
             return
-        with open(self.ruta_archivo, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    yield line  # genera una línea válida por vez
+        for line in compresion.leer_lineas(self.ruta_archivo):
+            line = line.strip()
+            if line:
+                yield line  # genera una línea válida por vez
 
     def iter_peliculas(self):
         """
         Generador de objetos Pelicula, a partir de _iter_lineas().
+        Saltea las líneas de baja y las películas anuladas por una baja posterior.
+        Si hay un .catb al día con el .txt, lee directamente de él.
+        """
+        lector = self._lector_binario()
+        if lector is not None:
+            with lector:
+                yield from lector.iter_peliculas()
+            return
+
+        bajas = self._estado_bajas()
+        for n, linea in enumerate(self._iter_lineas()):
+            if linea.startswith(MARCA_BAJA):
+                continue
+            p = Pelicula.from_line_confiable(linea)  # genera Pelicula en streaming
+            if bajas and bajas.get(a_minusculas(p.nombre), -1) > n:
+                continue  # hay una baja más adelante para este nombre
+            yield p
+
+    def iter_ordenado(self):
+        """
+        Generador de las películas vivas en orden A→Z (case-insensitive).
+        El tramo ordenado se lee en streaming; solo la cola (altas posteriores
+        a la última compactación) se carga y se ordena en memoria.
         """
-        for linea in self._iter_lineas():
-            yield Pelicula.from_line(linea)  # genera Pelicula en streaming
+        ordenadas = self._ordenadas_vigentes()
+        if ordenadas is not None:
+            yield from ordenadas
+            return
+        lector = self._lector_binario()
+        if lector is not None:  # el .catb se escribe siempre ordenado
+            with lector:
+                yield from lector.iter_peliculas()
+            return
+        if not self._seguir_archivo():
+            return
+
+        tramo = self._tramo_ordenado()
+        sufijo = compresion.sufijo(self.ruta_archivo)
+        bajas = self._estado_bajas()
+
+        def vivas(lineas, primera):
+            # primera: nº de línea (contando como _iter_lineas, sin las vacías) del primer elemento
+            n = primera - 1
+            for crudo in lineas:
+                linea = crudo.decode("utf-8").strip()
+                if not linea:
+                    continue
+                n += 1
+                if linea.startswith(MARCA_BAJA):
+                    continue
+                p = Pelicula.from_line_confiable(linea)
+                if bajas and bajas.get(a_minusculas(p.nombre), -1) > n:
+                    continue
+                yield p
+
+        def hasta_fin_del_tramo(f):
+            if sufijo:
+                # comprimido: tramo.fin es un byte del archivo comprimido, no del
+                # texto; se cuentan las líneas del tramo en lo descomprimido
+                n = 0
+                for crudo in compresion.lineas_crudas(compresion.descomprimir(f, sufijo)):
+                    if n >= tramo.lineas:
+                        return
+                    n += bool(crudo.strip())
+                    yield crudo
+                return
+            leidos = 0
+            for crudo in f:
+                if leidos >= tramo.fin:
+                    return
+                leidos += len(crudo)
+                yield crudo
+
+        with open(self.ruta_archivo, "rb") as f:
+            f.seek(tramo.fin)
+            # en un comprimido, las altas posteriores al tramo son miembros aparte desde tramo.fin
+            cola = sorted(vivas(compresion.lineas_crudas(compresion.descomprimir(f, sufijo)), tramo.lineas),
+                          key=_clave_orden)
+            f.seek(0)
+            yield from heapq.merge(vivas(hasta_fin_del_tramo(f), 0), cola, key=_clave_orden)
+
+    # --- FORMATO BINARIO ---
+
+    def _lector_binario(self) -> Optional[formato_binario.LectorBinario]:
+        """Abre el .catb solo si fue compilado a partir del .txt tal como está ahora."""
+        firma = firma_archivo(self.ruta_archivo)
+        if firma == (-1, -1) or formato_binario.firma_fuente(self.ruta_binario) != firma:
+            return None
+        try:
+            return formato_binario.LectorBinario(self.ruta_binario)
+        except (OSError, ValueError):
+            return None
+
+    def compilar_binario(self) -> int:
+        """Genera (o regenera) el .catb del catálogo, ordenado A→Z. Retorna cuántas películas tiene."""
+        with self.bloqueo_escritura():
+            return formato_binario.txt_a_binario(self)
+
+    # --- BAJAS (TOMBSTONES) ---
+
+    def _estado_bajas(self) -> Dict[str, int]:
+        """
+        Devuelve {clave: nº de línea de la última baja} para el archivo actual.
+        Se recalcula (una pasada liviana, sin parsear películas) solo si el
+        archivo cambió por fuera de esta instancia.
+        """
+        firma = firma_archivo(self.ruta_archivo)
+        if firma != self._bajas_firma:
+            bajas: Dict[str, int] = {}
+            desde = self._tramo_ordenado().lineas
+            lineas = self._indice_lineas() if desde else None
+            if lineas is not None:
+                # el tramo ordenado no tiene bajas (lo escribe compactar): alcanza con leer la cola
+                numeradas = enumerate(lineas.lineas(desde), start=desde)
+            else:
+                numeradas = enumerate(self._iter_lineas())
+            n = -1
+            for n, linea in numeradas:
+                if linea.startswith(MARCA_BAJA):
+                    bajas[a_minusculas(normalizar_espacios(linea[len(MARCA_BAJA):]))] = n
+            total = len(lineas) if lineas is not None else n + 1
+            self._bajas, self._lineas_totales, self._bajas_firma = bajas, total, firma
+        return self._bajas
+
+    def proporcion_muertas(self) -> float:
+        """Proporción de líneas del archivo que ya no aportan (bajas + anuladas)."""
+        bajas = self._estado_bajas()
+        if not self._lineas_totales:
+            return 0.0
+        return min(1.0, 2 * len(bajas) / self._lineas_totales)
+
+    # --- CACHES DERIVADOS ---
+
+    def _tras_append(self, firma_previa: Tuple[int, int], n_altas: int = 0,
+                     altas: Sequence[Pelicula] = (), bajas: Sequence[str] = (),
+                     peliculas_bajas: Optional[Sequence[Pelicula]] = None) -> None:
+        """
+        Pone al día los caches en memoria después de un append propio, sin releer.
+        Cada cache se actualiza solo si correspondía al archivo ANTES de escribir
+        (firma_previa); si no, queda inválido y se recalcula la próxima vez que se use.
+        'altas' solo hace falta si el índice de búsqueda, el cache de películas o las
+        estadísticas están al día; 'peliculas_bajas', si quien llama ya las tiene.
+        """
+        # primero las estadísticas: necesitan las películas dadas de baja, que
+        # se buscan en los caches antes de que estos las quiten
+        if peliculas_bajas is None:
+            peliculas_bajas = self._peliculas_de(bajas, firma_previa)
+        self._estadisticas.actualizar(firma_previa, altas if len(altas) == n_altas else None,
+                                      peliculas_bajas)
+        firma = firma_archivo(self.ruta_archivo)
+        if self._bajas_firma == firma_previa:
+            for clave in bajas:
+                self._bajas[clave] = self._lineas_totales
+                self._lineas_totales += 1
+            self._lineas_totales += n_altas
+            self._bajas_firma = firma
+        if self._busqueda_vigente(firma_previa):
+            for p in altas:
+                self._busqueda.agregar(p)
+            for clave in bajas:
+                self._busqueda.quitar(clave)
+            self._busqueda_firma = firma
+        if self._tramo_firma == firma_previa:
+            self._tramo_firma = firma  # el append no toca el tramo ordenado
+        self._lineas.registrar(firma_previa, firma)
+        if (self._posiciones_firma == firma_previa and len(altas) == n_altas
+                and self._lineas.vigente_para(firma)):
+            vista = self._posiciones
+            for clave in bajas:
+                i = bisect_left(vista.cola, clave, key=_clave_orden)
+                if i < len(vista.cola) and _clave_orden(vista.cola[i]) == clave:
+                    del vista.cola[i]
+                    continue
+                n = self._linea_en_tramo(clave, vista.lineas_tramo)
+                j = bisect_left(vista.muertas, n) if n is not None else 0
+                if n is not None and (j == len(vista.muertas) or vista.muertas[j] != n):
+                    vista.muertas.insert(j, n)
+            for p in altas:
+                insort(vista.cola, p, key=_clave_orden)
+            self._posiciones_firma = firma
+        identidad = firma_identidad(self.ruta_archivo)
+        if self._ordenadas is not None and self._ordenadas_firma == (*firma_previa, identidad[2]):
+            # un append no cambia el inodo: si el cache era del archivo anterior, sigue siéndolo
+            for clave in bajas:
+                i = bisect_left(self._ordenadas, clave, key=_clave_orden)
+                if i < len(self._ordenadas) and _clave_orden(self._ordenadas[i]) == clave:
+                    del self._ordenadas[i]
+            for p in altas:
+                self._ordenadas.insert(bisect_left(self._ordenadas, _clave_orden(p), key=_clave_orden), p)
+            self._ordenadas_firma = identidad if len(altas) == n_altas else None
+
+    def _peliculas_de(self, claves: Sequence[str], firma_previa: Tuple[int, int]) -> Optional[List[Pelicula]]:
+        """Las películas de esas claves según los caches al día con firma_previa; None si no hay cache."""
+        if not claves:
+            return []
+        if self._busqueda_vigente(firma_previa):
+            encontradas = [self._busqueda.pelicula(c) for c in claves]
+        elif self._ordenadas is not None and (self._ordenadas_firma or ())[:2] == firma_previa:
+            encontradas = []
+            for clave in claves:
+                i = bisect_left(self._ordenadas, clave, key=_clave_orden)
+                dentro = i < len(self._ordenadas) and _clave_orden(self._ordenadas[i]) == clave
+                encontradas.append(self._ordenadas[i] if dentro else None)
+        else:
+            return None
+        return None if None in encontradas else encontradas
+
+    def _reanclar(self, firma_previa: Tuple[int, int]) -> None:
+        """
+        El archivo se reescribió con el MISMO contenido lógico (compactación):
+        los caches que estaban al día siguen valiendo con la firma nueva.
+        """
+        firma = firma_archivo(self.ruta_archivo)
+        if self._busqueda_vigente(firma_previa):
+            self._busqueda_firma = firma
+        self._estadisticas.reanclar(firma_previa)
+        if formato_binario.firma_fuente(self.ruta_binario) == firma_previa:
+            # el .catb estaba al día y ya estaba ordenado igual que el archivo nuevo
+            formato_binario.sellar_fuente(self.ruta_binario, firma)
+
+    # --- ORDEN EN DISCO ---
+
+    def _tramo_ordenado(self) -> TramoOrdenado:
+        """Tramo ordenado vigente (TramoOrdenado(0, 0) si el archivo nunca se compactó)."""
+        firma = firma_archivo(self.ruta_archivo)
+        if firma != self._tramo_firma:
+            self._tramo = orden_catalogo.leer(self.ruta_archivo) or TramoOrdenado(0, 0)
+            self._tramo_firma = firma
+        return self._tramo
+
+    def lineas_en_cola(self) -> int:
+        """Cuántas líneas hay después del tramo ordenado (altas y bajas sin compactar)."""
+        self._estado_bajas()
+        return max(0, self._lineas_totales - self._tramo_ordenado().lineas)
+
+    # --- CACHE DE PELÍCULAS ---
+
+    def _ordenadas_vigentes(self) -> Optional[List[Pelicula]]:
+        if self._ordenadas is not None and self._ordenadas_firma == firma_identidad(self.ruta_archivo):
+            return self._ordenadas
+        return None
+
+    def _peliculas_ordenadas(self) -> Optional[List[Pelicula]]:
+        """
+        Todas las películas vivas A→Z, cacheadas en memoria mientras el archivo no
+        cambie por fuera. None si el catálogo es demasiado grande para cachearlo.
+        """
+        with self._lock:
+            ordenadas = self._ordenadas_vigentes()
+            if ordenadas is None and self.cantidad() <= self.MAX_PELICULAS_EN_CACHE:
+                identidad = firma_identidad(self.ruta_archivo)
+                ordenadas = list(self.iter_ordenado())
+                self._ordenadas, self._ordenadas_firma = ordenadas, identidad
+            return ordenadas
+
+    def memoria_estimada(self) -> int:
+        """Bytes aproximados que ocupan los caches en memoria de este catálogo."""
+        return (len(self._ordenadas or ()) * BYTES_POR_PELICULA
+                + len(self._busqueda or ()) * BYTES_POR_ENTRADA_BUSQUEDA
+                + (len(self._indice) if self._indice.vigente() else 0) * BYTES_POR_CLAVE
+                + len(self._bajas) * BYTES_POR_CLAVE
+                + (len(self._posiciones.cola) if self._posiciones is not None else 0) * BYTES_POR_PELICULA)
+
+    def liberar_memoria(self) -> bool:
+        """
+        Suelta los caches en memoria (se rearman solos cuando hagan falta).
+        Si otra operación está usando el catálogo, no espera: retorna False.
+        """
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._ordenadas = self._ordenadas_firma = None
+            self._busqueda = self._busqueda_firma = None
+            self._bajas, self._bajas_firma, self._lineas_totales = {}, None, 0
+            self._indice.invalidar()
+            self._bloom.cerrar()
+            self._posiciones = self._posiciones_firma = None
+            self._lineas.cerrar()
+            return True
+        finally:
+            self._lock.release()
+
+    # --- ACCESO POR POSICIÓN ---
+
+    def _indice_lineas(self) -> Optional[IndiceLineas]:
+        """Posiciones de línea del archivo (ver indice_lineas); None si está comprimido o no existe."""
+        if not self._seguir_archivo() or compresion.sufijo(self.ruta_archivo):
+            return None
+        return self._lineas.asegurar(firma_archivo(self.ruta_archivo))
+
+    def _linea_en_tramo(self, clave: str, lineas_tramo: int) -> Optional[int]:
+        """Nº de línea de esa clave en el tramo ordenado (búsqueda binaria sobre el archivo), o None."""
+        leer = lambda n: _clave_orden(Pelicula.from_line_confiable(self._lineas.linea(n)))
+        n = bisect_left(range(lineas_tramo), clave, key=leer)
+        return n if n < lineas_tramo and leer(n) == clave else None
+
+    def _vista_posicional(self) -> Optional[_Posiciones]:
+        """
+        El listado A→Z indexable por posición sin cargar el catálogo: el tramo
+        ordenado se lee salteando a líneas del archivo y solo la cola se ordena
+        en memoria. None si el archivo está comprimido o si la cola es tan larga
+        que ordenarla costaría casi como recorrer todo (compactar la acorta).
+        """
+        lineas = self._indice_lineas()
+        if lineas is None:
+            return None
+        firma = firma_archivo(self.ruta_archivo)
+        if self._posiciones_firma == firma:
+            return self._posiciones
+        tramo = self._tramo_ordenado()
+        total = len(lineas)
+        if total - tramo.lineas > max(self.MIN_LINEAS_COLA, self.UMBRAL_COLA * total):
+            return None
+        bajas = self._estado_bajas()
+        cola = []
+        for n, linea in enumerate(lineas.lineas(tramo.lineas), start=tramo.lineas):
+            if linea.startswith(MARCA_BAJA):
+                continue
+            p = Pelicula.from_line_confiable(linea)
+            if bajas.get(a_minusculas(p.nombre), -1) > n:
+                continue
+            cola.append(p)
+        cola.sort(key=_clave_orden)
+        # toda baja está en la cola: anula la línea de su clave en el tramo, si la hay
+        muertas = sorted(n for n in (self._linea_en_tramo(c, tramo.lineas) for c in bajas) if n is not None)
+        self._posiciones, self._posiciones_firma = _Posiciones(tramo.lineas, muertas, cola), firma
+        return self._posiciones
+
+    def _pagina_posicional(self, offset: int, fin: Optional[int]) -> Optional[List[Pelicula]]:
+        """
+        Las películas offset..fin del listado A→Z leyendo solo esas líneas (más
+        O(log n) para ubicar la primera). None si no hay vista posicional.
+        """
+        with self._lock:
+            vista = self._vista_posicional()
+            if vista is None:
+                return None
+            muertas, cola, lineas_tramo = vista.muertas, vista.cola, vista.lineas_tramo
+            vivas_tramo = lineas_tramo - len(muertas)
+            fin = len(vista) if fin is None else min(fin, len(vista))
+            if offset >= fin:
+                return []
+
+            def linea_viva(j: int) -> int:
+                # nº de línea de la j-ésima película viva del tramo
+                return j + bisect_left(range(j, j + len(muertas) + 1), j,
+                                       key=lambda n: n - bisect_right(muertas, n))
+
+            def clave_tramo(j: int) -> str:
+                return _clave_orden(Pelicula.from_line_confiable(self._lineas.linea(linea_viva(j))))
+
+            # cuántas películas de la cola van antes de la posición offset: el
+            # k-ésimo de dos listas ordenadas, por búsqueda binaria (ante un
+            # empate va primero el tramo, como en iter_ordenado)
+            desde = max(0, offset - vivas_tramo)
+            c = desde + bisect_left(range(desde, min(len(cola), offset)), True,
+                                    key=lambda c: _clave_orden(cola[c]) >= clave_tramo(offset - c - 1))
+
+            def tramo_desde(n: int):
+                k = bisect_left(muertas, n)
+                for n in range(n, lineas_tramo):
+                    if k < len(muertas) and muertas[k] == n:
+                        k += 1
+                        continue
+                    yield Pelicula.from_line_confiable(self._lineas.linea(n))
+
+            return list(islice(heapq.merge(tramo_desde(linea_viva(offset - c)), cola[c:c + fin - offset],
+                                           key=_clave_orden), fin - offset))
+
+    # --- BÚSQUEDA ---
+
+    def _busqueda_vigente(self, firma: Tuple[int, int]) -> bool:
+        return self._busqueda is not None and self._busqueda_firma == firma
+
+    def _indice_busqueda(self) -> IndiceBusqueda:
+        """Índice de búsqueda al día; se arma (una pasada) solo la primera vez o si el archivo cambió por fuera."""
+        firma = firma_archivo(self.ruta_archivo)
+        if not self._busqueda_vigente(firma):
+            self._busqueda = IndiceBusqueda(self.iter_peliculas(), clave=lambda p: a_minusculas(p.nombre))
+            self._busqueda_firma = firma
+        return self._busqueda
+
+    @log_accion("acciones.log")
+    @medir_tiempo
+    def buscar(self, consulta: str, limite: int = 20, aproximada: bool = True) -> List[Pelicula]:
+        """
+        Busca por título sin importar tildes, mayúsculas ni signos
+        ("que paso" encuentra "¿Qué pasó ayer?"). Ordena de mejor a peor:
+        exacto, prefijo, palabras, substring y, si aproximada=True, con errores de tipeo.
+        """
+        with self._lock:
+            return self._indice_busqueda().buscar(consulta, limite, aproximada)
+
+    def buscar_con_puntaje(self, consulta: str, limite: int = 20,
+                           aproximada: bool = True) -> List[Tuple[Pelicula, float]]:
+        with self._lock:
+            return self._indice_busqueda().buscar_con_puntaje(consulta, limite, aproximada)
+
+    # --- ÍNDICE DE NOMBRES ---
+
+    def _indice_nombres(self) -> IndiceNombres:
+        """
+        Devuelve el índice de nombres listo para consultar.
+        Solo recorre el archivo si el sidecar falta o quedó desactualizado.
+        """
+        return self._indice.asegurar(
+            lambda: (a_minusculas(p.nombre) for p in self.iter_peliculas())
+        )
+
+    def contiene(self, nombre: str) -> bool:
+        """True si ya hay una película con ese nombre (case-insensitive)."""
+        clave = a_minusculas(normalizar_espacios(nombre or ""))
+        with self._lock:
+            return clave in self._existentes([clave])
+
+    def claves(self) -> Set[str]:
+        """Claves de todas las películas, sacadas del índice de nombres (sin parsear el catálogo)."""
+        with self._lock:
+            if self._filtro_bloom() is not None:
+                # catálogo grande: se arma el set pedido, pero no queda cacheado
+                return {a_minusculas(p.nombre) for p in self.iter_peliculas()}
+            return set(self._indice_nombres())
+
+    # --- FILTRO DE BLOOM (catálogos grandes) ---
+
+    def _filtro_bloom(self) -> Optional[FiltroBloomPersistente]:
+        """
+        El filtro de Bloom al día si el catálogo es demasiado grande para el set
+        de nombres; None si conviene el índice de nombres (o ya está en memoria).
+        """
+        if self._indice.vigente():
+            if len(self._indice) <= self.MAX_CLAVES_EN_MEMORIA:
+                return None
+            self._indice.invalidar()  # creció de más: se suelta el set y se pasa al filtro
+        firma = firma_archivo(self.ruta_archivo)
+        if self._bloom.vigente_para(firma) and self._bloom.claves <= self._bloom.capacidad:
+            return self._bloom
+        if not compresion.sufijo(self.ruta_archivo) and firma[0] // 2 <= self.MAX_CLAVES_EN_MEMORIA:
+            return None  # ni con líneas de 2 bytes llega a tener tantas películas
+        total = self._estadisticas.asegurar(self.iter_peliculas).total
+        if total <= self.MAX_CLAVES_EN_MEMORIA:
+            return None
+        return self._bloom.asegurar(firma, lambda: (a_minusculas(p.nombre) for p in self.iter_peliculas()),
+                                    total)
+
+    def _existentes(self, claves: Iterable[str]) -> Dict[str, Optional[Pelicula]]:
+        """
+        Cuáles de esas claves ya están en el catálogo. Con el índice de nombres,
+        O(1) cada una (sin la Pelicula). Con el filtro de Bloom, las que el filtro
+        descarta son nuevas sin mirar el archivo, y las demás se confirman todas
+        juntas en una sola pasada (y vienen con su Pelicula).
+        """
+        filtro = self._filtro_bloom()
+        if filtro is None:
+            indice = self._indice_nombres()
+            return {c: None for c in claves if c in indice}
+        return self._buscar_claves({c for c in claves if c in filtro})
+
+    def _buscar_claves(self, claves: Set[str]) -> Dict[str, Pelicula]:
+        """Las películas vivas con esas claves, en una pasada por el archivo (nada si no hay claves)."""
+        encontradas: Dict[str, Pelicula] = {}
+        if claves:
+            for p in self.iter_peliculas():
+                clave = a_minusculas(p.nombre)
+                if clave in claves:
+                    encontradas[clave] = p
+        return encontradas
+
+    def _registrar_altas(self, firma_previa: Tuple[int, int], claves: List[str]) -> None:
+        """Anota las claves recién escritas en el índice de nombres y en el filtro (los que estén al día)."""
+        self._indice.registrar_altas(claves)
+        self._bloom.registrar(firma_previa, firma_archivo(self.ruta_archivo), claves)
+
+    def _registrar_bajas(self, firma_previa: Tuple[int, int], claves: List[str]) -> None:
+        # el filtro no puede olvidar claves: solo se ancla al archivo nuevo
+        self._indice.registrar_bajas(claves)
+        self._bloom.registrar(firma_previa, firma_archivo(self.ruta_archivo))
+
+    # --- ARCHIVO DE DATOS (.txt / .txt.gz / .txt.xz) ---
+
+    def _seguir_archivo(self) -> bool:
+        """
+        True si el archivo de datos existe. Si no, se fija si otro proceso (o
+        instancia) comprimió o descomprimió el catálogo y pasa a usar el archivo nuevo.
+        """
+        if os.path.exists(self.ruta_archivo):
+            return True
+        ruta = compresion.ruta_datos(self.ruta_base)
+        if ruta != self.ruta_archivo:
+            with self._lock:
+                self.ruta_archivo = ruta
+                # los sidecars llevan el nombre del archivo de datos: se cargan los del nuevo
+                self._indice = IndiceNombres(ruta)
+                self._estadisticas = EstadisticasPersistentes(ruta)
+                self._bajas_firma = self._busqueda_firma = self._tramo_firma = None
+                self._ordenadas = self._ordenadas_firma = None
+                self._posiciones = self._posiciones_firma = None
+        return os.path.exists(ruta)
+
+    def existe(self) -> bool:
+        return self._seguir_archivo()
+
+    def firma(self) -> tuple:
+        self._seguir_archivo()
+        return firma_identidad(self.ruta_archivo)
+
+    def cambiar_compresion(self, sufijo: str) -> bool:
+        """
+        Reescribe el catálogo como .txt (sufijo ""), .txt.gz (".gz") o .txt.xz
+        (".xz"), compactado y ordenado. Los índices y las estadísticas pasan
+        al archivo nuevo sin recalcularse. False si ya estaba en ese formato.
+        """
+        if sufijo not in compresion.SUFIJOS:
+            raise ValueError(f"Compresión desconocida: {sufijo!r} (opciones: '', .gz, .xz)")
+        with self.bloqueo_escritura():
+            destino = self.ruta_base + sufijo
+            if destino == self.ruta_archivo or not os.path.exists(self.ruta_archivo):
+                return False
+            self._reescribir(destino)
+            return True
+
+    # --- ESCRITURA SEGURA ---
+
+    @contextmanager
+    def bloqueo_escritura(self):
+        """
+        Exclusión para modificar el catálogo: el RLock de la instancia (hilos de
+        este proceso) + el lock advisory del archivo (otros procesos). Reentrante.
+        Adentro, los caches se revalidan solos: si otro proceso escribió, la firma
+        del archivo ya no coincide.
+        """
+        with self._lock:
+            if self._nivel_bloqueo:
+                self._nivel_bloqueo += 1
+                try:
+                    yield
+                finally:
+                    self._nivel_bloqueo -= 1
+                return
+            with bloqueo_exclusivo(self.ruta_base):
+                self._nivel_bloqueo = 1
+                self._seguir_archivo()  # con el lock tomado nadie más lo puede estar cambiando
+                try:
+                    yield
+                finally:
+                    self._nivel_bloqueo = 0
+
+    @contextmanager
+    def _abrir_para_agregar(self, buffering: int = -1):
+        """
+        Abre el .txt para agregar al final. Si un corte dejó la última línea a
+        medias (sin salto de línea), la cierra primero para no pegarle la siguiente.
+        Al salir, baja todo a disco (fsync) si SINCRONIZAR_DISCO.
+        En un .txt.gz / .txt.xz cada append es un miembro comprimido nuevo.
+        """
+        if compresion.sufijo(self.ruta_archivo):
+            # los miembros que escribimos siempre terminan en salto de línea
+            with compresion.abrir_escritura(self.ruta_archivo, "a", sincronizar=self.SINCRONIZAR_DISCO) as f:
+                yield f
+            return
+        with open(self.ruta_archivo, "a", encoding="utf-8", buffering=buffering) as f:
+            if f.tell() > 0:
+                with open(self.ruta_archivo, "rb") as crudo:
+                    crudo.seek(-1, os.SEEK_END)
+                    if crudo.read(1) != b"\n":
+                        f.write("\n")
+            yield f
+            if self.SINCRONIZAR_DISCO:
+                sincronizar(f)
 
     # --- OPERACIONES PRINCIPALES ---
 
+    def validar(self, pelicula: Pelicula) -> None:
+        """Lanza ValueError si la película no se puede guardar en el .txt."""
+        if _choca_con_marca_baja(pelicula):
+            raise ValueError(f"El título '{pelicula.nombre}' está reservado (se leería como una baja).")
+
     @log_accion("acciones.log")
     @medir_tiempo
     def agregar(self, pelicula: Pelicula) -> bool:
         """
         Agrega la película si NO existe ya (case-insensitive).
-        Usa una generator expression para chequear duplicados en streaming.
+        El chequeo de duplicados se hace contra el índice de nombres (O(1)).
         Retorna True si la agregó, False si era duplicada.
+
+        Group commit: el pedido se encola y el primer hilo que consigue el lock
+        escribe TODOS los pedidos encolados en un solo append + fsync. Mientras
+        un fsync está en curso, los agregar() que llegan se acumulan para el
+        siguiente, así muchos hilos agregando a la vez no pagan un fsync cada uno.
         """
-        existentes = (a_minusculas(p.nombre) for p in self.iter_peliculas())
-        if a_minusculas(pelicula.nombre) in existentes:  # 'in' consume el generador hasta encontrar o agotar
-            return False
+        alta = _AltaPendiente(pelicula)
+        with self._lock_pendientes:
+            self._altas_pendientes.append(alta)
+        with self._lock:
+            if alta.resultado is None and alta.error is None:
+                with self._lock_pendientes:
+                    lote, self._altas_pendientes = self._altas_pendientes, []
+                try:
+                    self._confirmar_altas(lote)
+                except BaseException as e:
+                    for pendiente in lote:
+                        if pendiente.resultado is None:
+                            pendiente.error = e
+        if alta.error is not None:
+            raise alta.error
+        return alta.resultado
+
+    def _confirmar_altas(self, lote: List[_AltaPendiente]) -> None:
+        """Escribe un lote de agregar() encolados: un append, un fsync, un registro en el índice."""
+        with self.bloqueo_escritura():
+            firma_previa = firma_archivo(self.ruta_archivo)
+            vigente = self._bajas_firma == firma_previa
+            existentes = self._existentes({alta.clave for alta in lote})
+            nuevas: List[_AltaPendiente] = []
+            vistas = set()
+            for alta in lote:
+                try:
+                    self.validar(alta.pelicula)
+                except ValueError as e:
+                    alta.error = e  # le llega solo a ese agregar(): el resto del lote sigue
+                    continue
+                if alta.clave in existentes or alta.clave in vistas:
+                    alta.resultado = False
+                    continue
+                vistas.add(alta.clave)
+                nuevas.append(alta)
+            if nuevas:
+                with self._abrir_para_agregar() as f:
+                    f.write("".join(alta.pelicula.to_line() + "\n" for alta in nuevas))
+                self._registrar_altas(firma_previa, [alta.clave for alta in nuevas])
+                self._tras_append(firma_previa, len(nuevas), altas=[alta.pelicula for alta in nuevas])
+            for alta in nuevas:
+                alta.resultado = True
+            if nuevas and vigente:
+                self._programar_compactacion()
 
-        with open(self.ruta_archivo, "a", encoding="utf-8") as f:
-            f.write(pelicula.to_line() + "\n")
-        return True
+    @log_accion("acciones.log")
+    @medir_tiempo
+    def agregar_muchos(self, peliculas: Iterable[Pelicula]) -> ResultadoLote:
+        """
+        Agrega muchas películas en una sola pasada:
+        - consume el iterable en streaming (sirve con generadores)
+        - descarta duplicadas contra el catálogo Y dentro del mismo lote
+          (y los títulos reservados, que se leerían como bajas)
+        - abre el archivo una sola vez y escribe con un buffer grande
+        - registra todas las altas en el índice de una vez
+        - un solo fsync al final
+        En un catálogo grande (filtro de Bloom) las que el filtro da como
+        "quizás ya está" se apartan y se confirman al final, todas juntas,
+        con una sola pasada por el archivo.
+        """
+        with self.bloqueo_escritura():
+            filtro = self._filtro_bloom()
+            indice = self._indice_nombres() if filtro is None else None
+            vigente = self._bajas_firma == firma_archivo(self.ruta_archivo)
+            dudosas: List[Pelicula] = []
+            vistas = set()
+            omitidas = 0
+
+            def no_dudosas():
+                nonlocal omitidas
+                for pelicula in peliculas:
+                    clave = a_minusculas(pelicula.nombre)
+                    if (clave in vistas or (indice is not None and clave in indice)
+                            or _choca_con_marca_baja(pelicula)):
+                        omitidas += 1
+                        continue
+                    vistas.add(clave)
+                    if filtro is not None and clave in filtro:
+                        dudosas.append(pelicula)
+                        continue
+                    yield clave, pelicula
+
+            escritas = self._escribir_altas(no_dudosas())
+            if dudosas:
+                existentes = self._buscar_claves({a_minusculas(p.nombre) for p in dudosas})
+                omitidas += len(existentes)
+                confirmadas = [(a_minusculas(p.nombre), p) for p in dudosas
+                               if a_minusculas(p.nombre) not in existentes]
+                if confirmadas:
+                    escritas += self._escribir_altas(confirmadas)
+            if escritas and vigente:
+                self._programar_compactacion()
+            return ResultadoLote(escritas, omitidas)
+
+    def _escribir_altas(self, altas_nuevas: Iterable[Tuple[str, Pelicula]]) -> int:
+        """
+        Agrega al final del archivo esas películas (ya sabidas nuevas), con un
+        buffer grande y un solo fsync, y pone al día índices y caches.
+        Retorna cuántas escribió. Llamar con bloqueo_escritura() tomado.
+        """
+        firma_previa = firma_archivo(self.ruta_archivo)
+        # las Pelicula nuevas solo se guardan si hay un cache en memoria que actualizar
+        cache_al_dia = (self._busqueda_vigente(firma_previa) or self._ordenadas_vigentes() is not None
+                        or self._estadisticas.vigente_para(firma_previa)
+                        or self._posiciones_firma == firma_previa)
+        altas: Optional[List[Pelicula]] = [] if cache_al_dia else None
+        nuevas: List[str] = []
+        try:
+            with self._abrir_para_agregar(buffering=1 << 20) as f:
+                for clave, pelicula in altas_nuevas:
+                    self.validar(pelicula)
+                    f.write(pelicula.to_line() + "\n")
+                    nuevas.append(clave)
+                    if altas is not None:
+                        altas.append(pelicula)
+        finally:
+            # aunque el iterable falle a mitad de camino, lo ya escrito queda indexado
+            if nuevas:
+                self._registrar_altas(firma_previa, nuevas)
+                self._tras_append(firma_previa, len(nuevas), altas=altas or ())
+        return len(nuevas)
+
+    @log_accion("acciones.log")
+    @medir_tiempo
+    def eliminar(self, pelicula: Pelicula) -> bool:
+        """
+        Da de baja una película agregando una línea "#baja | nombre" al final
+        del archivo (O(1) de I/O, sin reescribir el catálogo).
+        Retorna True si la eliminó; False si no estaba.
+        """
+        return self._eliminar_claves([a_minusculas(pelicula.nombre)]) == 1
+
+    @log_accion("acciones.log")
+    @medir_tiempo
+    def eliminar_muchos(self, peliculas: Iterable[Pelicula]) -> int:
+        """
+        Igual que eliminar() pero para varias películas, en un único append.
+        Retorna cuántas se eliminaron.
+        """
+        return self._eliminar_claves(a_minusculas(p.nombre) for p in peliculas)
+
+    def _eliminar_claves(self, claves: Iterable[str]) -> int:
+        with self.bloqueo_escritura():
+            firma_previa = firma_archivo(self.ruta_archivo)
+            vigente = self._bajas_firma == firma_previa
+            claves = list(dict.fromkeys(claves))
+            existentes = self._existentes(claves)
+            bajas = [c for c in claves if c in existentes]
+            if not bajas:
+                return 0
+            with self._abrir_para_agregar() as f:
+                f.write("".join(f"{MARCA_BAJA} {clave}\n" for clave in bajas))
+            self._registrar_bajas(firma_previa, bajas)
+            # con el filtro de Bloom las películas ya vinieron de la pasada que las confirmó
+            peliculas = [existentes[c] for c in bajas]
+            self._tras_append(firma_previa, bajas=bajas,
+                              peliculas_bajas=None if None in peliculas else peliculas)
+            if vigente:
+                # solo con el cache al día: decidir no debe costar una relectura
+                self._programar_compactacion()
+            return len(bajas)
+
+    # --- COMPACTACIÓN ---
+
+    def _programar_compactacion(self) -> None:
+        """
+        Lanza compactar() en un hilo si se pasó alguno de los umbrales (líneas
+        muertas o cola desordenada) y no hay otro corriendo.
+        """
+        if self._lineas_totales < self.MIN_LINEAS_COMPACTACION:
+            return
+        cola_larga = self.lineas_en_cola() >= max(self.MIN_LINEAS_COLA, self.UMBRAL_COLA * self._lineas_totales)
+        if not cola_larga and self.proporcion_muertas() < self.UMBRAL_COMPACTACION:
+            return
+        if self._compactador is not None and self._compactador.is_alive():
+            return
+        # hilo NO daemon: si el programa termina, espera a que la compactación cierre
+        self._compactador = threading.Thread(target=self.compactar, name=f"compactar-{self.nombre}")
+        self._compactador.start()
+
+    def compactar(self) -> bool:
+        """
+        Reescribe el archivo solo con las películas vivas (sin líneas de baja),
+        ordenadas A→Z, y marca todo el archivo como tramo ordenado.
+        Escribe a un temporal y lo reemplaza con os.replace() (con fsync): si algo
+        falla a mitad de camino, o se corta la luz, el catálogo original queda intacto.
+        Toma el lock entre procesos: un append de otro proceso no puede perderse
+        en el reemplazo.
+        Retorna True si compactó; False si no había nada que compactar.
+        """
+        with self.bloqueo_escritura():
+            if not self._estado_bajas() and not self.lineas_en_cola():
+                return False
+            self._reescribir(self.ruta_archivo)
+            return True
+
+    def _reescribir(self, destino: str) -> None:
+        """
+        Escribe las películas vivas A→Z en destino (comprimido según su extensión)
+        y deja todos los caches, índices y marcas anclados al archivo nuevo.
+        Si destino es otro archivo, el anterior se borra al final.
+        Llamar con bloqueo_escritura() tomado.
+        """
+        indice = self._indice
+        if self._filtro_bloom() is None:
+            self._indice_nombres()
+        else:
+            indice.invalidar()  # catálogo grande: no se arma el set de nombres
+        firma_previa = firma_archivo(self.ruta_archivo)
+        cache_al_dia = self._ordenadas_vigentes() is not None
+        # el filtro de Bloom se rearma en la misma pasada: así se olvida de las bajas
+        bloom = self._bloom.nuevo() if self._bloom.vigente_para(firma_previa) else None
+        # lo mismo con las posiciones de línea, si el archivo nuevo va sin comprimir
+        posiciones = (array("Q") if not compresion.sufijo(destino) and self._lineas.vigente_para(firma_previa)
+                      else None)
+        temporal = destino + ".tmp"
+        lineas = byte = 0
+        with compresion.abrir_escritura(temporal, "w", compresion.sufijo(destino)) as f:
+            for p in self.iter_ordenado():
+                linea = p.to_line() + "\n"
+                f.write(linea)
+                lineas += 1
+                if bloom is not None:
+                    bloom.agregar(a_minusculas(p.nombre))
+                if posiciones is not None:
+                    posiciones.append(byte)
+                    byte += len(linea.encode("utf-8"))
+        self._lineas.cerrar()  # mapeaba el archivo que se está por reemplazar
+        self._posiciones_firma = None
+        reemplazar_atomico(temporal, destino)
+        if destino != self.ruta_archivo:
+            # el nuevo ya está completo en disco: recién ahora se suelta el anterior
+            anterior, self.ruta_archivo = self.ruta_archivo, destino
+            indice.mover(destino)
+            self._estadisticas.mover(destino, firma_previa)
+            orden_catalogo.eliminar(anterior)
+            os.remove(anterior)
+        self._bajas, self._lineas_totales = {}, lineas
+        self._bajas_firma = firma_archivo(self.ruta_archivo)
+        self._tramo = TramoOrdenado(self._bajas_firma[0], lineas)
+        orden_catalogo.escribir(self.ruta_archivo, self._tramo)
+        self._tramo_firma = self._bajas_firma
+        if cache_al_dia:  # el archivo nuevo tiene exactamente lo que ya estaba cacheado
+            self._ordenadas_firma = firma_identidad(self.ruta_archivo)
+        indice.sincronizar()  # mismas claves, archivo nuevo
+        if bloom is not None:
+            self._bloom.guardar(bloom, firma_archivo(self.ruta_archivo))
+        if posiciones is not None:
+            self._lineas.guardar(posiciones, firma_archivo(self.ruta_archivo))
+        elif compresion.sufijo(destino):
+            self._lineas.eliminar()  # comprimido: las posiciones no sirven
+        self._reanclar(firma_previa)
 
     @log_accion("acciones.log")
     @medir_tiempo
-    def listar(self) -> List[Pelicula]:
+    def listar(self, offset: int = 0, limite: Optional[int] = None) -> List[Pelicula]:
+        """
+        Devuelve una página de películas ordenadas A→Z: desde la posición
+        'offset', hasta 'limite' películas (None = todas las que siguen).
+        No ordena el catálogo entero: usa el cache de películas ordenadas (si el
+        catálogo entra en MAX_PELICULAS_EN_CACHE) o consume iter_ordenado() hasta
+        completar la página.
         """
-        Devuelve una lista materializada, pero la lectura del archivo
-        se hace con generadores (lazy). Luego ordena A→Z.
+        offset = max(0, offset)
+        fin = None if limite is None else offset + max(0, limite)
+        if limite is not None and self._ordenadas_vigentes() is None:
+            # una página no justifica cargar el catálogo: se salta directo a sus líneas
+            pagina = self._pagina_posicional(offset, fin)
+            if pagina is not None:
+                return pagina
+        ordenadas = self._peliculas_ordenadas()
+        if ordenadas is not None:
+            return ordenadas[offset:fin]
+        lector = self._lector_binario()
+        if lector is not None:
+            # el .catb ordenado permite saltar directo a la página
+            with lector:
+                return [lector.pelicula(i) for i in range(*slice(offset, fin).indices(len(lector)))]
+        return list(islice(self.iter_ordenado(), offset, fin))
+
+    def cantidad(self) -> int:
+        """Cuántas películas tiene el catálogo (sirve para paginar sin listar)."""
+        with self._lock:
+            if self._indice.vigente():
+                return len(self._indice)
+            vista = self._vista_posicional()
+            if vista is not None:
+                return len(vista)  # líneas del tramo menos las anuladas, más la cola viva
+            if self._filtro_bloom() is not None:
+                # catálogo grande: el total sale de las estadísticas (al día, sin cargar nombres)
+                return self._estadisticas.asegurar(self.iter_peliculas).total
+            return len(self._indice_nombres())
+
+    def estadisticas(self) -> Estadisticas:
+        """
+        Agregados del catálogo (ver estadisticas_catalogo). Las escrituras los
+        mantienen al día en el sidecar .stats: solo se recorre el catálogo si el
+        sidecar falta o no corresponde al .txt actual.
         """
-        peliculas = list(self.iter_peliculas())  # consume el generador
-        peliculas.sort(key=lambda p: p.nombre.lower())
-        return peliculas
+        with self._lock:
+            return self._estadisticas.asegurar(self.iter_peliculas).copia()
 
     @log_accion("acciones.log")
     @medir_tiempo
     def eliminar_catalogo(self) -> bool:
         """
-        Elimina el archivo .txt asociado al catálogo.
+        Elimina el archivo .txt asociado al catálogo (y su índice).
         Retorna True si lo eliminó; False si no existía.
         """
-        if os.path.exists(self.ruta_archivo):
-            os.remove(self.ruta_archivo)
-            return True
-        return False
+        if self._compactador is not None:
+            self._compactador.join()
+        with self.bloqueo_escritura():
+            self.liberar_memoria()
+            self._indice.eliminar()
+            self._estadisticas.eliminar()
+            self._bloom.eliminar()
+            self._lineas.eliminar()
+            orden_catalogo.eliminar(self.ruta_archivo)
+            if os.path.exists(self.ruta_binario):
+                os.remove(self.ruta_binario)
+            existia = os.path.exists(self.ruta_archivo)
+            if existia:
+                os.remove(self.ruta_archivo)
+            if self._nivel_bloqueo == 1:
+                # con el lock todavía tomado (ver eliminar_lock); si hay un bloqueo
+                # externo abierto, el .lock queda: ese bloqueo sigue en uso
+                eliminar_lock(self.ruta_base)
+        return existia
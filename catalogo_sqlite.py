@@ -0,0 +1,370 @@
+# catalogo_sqlite.py
+"""
+Motor "sqlite" de catálogos: un archivo "<nombre>.sqlite" por catálogo.
+
+Esquema:
+    peliculas(clave PRIMARY KEY, nombre, genero, anio)   -- WITHOUT ROWID
+    clave = a_minusculas(nombre): índice único por título normalizado,
+            que además da el orden A→Z sin ordenar nada
+    índices (genero, clave) y (anio, clave) → filtrar() no recorre la tabla
+
+Altas, bajas y duplicados van por índice (nada de recorrer el archivo). Las
+cargas en lote se hacen en UNA transacción, con executemany de a
+TAMANIO_LOTE filas. La base usa journal WAL: las lecturas no bloquean a las
+escrituras (útil con la GUI, que lee y escribe desde hilos distintos).
+
+Migrar catálogos .txt existentes:
+    python catalogo_sqlite.py migrar              # todos los .txt
+    python catalogo_sqlite.py migrar Infantiles   # solo esos
+El .txt original queda como respaldo en "<nombre>.txt.migrado".
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from almacenamiento import MOTORES, CatalogoBase, ResultadoLote, motor_de, nombres_catalogos
+from busqueda import IndiceBusqueda
+from estadisticas_catalogo import Estadisticas
+from pelicula import Pelicula
+from utils import (BASE_DIR_CATALOGOS, a_minusculas, firma_identidad, log_accion, medir_tiempo,
+                   normalizar_espacios)
+
+EXTENSION = MOTORES["sqlite"]
+TAMANIO_LOTE = 10_000  # filas por executemany() en las cargas y bajas en lote
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS peliculas (
+    clave  TEXT PRIMARY KEY,           -- a_minusculas(nombre)
+    nombre TEXT NOT NULL,
+    genero TEXT NOT NULL,              -- ya normalizado por Pelicula ("Drama")
+    anio   INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS peliculas_genero ON peliculas (genero, clave);
+CREATE INDEX IF NOT EXISTS peliculas_anio ON peliculas (anio, clave);
+"""
+
+_COLUMNAS = "nombre, genero, anio"
+
+
+def _a_pelicula(fila) -> Pelicula:
+    # los datos pasaron por el constructor de Pelicula al guardarse
+    nombre, genero, anio = fila
+    return Pelicula.confiable(nombre, sys.intern(genero), anio)
+
+
+class CatalogoSQLite(CatalogoBase):
+    """
+    Catálogo guardado en SQLite. Misma interfaz que CatalogoPeliculas.
+    La conexión se abre al primer uso (y el archivo se crea recién con la
+    primera escritura); una sola conexión por instancia, protegida por _lock.
+    """
+
+    def __init__(self, nombre: str, base_dir: str = BASE_DIR_CATALOGOS):
+        self.nombre = (nombre or "catalogo").strip()
+        self.base_dir = base_dir
+        os.makedirs(self.base_dir, exist_ok=True)
+        self.ruta_archivo = os.path.join(self.base_dir, f"{self.nombre}{EXTENSION}")
+        self._lock = threading.RLock()
+        self._conexion: Optional[sqlite3.Connection] = None
+        # índice de búsqueda: se valida con PRAGMA data_version (cambia si OTRA
+        # conexión escribió); las escrituras propias lo actualizan en el lugar
+        self._busqueda: Optional[IndiceBusqueda] = None
+        self._busqueda_version: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"CatalogoSQLite({self.nombre!r})"
+
+    # --- CONEXIÓN ---
+
+    def _db(self) -> sqlite3.Connection:
+        """Conexión abierta (crea el archivo y el esquema si hace falta)."""
+        if self._conexion is None:
+            conexion = sqlite3.connect(self.ruta_archivo, check_same_thread=False)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")  # con WAL: seguro ante cortes del programa
+            conexion.executescript(_ESQUEMA)
+            self._conexion = conexion
+        return self._conexion
+
+    def _consultar(self, sql: str, parametros: tuple = ()) -> list:
+        """Ejecuta una lectura; si el catálogo todavía no existe, no lo crea y devuelve []."""
+        with self._lock:
+            if self._conexion is None and not self.existe():
+                return []
+            return self._db().execute(sql, parametros).fetchall()
+
+    def _version(self) -> int:
+        return self._db().execute("PRAGMA data_version").fetchone()[0]
+
+    def cerrar(self) -> None:
+        with self._lock:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
+
+    def crear(self) -> None:
+        with self._lock:
+            self._db()
+
+    def firma(self) -> tuple:
+        # con WAL las escrituras van primero al "-wal": el archivo principal no cambia
+        return firma_identidad(self.ruta_archivo) + firma_identidad(self.ruta_archivo + "-wal")
+
+    # --- LECTURA ---
+
+    def iter_peliculas(self) -> Iterator[Pelicula]:
+        """En SQLite recorrer en orden por clave no cuesta más: es iter_ordenado()."""
+        return self.iter_ordenado()
+
+    def iter_ordenado(self) -> Iterator[Pelicula]:
+        """Películas A→Z en streaming (de a 1000 filas por vez)."""
+        with self._lock:
+            if self._conexion is None and not self.existe():
+                return
+            cursor = self._db().execute(f"SELECT {_COLUMNAS} FROM peliculas ORDER BY clave")
+        while True:
+            with self._lock:
+                filas = cursor.fetchmany(1000)
+            if not filas:
+                return
+            for fila in filas:
+                yield _a_pelicula(fila)
+
+    @log_accion("acciones.log")
+    @medir_tiempo
+    def listar(self, offset: int = 0, limite: Optional[int] = None) -> List[Pelicula]:
+        """Página del listado A→Z (recorre el índice de la clave, no ordena)."""
+        return self.filtrar(offset=offset, limite=limite)
+
+    def filtrar(self, genero: Optional[str] = None, anio_desde: Optional[int] = None,
+                anio_hasta: Optional[int] = None, offset: int = 0,
+                limite: Optional[int] = None) -> List[Pelicula]:
+        """Igual que CatalogoBase.filtrar(), pero resuelto con los índices de género y año."""
+        condiciones, parametros = [], []
+        if genero:
+            # mismo normalizado que Pelicula: la comparación exacta usa el índice
+            condiciones.append("genero = ?")
+            parametros.append(normalizar_espacios(genero).capitalize())
+        if anio_desde is not None:
+            condiciones.append("anio >= ?")
+            parametros.append(anio_desde)
+        if anio_hasta is not None:
+            condiciones.append("anio <= ?")
+            parametros.append(anio_hasta)
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        parametros += [-1 if limite is None else max(0, limite), max(0, offset)]
+        filas = self._consultar(
+            f"SELECT {_COLUMNAS} FROM peliculas {donde} ORDER BY clave LIMIT ? OFFSET ?", tuple(parametros))
+        return [_a_pelicula(f) for f in filas]
+
+    def cantidad(self) -> int:
+        filas = self._consultar("SELECT COUNT(*) FROM peliculas")
+        return filas[0][0] if filas else 0
+
+    def estadisticas(self) -> Estadisticas:
+        """Agregados con GROUP BY sobre los índices de año y género (sin traer las filas)."""
+        est = Estadisticas()
+        est.por_anio = dict(self._consultar("SELECT anio, COUNT(*) FROM peliculas GROUP BY anio"))
+        est.por_genero = dict(self._consultar("SELECT genero, COUNT(*) FROM peliculas GROUP BY genero"))
+        est.total = sum(est.por_anio.values())
+        return est
+
+    def contiene(self, nombre: str) -> bool:
+        clave = a_minusculas(normalizar_espacios(nombre or ""))
+        return bool(self._consultar("SELECT 1 FROM peliculas WHERE clave = ?", (clave,)))
+
+    # --- BÚSQUEDA ---
+
+    def _indice_busqueda(self) -> IndiceBusqueda:
+        version = self._version()
+        if self._busqueda is None or self._busqueda_version != version:
+            self._busqueda = IndiceBusqueda(self.iter_peliculas(), clave=lambda p: a_minusculas(p.nombre))
+            self._busqueda_version = version
+        return self._busqueda
+
+    def _busqueda_vigente(self) -> bool:
+        return self._busqueda is not None and self._busqueda_version == self._version()
+
+    @log_accion("acciones.log")
+    @medir_tiempo
+    def buscar(self, consulta: str, limite: int = 20, aproximada: bool = True) -> List[Pelicula]:
+        """Igual que CatalogoPeliculas.buscar(): sin tildes, por prefijo, substring o aproximada."""
+        return [p for p, _ in self.buscar_con_puntaje(consulta, limite, aproximada)]
+
+    def buscar_con_puntaje(self, consulta: str, limite: int = 20,
+                           aproximada: bool = True) -> List[Tuple[Pelicula, float]]:
+        with self._lock:
+            if self._conexion is None and not self.existe():
+                return []
+            return self._indice_busqueda().buscar_con_puntaje(consulta, limite, aproximada)
+
+    def claves(self) -> Set[str]:
+        return {fila[0] for fila in self._consultar("SELECT clave FROM peliculas")}
+
+    # --- ESCRITURA ---
+
+    @log_accion("acciones.log")
+    @medir_tiempo
+    def agregar(self, pelicula: Pelicula) -> bool:
+        """Agrega la película si no existe; el índice único de la clave descarta las duplicadas."""
+        return self._agregar_lote([pelicula]).agregadas == 1
+
+    @log_accion("acciones.log")
+    @medir_tiempo
+    def agregar_muchos(self, peliculas: Iterable[Pelicula]) -> ResultadoLote:
+        """
+        Agrega en una sola transacción (executemany de a TAMANIO_LOTE filas).
+        A diferencia del motor txt, es todo o nada: si el iterable falla a
+        mitad de camino, no queda nada agregado.
+        """
+        return self._agregar_lote(peliculas)
+
+    def _agregar_lote(self, peliculas: Iterable[Pelicula]) -> ResultadoLote:
+        with self._lock:
+            conexion = self._db()
+            busqueda = self._busqueda if self._busqueda_vigente() else None
+            # las altas entran al índice de búsqueda recién después del commit:
+            # si la transacción se deshace, el índice no se queda con títulos fantasma
+            nuevas: Dict[str, Pelicula] = {}
+            leidas = 0
+            cambios_previos = conexion.total_changes
+            iterador = iter(peliculas)
+            with conexion:  # una transacción para todo el lote
+                while True:
+                    lote = list(islice(iterador, TAMANIO_LOTE))
+                    if not lote:
+                        break
+                    leidas += len(lote)
+                    conexion.executemany(
+                        "INSERT OR IGNORE INTO peliculas (clave, nombre, genero, anio) VALUES (?, ?, ?, ?)",
+                        [(a_minusculas(p.nombre), p.nombre, p.genero, p.anio) for p in lote],
+                    )
+                    if busqueda is not None:
+                        for p in lote:
+                            clave = a_minusculas(p.nombre)
+                            if clave not in busqueda:
+                                nuevas.setdefault(clave, p)  # como INSERT OR IGNORE: gana la primera
+            agregadas = conexion.total_changes - cambios_previos
+            if busqueda is not None:
+                for p in nuevas.values():
+                    busqueda.agregar(p)
+                self._busqueda_version = self._version()
+            return ResultadoLote(agregadas, leidas - agregadas)
+
+    @log_accion("acciones.log")
+    @medir_tiempo
+    def eliminar(self, pelicula: Pelicula) -> bool:
+        """Borra la película (por su clave, vía índice). True si estaba."""
+        return self._eliminar_claves([a_minusculas(pelicula.nombre)]) == 1
+
+    @log_accion("acciones.log")
+    @medir_tiempo
+    def eliminar_muchos(self, peliculas: Iterable[Pelicula]) -> int:
+        """Igual que eliminar() para varias películas, en una sola transacción."""
+        return self._eliminar_claves(a_minusculas(p.nombre) for p in peliculas)
+
+    def _eliminar_claves(self, claves: Iterable[str]) -> int:
+        claves = list(dict.fromkeys(claves))
+        with self._lock:
+            if not claves or (self._conexion is None and not self.existe()):
+                return 0
+            conexion = self._db()
+            busqueda = self._busqueda if self._busqueda_vigente() else None
+            cambios_previos = conexion.total_changes
+            with conexion:
+                for i in range(0, len(claves), TAMANIO_LOTE):
+                    conexion.executemany("DELETE FROM peliculas WHERE clave = ?",
+                                         [(c,) for c in claves[i:i + TAMANIO_LOTE]])
+            if busqueda is not None:
+                for clave in claves:
+                    busqueda.quitar(clave)
+                self._busqueda_version = self._version()
+            return conexion.total_changes - cambios_previos
+
+    # --- CICLO DE VIDA ---
+
+    @log_accion("acciones.log")
+    @medir_tiempo
+    def eliminar_catalogo(self) -> bool:
+        """Cierra la conexión y borra la base (con sus archivos -wal y -shm)."""
+        with self._lock:
+            self.cerrar()
+            self._busqueda = self._busqueda_version = None
+            existia = self.existe()
+            for sufijo in ("", "-wal", "-shm"):
+                if os.path.exists(self.ruta_archivo + sufijo):
+                    os.remove(self.ruta_archivo + sufijo)
+            return existia
+
+    def memoria_estimada(self) -> int:
+        from catalogo_peliculas import BYTES_POR_ENTRADA_BUSQUEDA
+        return len(self._busqueda or ()) * BYTES_POR_ENTRADA_BUSQUEDA
+
+    def liberar_memoria(self) -> bool:
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._busqueda = self._busqueda_version = None
+            return True
+        finally:
+            self._lock.release()
+
+
+# ===================== migración .txt → .sqlite =====================
+
+def migrar_desde_txt(nombre: str, base_dir: str = BASE_DIR_CATALOGOS) -> int:
+    """
+    Pasa un catálogo del motor txt al motor sqlite. El .txt queda renombrado
+    como "<nombre>.txt.migrado" (respaldo) y se borran sus archivos derivados
+    (.idx, .orden, .catb). Retorna cuántas películas migró.
+    Todo corre con el lock de escritura del .txt tomado: un alta o baja de
+    otro proceso (CLI, servidor, GUI) espera y no queda solo en el respaldo.
+    """
+    from catalogo_peliculas import CatalogoPeliculas
+
+    origen = CatalogoPeliculas(nombre, base_dir)
+    if not origen.existe():  # antes del lock: no deja un .lock para un catálogo inexistente
+        raise FileNotFoundError(f"No existe el catálogo de texto {origen.ruta_archivo}")
+    destino = CatalogoSQLite(nombre, base_dir)
+    if destino.existe():
+        raise FileExistsError(f"Ya existe {destino.ruta_archivo}")
+    with origen.bloqueo_escritura():
+        if not origen.existe():  # otro proceso lo borró o migró mientras se esperaba el lock
+            raise FileNotFoundError(f"No existe el catálogo de texto {origen.ruta_archivo}")
+        try:
+            migradas = destino.agregar_muchos(origen.iter_ordenado()).agregadas
+        except BaseException:
+            destino.eliminar_catalogo()  # sin base a medio migrar: el .txt sigue siendo el catálogo
+            raise
+        destino.cerrar()
+        os.replace(origen.ruta_archivo, origen.ruta_archivo + ".migrado")
+        origen.eliminar_catalogo()  # el .txt ya no está: solo borra los derivados
+    return migradas
+
+
+def main(argv: Optional[list] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "migrar":
+        print("Uso: python catalogo_sqlite.py migrar [catalogo ...]")
+        return 2
+    nombres = argv[1:] or [n for n in nombres_catalogos() if motor_de(n) == "txt"]
+    if not nombres:
+        print("📂 No hay catálogos .txt para migrar.")
+        return 0
+    errores = 0
+    for nombre in nombres:
+        try:
+            n = migrar_desde_txt(nombre)
+            print(f"✅ {nombre}: {n} película(s) → {nombre}{EXTENSION}")
+        except (OSError, sqlite3.Error) as e:
+            print(f"❌ {nombre}: {e}")
+            errores += 1
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+# cli.py
+"""
+Línea de comandos sin menú, para scripts, cron y pipelines.
+
+    python cli.py list                          # catálogos y cuántas películas tiene cada uno
+    python cli.py list Infantiles --limite 50   # películas A→Z (--offset para paginar)
+    python cli.py add Infantiles "Toy Story" --anio 1995 [--genero Animación]
+    python cli.py import Infantiles peliculas.csv [--formato-entrada csv|jsonl|txt]
+    python cli.py delete Infantiles "Toy Story" "Shrek"
+    python cli.py search "toy stori" [--catalogo Infantiles] [--limite 20] [--exacta]
+    python cli.py stats [Infantiles]              # total, años, décadas y géneros
+    python cli.py export todo.jsonl.gz [Infantiles ...] [--formato-archivo jsonl|csv|columnas] [--carpeta]
+    python cli.py batch < comandos.txt          # un comando por línea, en un solo proceso
+
+La salida es un registro por línea: JSON (por defecto, --formato jsonl) o
+valores separados por tabs (--formato tsv, sin encabezado, en el orden de
+los campos del JSON). Los errores van a stderr y el código de salida es 1
+(2 si el comando está mal escrito).
+
+En modo batch cada línea de stdin es un comando con la misma sintaxis (sin
+"python cli.py"); todos corren en el mismo proceso y comparten los catálogos
+abiertos, así que no se paga el arranque ni la carga de índices por comando.
+Si un comando falla se informa en stderr y se sigue con el próximo.
+
+Los módulos del catálogo se importan recién cuando un comando los necesita:
+"python cli.py list" arranca en pocas decenas de milisegundos.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, TextIO
+
+FORMATOS_SALIDA = ("jsonl", "tsv")
+
+
+class ErrorComando(Exception):
+    """Un comando no se pudo completar (catálogo inexistente, datos inválidos, ...)."""
+
+
+# ===================== salida =====================
+
+class Salida:
+    """Escribe registros (dicts) como JSON Lines o TSV."""
+
+    def __init__(self, formato: str = "jsonl", destino: TextIO = sys.stdout):
+        self.formato = formato
+        self.destino = destino
+
+    def escribir(self, registro: Dict[str, object]) -> None:
+        if self.formato == "tsv":
+            linea = "\t".join(self._celda(v) for v in registro.values())
+        else:
+            linea = json.dumps(registro, ensure_ascii=False)
+        self.destino.write(linea + "\n")
+
+    @staticmethod
+    def _celda(valor: object) -> str:
+        if isinstance(valor, (dict, list)):
+            valor = json.dumps(valor, ensure_ascii=False)
+        elif valor is None:
+            valor = ""
+        # un tab o un salto de línea dentro de un título rompería la fila
+        return str(valor).replace("\t", " ").replace("\n", " ")
+
+
+def _registro_pelicula(catalogo: str, pelicula, **extra) -> Dict[str, object]:
+    return {"catalogo": catalogo, "nombre": pelicula.nombre, "genero": pelicula.genero,
+            "anio": pelicula.anio, **extra}
+
+
+# ===================== catálogos (imports diferidos) =====================
+
+def _catalogo(nombre: str, debe_existir: bool = True):
+    from registro_catalogos import obtener_catalogo
+    catalogo = obtener_catalogo(nombre)
+    if debe_existir and not catalogo.existe():
+        raise ErrorComando(f"El catálogo '{nombre}' no existe.")
+    return catalogo
+
+
+def _biblioteca():
+    from biblioteca import BibliotecaCatalogos
+    return BibliotecaCatalogos()
+
+
+def _estadisticas(catalogo) -> Dict[str, object]:
+    # función de módulo: BibliotecaCatalogos.recorrer() la puede mandar a otros hilos
+    return catalogo.estadisticas().a_dict()
+
+
+# ===================== comandos =====================
+
+def cmd_list(args, salida: Salida) -> None:
+    if args.offset < 0 or (args.limite is not None and args.limite < 0):
+        raise ErrorComando("--offset y --limite no pueden ser negativos.")
+    if args.catalogo is None:
+        # contar() entrega en el orden en que terminan: se ordena para que la salida sea estable
+        resultados = sorted(_biblioteca().contar(), key=lambda r: r.catalogo.lower())
+        for r in resultados:
+            if r.error is not None:
+                raise ErrorComando(f"{r.catalogo}: {r.error}")
+            salida.escribir({"catalogo": r.catalogo, "peliculas": r.valor})
+        return
+    catalogo = _catalogo(args.catalogo)
+    if args.limite is not None:
+        # una página: listar() salta directo al offset (índice de posiciones, .catb, cache)
+        peliculas = catalogo.listar(args.offset, args.limite)
+    else:
+        from itertools import islice
+        peliculas = islice(catalogo.iter_ordenado(), args.offset, None)  # hasta el final, en streaming
+    for p in peliculas:
+        salida.escribir(_registro_pelicula(catalogo.nombre, p))
+
+
+def cmd_add(args, salida: Salida) -> None:
+    from pelicula import Pelicula
+    from utils import normalizar_espacios
+    catalogo = _catalogo(args.catalogo, debe_existir=False)
+    # igual que en el menú: si no se indica, el género es el nombre del catálogo
+    genero = args.genero or normalizar_espacios(catalogo.nombre).capitalize()
+    try:
+        pelicula = Pelicula(args.titulo, genero, args.anio)
+        catalogo.validar(pelicula)
+    except ValueError as e:
+        raise ErrorComando(str(e))
+    salida.escribir(_registro_pelicula(catalogo.nombre, pelicula, agregada=catalogo.agregar(pelicula)))
+
+
+def cmd_import(args, salida: Salida) -> None:
+    from importador import importar_archivo
+    catalogo = _catalogo(args.catalogo, debe_existir=False)
+    try:
+        res = importar_archivo(catalogo, args.archivo, args.formato_entrada, args.genero)
+    except OSError as e:
+        raise ErrorComando(f"No se pudo leer {args.archivo}: {e}")
+    salida.escribir({"catalogo": catalogo.nombre, **res._asdict()})
+
+
+def cmd_delete(args, salida: Salida) -> None:
+    from pelicula import Pelicula
+    catalogo = _catalogo(args.catalogo)
+    presentes = [t for t in args.titulos if t.strip() and catalogo.contiene(t)]
+    catalogo.eliminar_muchos(Pelicula(t) for t in presentes)  # un solo append para todas
+    eliminadas = set(presentes)
+    for titulo in args.titulos:
+        salida.escribir({"catalogo": catalogo.nombre, "nombre": titulo, "eliminada": titulo in eliminadas})
+
+
+def cmd_search(args, salida: Salida) -> None:
+    aproximada = not args.exacta
+    if args.catalogo is not None:
+        catalogo = _catalogo(args.catalogo)
+        for p, puntaje in catalogo.buscar_con_puntaje(args.consulta, args.limite, aproximada):
+            salida.escribir(_registro_pelicula(catalogo.nombre, p, puntaje=round(puntaje, 2)))
+        return
+    for c in _biblioteca().buscar(args.consulta, args.limite, aproximada):
+        salida.escribir(_registro_pelicula(c.catalogo, c.pelicula, puntaje=round(c.puntaje, 2)))
+
+
+def cmd_stats(args, salida: Salida) -> None:
+    if args.catalogo is not None:
+        catalogo = _catalogo(args.catalogo)
+        salida.escribir({"catalogo": catalogo.nombre, **_estadisticas(catalogo)})
+        return
+    resultados = sorted(_biblioteca().recorrer(_estadisticas), key=lambda r: r.catalogo.lower())
+    for r in resultados:
+        if r.error is not None:
+            raise ErrorComando(f"{r.catalogo}: {r.error}")
+        salida.escribir({"catalogo": r.catalogo, **r.valor})
+
+
+def cmd_export(args, salida: Salida) -> None:
+    from exportador import exportar_catalogos
+    if args.destino == "-":
+        raise ErrorComando("export necesita un archivo de destino (para stdout: python exportador.py)")
+    try:
+        resultados = exportar_catalogos(args.catalogos, args.destino, args.formato_archivo,
+                                        args.carpeta, args.gzip)
+    except ValueError as e:
+        raise ErrorComando(str(e))
+    except OSError as e:
+        raise ErrorComando(f"No se pudo escribir {args.destino}: {e}")
+    for r in resultados:
+        salida.escribir(r._asdict())
+
+
+# ===================== parser =====================
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Catálogo de películas sin menú.")
+    parser.add_argument("--formato", choices=FORMATOS_SALIDA, default="jsonl", help="formato de salida")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("list", aliases=["listar"], help="catálogos, o películas de un catálogo")
+    p.add_argument("catalogo", nargs="?")
+    p.add_argument("--offset", type=int, default=0)
+    p.add_argument("--limite", type=int)
+    p.set_defaults(funcion=cmd_list)
+
+    p = sub.add_parser("add", aliases=["agregar"], help="agrega una película")
+    p.add_argument("catalogo")
+    p.add_argument("titulo")
+    p.add_argument("--genero", help="por defecto, el nombre del catálogo")
+    p.add_argument("--anio", type=int, default=0)
+    p.set_defaults(funcion=cmd_add)
+
+    p = sub.add_parser("import", aliases=["importar"], help="importa un archivo (CSV / JSONL / txt)")
+    p.add_argument("catalogo")
+    p.add_argument("archivo", help="'-' para stdin (no disponible en batch)")
+    p.add_argument("--formato-entrada", choices=("csv", "jsonl", "txt"))
+    p.add_argument("--genero", help="para las filas que no lo traen")
+    p.set_defaults(funcion=cmd_import)
+
+    p = sub.add_parser("delete", aliases=["eliminar"], help="elimina películas por título")
+    p.add_argument("catalogo")
+    p.add_argument("titulos", nargs="+")
+    p.set_defaults(funcion=cmd_delete)
+
+    p = sub.add_parser("search", aliases=["buscar"], help="busca por título (en uno o en todos los catálogos)")
+    p.add_argument("consulta")
+    p.add_argument("--catalogo")
+    p.add_argument("--limite", type=int, default=20)
+    p.add_argument("--exacta", action="store_true", help="sin tolerancia a errores de tipeo")
+    p.set_defaults(funcion=cmd_search)
+
+    p = sub.add_parser("stats", aliases=["estadisticas"], help="cantidad, años, décadas y géneros")
+    p.add_argument("catalogo", nargs="?")
+    p.set_defaults(funcion=cmd_stats)
+
+    p = sub.add_parser("export", aliases=["exportar"], help="exporta catálogos a JSONL / CSV / columnas")
+    p.add_argument("destino", help="archivo (.gz comprime), o carpeta con --carpeta")
+    p.add_argument("catalogos", nargs="*", help="por defecto, todos")
+    p.add_argument("--formato-archivo", choices=("jsonl", "csv", "columnas"), default="jsonl")
+    p.add_argument("--carpeta", action="store_true", help="un archivo por catálogo dentro de destino")
+    p.add_argument("--gzip", action="store_true", default=None)
+    p.set_defaults(funcion=cmd_export)
+
+    p = sub.add_parser("batch", help="lee comandos de stdin, uno por línea")
+    p.set_defaults(funcion=None)
+    return parser
+
+
+def ejecutar(parser: argparse.ArgumentParser, argv: List[str], salida: Optional[Salida] = None,
+             errores: TextIO = sys.stderr) -> int:
+    """Corre un comando. Retorna el código de salida (0 ok, 1 error, 2 uso incorrecto)."""
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:  # argparse ya escribió el mensaje de uso en stderr
+        return e.code if isinstance(e.code, int) else 2
+    salida = salida or Salida(args.formato)
+    if args.funcion is None:
+        return ejecutar_lote(parser, sys.stdin, salida, errores)
+    try:
+        args.funcion(args, salida)
+    except ErrorComando as e:
+        errores.write(f"error: {e}\n")
+        return 1
+    return 0
+
+
+def ejecutar_lote(parser: argparse.ArgumentParser, entrada: Iterable[str], salida: Salida,
+                  errores: TextIO = sys.stderr) -> int:
+    """Modo batch: un comando por línea (las vacías y las que empiezan con '#' se saltean)."""
+    import shlex
+    codigo = 0
+    for n, linea in enumerate(entrada, start=1):
+        linea = linea.strip()
+        if not linea or linea.startswith("#"):
+            continue
+        try:
+            argv = shlex.split(linea)
+        except ValueError as e:
+            errores.write(f"línea {n}: {e}\n")
+            codigo = 1
+            continue
+        if argv[0] == "batch" or (argv[0] in ("import", "importar") and "-" in argv[1:]):
+            errores.write(f"línea {n}: ese comando no se puede usar dentro de batch\n")
+            codigo = 1
+            continue
+        # el formato de salida lo fija la invocación de batch, no cada línea
+        if ejecutar(parser, argv, salida, errores) != 0:
+            errores.write(f"línea {n}: falló '{linea}'\n")
+            codigo = 1
+    return codigo
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = crear_parser()
+    try:
+        codigo = ejecutar(parser, sys.argv[1:] if argv is None else argv)
+        sys.stdout.flush()
+        return codigo
+    except BrokenPipeError:
+        # la salida se cortó (p. ej. "| head"): no es un error del comando; se
+        # redirige stdout a /dev/null para que el flush final no vuelva a fallar
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+# compresion.py
+"""
+Catálogos de texto comprimidos: "<nombre>.txt.gz" y "<nombre>.txt.xz".
+
+El motor txt (catalogo_peliculas) lee y agrega en un .txt.gz / .txt.xz igual
+que en un .txt; el resto del programa no se entera. Detalles:
+
+- Agregar escribe un miembro gzip (o stream xz) nuevo al final del archivo:
+  lo anterior no se recomprime. Al leer, los miembros concatenados se ven
+  como un solo texto.
+- Como cada miembro empieza en un byte conocido del archivo comprimido, el
+  tramo ordenado (.orden) sigue valiendo: la cola de altas se descomprime
+  por separado, desde el byte donde termina el tramo.
+- Un corte a mitad de un append deja un miembro incompleto al final; al leer
+  se ignora (como la línea a medias de un .txt).
+- compactar() reescribe el catálogo en el mismo formato en que está.
+
+Política de catálogos fríos: comprimir_frios() comprime los .txt que no se
+leyeron ni modificaron en los últimos N días (pensado para cron):
+
+    python compresion.py frios [--dias 30] [--formato gz|xz]
+    python compresion.py comprimir <catalogo> [--formato gz|xz]
+    python compresion.py descomprimir <catalogo>
+"""
+
+import argparse
+import gzip
+import io
+import lzma
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import IO, BinaryIO, Iterator, List, Optional, TextIO
+
+from escritura_segura import sincronizar as fsync_archivo
+from utils import BASE_DIR_CATALOGOS
+
+# sufijo agregado al .txt → módulo que lo lee y escribe ("" = sin comprimir)
+SUFIJOS = {"": None, ".gz": gzip, ".xz": lzma}
+FORMATOS = {"gz": ".gz", "xz": ".xz"}
+EXTENSIONES_TXT = tuple(".txt" + s for s in SUFIJOS)  # (".txt", ".txt.gz", ".txt.xz")
+NIVEL_GZIP = 6   # el 9 por defecto comprime apenas más y tarda bastante más
+DIAS_FRIO = 30
+BUFFER_ESCRITURA = 1 << 20
+
+
+def sufijo(ruta: str) -> str:
+    """".gz", ".xz" o "" según la extensión de la ruta."""
+    for s in (".gz", ".xz"):
+        if ruta.endswith(s):
+            return s
+    return ""
+
+
+def ruta_datos(ruta_base: str) -> str:
+    """
+    Archivo de datos de un catálogo a partir de "<nombre>.txt": el que exista
+    (sin comprimir, .gz o .xz, en ese orden); si no existe ninguno, el .txt.
+    """
+    for s in SUFIJOS:
+        if os.path.exists(ruta_base + s):
+            return ruta_base + s
+    return ruta_base
+
+
+# ===================== lectura =====================
+
+def descomprimir(f: BinaryIO, sufijo_archivo: str) -> IO[bytes]:
+    """Lector de bytes descomprimidos desde la posición actual de f (que no se cierra)."""
+    if sufijo_archivo == ".gz":
+        return gzip.GzipFile(fileobj=f, mode="rb")
+    if sufijo_archivo == ".xz":
+        return lzma.LZMAFile(f, mode="rb")
+    return f
+
+
+def lineas_crudas(f: IO[bytes]) -> Iterator[bytes]:
+    """Las líneas (bytes) de f; si el último miembro comprimido quedó cortado, termina ahí."""
+    try:
+        yield from f
+    except EOFError:
+        return
+
+
+def leer_lineas(ruta: str) -> Iterator[str]:
+    """Las líneas de texto del archivo (comprimido o no), en streaming."""
+    s = sufijo(ruta)
+    if not s:
+        with open(ruta, "r", encoding="utf-8") as f:
+            yield from f
+        return
+    with open(ruta, "rb") as crudo:
+        texto = io.TextIOWrapper(descomprimir(crudo, s), encoding="utf-8")
+        try:
+            yield from texto
+        except EOFError:
+            return
+
+
+# ===================== escritura =====================
+
+@contextmanager
+def abrir_escritura(ruta: str, modo: str = "w", sufijo_archivo: Optional[str] = None,
+                    sincronizar: bool = False) -> Iterator[TextIO]:
+    """
+    Abre ruta para escribir ("w") o agregar ("a") texto, comprimido según
+    sufijo_archivo (None = el de la ruta; sirve para temporales "*.tmp").
+    Al salir cierra el miembro comprimido y, si sincronizar, hace fsync
+    (con el miembro ya completo: un fsync antes del cierre no lo incluiría).
+    """
+    s = sufijo(ruta) if sufijo_archivo is None else sufijo_archivo
+    with open(ruta, modo + "b", buffering=BUFFER_ESCRITURA) as crudo:
+        if s == ".gz":
+            binario = gzip.GzipFile(fileobj=crudo, mode=modo + "b", compresslevel=NIVEL_GZIP)
+        elif s == ".xz":
+            binario = lzma.LZMAFile(crudo, mode=modo + "b")
+        else:
+            binario = crudo
+        texto = io.TextIOWrapper(binario, encoding="utf-8", newline="")
+        try:
+            yield texto
+        finally:
+            # como con open(): lo escrito hasta un error queda escrito, y completo
+            texto.flush()
+            texto.detach()
+            if binario is not crudo:
+                binario.close()  # escribe el final del miembro (no cierra crudo)
+        if sincronizar:
+            fsync_archivo(crudo)
+
+
+# ===================== política de catálogos fríos =====================
+
+def segundos_sin_uso(ruta: str) -> float:
+    """Segundos desde la última lectura o modificación del archivo."""
+    st = os.stat(ruta)
+    return time.time() - max(st.st_mtime, st.st_atime)
+
+
+def catalogos_frios(dias: float = DIAS_FRIO, base_dir: str = BASE_DIR_CATALOGOS) -> List[str]:
+    """Catálogos .txt sin comprimir que no se usaron en los últimos 'dias' días."""
+    from almacenamiento import nombres_catalogos
+    frios = []
+    for nombre in nombres_catalogos(base_dir):
+        ruta = os.path.join(base_dir, nombre + ".txt")
+        try:
+            if segundos_sin_uso(ruta) > dias * 86400:
+                frios.append(nombre)
+        except FileNotFoundError:
+            continue  # otro motor, o ya comprimido
+    return frios
+
+
+def comprimir_frios(dias: float = DIAS_FRIO, formato: str = "gz",
+                    base_dir: str = BASE_DIR_CATALOGOS) -> List[str]:
+    """Comprime los catálogos fríos. Retorna cuáles comprimió."""
+    from registro_catalogos import obtener_catalogo
+    return [nombre for nombre in catalogos_frios(dias, base_dir)
+            if obtener_catalogo(nombre, base_dir).cambiar_compresion(FORMATOS[formato])]
+
+
+def main(argv: Optional[list] = None) -> int:
+    from almacenamiento import motor_de
+    from registro_catalogos import obtener_catalogo
+
+    parser = argparse.ArgumentParser(description="Compresión de catálogos de texto (.txt.gz / .txt.xz).")
+    sub = parser.add_subparsers(dest="accion", required=True)
+    p = sub.add_parser("frios", help="comprime los catálogos sin uso en los últimos N días")
+    p.add_argument("--dias", type=float, default=DIAS_FRIO)
+    p.add_argument("--formato", choices=FORMATOS, default="gz")
+    p = sub.add_parser("comprimir", help="comprime un catálogo")
+    p.add_argument("catalogo")
+    p.add_argument("--formato", choices=FORMATOS, default="gz")
+    p = sub.add_parser("descomprimir", help="vuelve un catálogo a .txt")
+    p.add_argument("catalogo")
+    args = parser.parse_args(argv)
+
+    if args.accion == "frios":
+        comprimidos = comprimir_frios(args.dias, args.formato)
+        print(f"🗜️ Comprimidos: {', '.join(comprimidos) if comprimidos else 'ninguno'}")
+        return 0
+    if motor_de(args.catalogo) != "txt" or not obtener_catalogo(args.catalogo).existe():
+        print(f"❌ No existe el catálogo de texto '{args.catalogo}'", file=sys.stderr)
+        return 1
+    catalogo = obtener_catalogo(args.catalogo)
+    cambio = catalogo.cambiar_compresion(FORMATOS[args.formato] if args.accion == "comprimir" else "")
+    print(f"✅ {catalogo.ruta_archivo}" if cambio else f"ℹ️ {catalogo.ruta_archivo} ya estaba así")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+# consultas.py
+"""
+Motor de consultas columnar (NumPy) sobre uno o varios catálogos.
+
+En vez de recorrer objetos Pelicula con bucles de Python, arma columnas:
+- anios      int32[n]   → año de estreno (0 = sin año)
+- generos    uint16[n]  → código en tabla_generos
+- catalogos  uint16[n]  → código en tabla_catalogos
+- offsets    int64[n+1] + nombres (bytes utf-8) → títulos, decodificados a pedido
+
+y resuelve filtros, agrupaciones y conteos con operaciones vectorizadas.
+
+Ejemplos:
+    vista = VistaColumnar.desde_catalogos()
+    vista.contar(por=("decada", "genero"))
+    idx = vista.filtrar(anio_desde=1990, anio_hasta=2005)
+    vista.titulos(idx)
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils import BASE_DIR_CATALOGOS
+
+DIMENSIONES = ("anio", "decada", "genero", "catalogo")
+
+
+def _factorizar(columna: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (valores únicos ordenados, índice de cada fila en esos únicos).
+    Para enteros chicos y no negativos (años, códigos) usa bincount: O(n) sin ordenar.
+    """
+    if len(columna) and columna.min() >= 0 and columna.max() < (1 << 20):
+        presentes = np.bincount(columna) > 0
+        posicion = np.cumsum(presentes) - 1
+        return np.flatnonzero(presentes), posicion[columna]
+    unicos, inverso = np.unique(columna, return_inverse=True)
+    return unicos, inverso.ravel()
+
+
+class VistaColumnar:
+    """Columnas NumPy inmutables armadas a partir de uno o más catálogos."""
+
+    def __init__(self, anios: np.ndarray, generos: np.ndarray, catalogos: np.ndarray,
+                 offsets: np.ndarray, nombres: bytes,
+                 tabla_generos: Sequence[str], tabla_catalogos: Sequence[str]):
+        self.anios = anios
+        self.generos = generos
+        self.catalogos = catalogos
+        self.offsets = offsets
+        self.nombres = nombres
+        self.tabla_generos = list(tabla_generos)
+        self.tabla_catalogos = list(tabla_catalogos)
+
+    def __len__(self) -> int:
+        return len(self.anios)
+
+    # ===================== construcción =====================
+
+    @classmethod
+    def desde_catalogos(cls, nombres: Optional[Iterable[str]] = None,
+                        base_dir: str = BASE_DIR_CATALOGOS) -> "VistaColumnar":
+        """
+        Arma la vista con los catálogos indicados (por defecto, todos los de
+        base_dir, de cualquier motor). Los catálogos con un .catb al día se cargan directo de
+        sus columnas binarias, sin crear objetos Pelicula.
+        """
+        from almacenamiento import nombres_catalogos
+        from registro_catalogos import obtener_catalogo
+
+        if nombres is None:
+            nombres = nombres_catalogos(base_dir)
+        return cls.desde_instancias(obtener_catalogo(n, base_dir) for n in nombres)
+
+    @classmethod
+    def desde_instancias(cls, catalogos: Iterable) -> "VistaColumnar":
+        tabla_generos: List[str] = []
+        codigo_genero: Dict[str, int] = {}
+        tabla_catalogos: List[str] = []
+        partes_anios, partes_generos, partes_cat, partes_largos = [], [], [], []
+        nombres = bytearray()
+
+        def codificar(genero: str) -> int:
+            codigo = codigo_genero.get(genero)
+            if codigo is None:
+                codigo = codigo_genero[genero] = len(tabla_generos)
+                tabla_generos.append(genero)
+            return codigo
+
+        for cat in catalogos:
+            codigo_cat = len(tabla_catalogos)
+            tabla_catalogos.append(cat.nombre)
+            lector = cat._lector_binario()
+            if lector is not None:
+                # camino rápido: columnas ya armadas en el .catb
+                with lector:
+                    n = len(lector)
+                    remapeo = np.array([codificar(g) for g in lector.generos] or [0], dtype=np.uint16)
+                    codigos = np.frombuffer(lector.codigos, dtype=np.uint16)
+                    partes_generos.append(remapeo[codigos])
+                    partes_anios.append(np.frombuffer(lector.anios, dtype=np.int32).copy())
+                    offs = np.frombuffer(lector.offsets, dtype=np.uint64).astype(np.int64)
+                    partes_largos.append(np.diff(offs))
+                    nombres += lector.nombres_utf8[:int(offs[-1])]
+                    del codigos, offs
+            else:
+                anios_cat, generos_cat, largos_cat = [], [], []
+                for p in cat.iter_peliculas():
+                    crudo = p.nombre.encode("utf-8")
+                    nombres += crudo
+                    largos_cat.append(len(crudo))
+                    anios_cat.append(p.anio)
+                    generos_cat.append(codificar(p.genero))
+                n = len(anios_cat)
+                partes_anios.append(np.array(anios_cat, dtype=np.int32))
+                partes_generos.append(np.array(generos_cat, dtype=np.uint16))
+                partes_largos.append(np.array(largos_cat, dtype=np.int64))
+            partes_cat.append(np.full(n, codigo_cat, dtype=np.uint16))
+
+        unir = lambda partes, dtype: np.concatenate(partes) if partes else np.zeros(0, dtype=dtype)
+        largos = unir(partes_largos, np.int64)
+        offsets = np.zeros(len(largos) + 1, dtype=np.int64)
+        np.cumsum(largos, out=offsets[1:])
+        return cls(
+            anios=unir(partes_anios, np.int32),
+            generos=unir(partes_generos, np.uint16),
+            catalogos=unir(partes_cat, np.uint16),
+            offsets=offsets,
+            nombres=bytes(nombres),
+            tabla_generos=tabla_generos,
+            tabla_catalogos=tabla_catalogos,
+        )
+
+    # ===================== filtros =====================
+
+    def _codigos(self, tabla: List[str], valores: Iterable[str]) -> np.ndarray:
+        buscados = {v.lower() for v in valores}
+        return np.array([i for i, v in enumerate(tabla) if v.lower() in buscados], dtype=np.uint16)
+
+    def mascara(self, anio_desde: Optional[int] = None, anio_hasta: Optional[int] = None,
+                generos: Optional[Iterable[str]] = None,
+                catalogos: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Máscara booleana con las filas que cumplen TODAS las condiciones.
+        Los rangos de años son inclusivos; géneros y catálogos, sin importar mayúsculas.
+        """
+        m = np.ones(len(self), dtype=bool)
+        if anio_desde is not None:
+            m &= self.anios >= anio_desde
+        if anio_hasta is not None:
+            m &= self.anios <= anio_hasta
+        if generos is not None:
+            m &= np.isin(self.generos, self._codigos(self.tabla_generos, generos))
+        if catalogos is not None:
+            m &= np.isin(self.catalogos, self._codigos(self.tabla_catalogos, catalogos))
+        return m
+
+    def filtrar(self, **condiciones) -> np.ndarray:
+        """Igual que mascara(), pero devuelve los índices de las filas que cumplen."""
+        return np.flatnonzero(self.mascara(**condiciones))
+
+    # ===================== agrupación y conteo =====================
+
+    def _columna(self, dimension: str) -> Tuple[np.ndarray, Optional[List[str]]]:
+        if dimension == "anio":
+            return self.anios, None
+        if dimension == "decada":
+            return (self.anios // 10) * 10, None
+        if dimension == "genero":
+            return self.generos, self.tabla_generos
+        if dimension == "catalogo":
+            return self.catalogos, self.tabla_catalogos
+        raise ValueError(f"Dimensión desconocida: {dimension} (opciones: {', '.join(DIMENSIONES)})")
+
+    def contar(self, por: Sequence[str] = ("genero",),
+               mascara: Optional[np.ndarray] = None) -> Dict[tuple, int]:
+        """
+        Cuenta filas agrupando por una o más dimensiones ("anio", "decada",
+        "genero", "catalogo"). Devuelve {(valor1, valor2, ...): cantidad}
+        solo con los grupos no vacíos, ordenado por clave.
+        """
+        if isinstance(por, str):
+            por = (por,)
+        inversos, etiquetas, tamanios = [], [], []
+        for dimension in por:
+            columna, tabla = self._columna(dimension)
+            if mascara is not None:
+                columna = columna[mascara]
+            unicos, inverso = _factorizar(columna)
+            inversos.append(inverso)
+            etiquetas.append([tabla[u] for u in unicos] if tabla is not None else unicos.tolist())
+            tamanios.append(len(unicos))
+        if not inversos or not len(inversos[0]):
+            return {}
+
+        combinado = np.ravel_multi_index(inversos, tamanios)
+        total = int(np.prod(tamanios))
+        if total <= 10_000_000:
+            conteos = np.bincount(combinado, minlength=total)
+            claves = np.flatnonzero(conteos)
+            valores = conteos[claves]
+        else:  # demasiadas combinaciones posibles para un arreglo denso
+            claves, valores = np.unique(combinado, return_counts=True)
+        indices = np.unravel_index(claves, tamanios)
+        resultado = {
+            tuple(etiquetas[d][indices[d][k]] for d in range(len(por))): int(valores[k])
+            for k in range(len(claves))
+        }
+        return dict(sorted(resultado.items(), key=lambda kv: tuple(str(x) for x in kv[0])))
+
+    # ===================== materialización =====================
+
+    def titulo(self, i: int) -> str:
+        return self.nombres[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def titulos(self, seleccion: Optional[np.ndarray] = None) -> List[str]:
+        """Títulos de las filas seleccionadas (índices o máscara booleana)."""
+        if seleccion is None:
+            indices = range(len(self))
+        elif seleccion.dtype == bool:
+            indices = np.flatnonzero(seleccion)
+        else:
+            indices = seleccion
+        return [self.titulo(int(i)) for i in indices]
+
+    def filas(self, seleccion: Optional[np.ndarray] = None) -> List[Tuple[str, str, int, str]]:
+        """(título, género, año, catálogo) de las filas seleccionadas."""
+        if seleccion is None:
+            indices = np.arange(len(self))
+        elif seleccion.dtype == bool:
+            indices = np.flatnonzero(seleccion)
+        else:
+            indices = seleccion
+        return [
+            (self.titulo(int(i)), self.tabla_generos[self.generos[i]],
+             int(self.anios[i]), self.tabla_catalogos[self.catalogos[i]])
+            for i in indices
+        ]
@@ -0,0 +1,149 @@
+# escritor_logs.py
+"""
+Escritor de logs en segundo plano, compartido por los decoradores de utils.py.
+
+- Los decoradores solo encolan los datos crudos (sin formatear).
+- Un único hilo consume la cola, arma las líneas y las escribe en lotes.
+- Cada archivo se rota por tamaño: acciones.log → acciones.log.1 → ...
+- Al terminar el programa (atexit) se vacía la cola antes de salir.
+"""
+
+import atexit
+import os
+import queue
+import threading
+from typing import Callable, Dict, Optional, TextIO
+
+# Tope por archivo antes de rotar y cuántas copias viejas se guardan
+MAX_BYTES_LOG = 5 * 1024 * 1024
+COPIAS_LOG = 3
+
+# Cuántos mensajes se escriben como máximo por tanda
+TAMANIO_LOTE = 512
+
+_FIN = object()  # centinela para cerrar el hilo
+
+
+class EscritorLogs:
+    """
+    Cola + hilo escritor.
+    encolar(ruta, formatear, *datos): formatear(*datos) se llama en el hilo
+    escritor, así que el costo de armar el texto no lo paga quien loguea.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES_LOG, copias: int = COPIAS_LOG,
+                 max_pendientes: int = 10_000):
+        self.max_bytes = max_bytes
+        self.copias = copias
+        self._cola: "queue.Queue" = queue.Queue(maxsize=max_pendientes)
+        self._archivos: Dict[str, TextIO] = {}
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+        self._cerrado = False
+
+    # --- API ---
+
+    def encolar(self, ruta: str, formatear: Callable[..., str], *datos) -> None:
+        """Encola un mensaje. Si la cola está llena, espera (no se pierden logs)."""
+        if self._cerrado:
+            # después de cerrar (por ejemplo, durante atexit) se escribe directo
+            self._escribir_lote({ruta: [formatear(*datos)]})
+            return
+        self._arrancar()
+        self._cola.put((ruta, formatear, datos))
+
+    def vaciar(self) -> None:
+        """Bloquea hasta que todo lo encolado quedó escrito en disco."""
+        if self._hilo is not None:
+            self._cola.join()
+
+    def cerrar(self) -> None:
+        """Vacía la cola, detiene el hilo y cierra los archivos."""
+        with self._lock:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            hilo = self._hilo
+        if hilo is not None:
+            self._cola.put(_FIN)
+            hilo.join()
+        for f in self._archivos.values():
+            f.close()
+        self._archivos.clear()
+
+    # --- HILO ESCRITOR ---
+
+    def _arrancar(self) -> None:
+        if self._hilo is not None:
+            return
+        with self._lock:
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._bucle, name="escritor-logs", daemon=True)
+                self._hilo.start()
+
+    def _bucle(self) -> None:
+        while True:
+            item = self._cola.get()  # espera al primer mensaje
+            lote = [item]
+            # ...y se lleva todo lo que ya esté esperando (hasta TAMANIO_LOTE)
+            while len(lote) < TAMANIO_LOTE:
+                try:
+                    lote.append(self._cola.get_nowait())
+                except queue.Empty:
+                    break
+
+            fin = False
+            por_archivo: Dict[str, list] = {}
+            for item in lote:
+                if item is _FIN:
+                    fin = True
+                    continue
+                ruta, formatear, datos = item
+                try:
+                    por_archivo.setdefault(ruta, []).append(formatear(*datos))
+                except Exception as e:  # un mensaje roto no debe tirar el hilo
+                    por_archivo.setdefault(ruta, []).append(f"[log] error al formatear: {e!r}\n")
+            try:
+                self._escribir_lote(por_archivo)
+            except OSError:
+                pass
+            finally:
+                for _ in lote:
+                    self._cola.task_done()
+            if fin:
+                return
+
+    def _escribir_lote(self, por_archivo: Dict[str, list]) -> None:
+        for ruta, lineas in por_archivo.items():
+            f = self._abrir(ruta)
+            f.write("".join(lineas))
+            f.flush()
+            if f.tell() >= self.max_bytes:
+                self._rotar(ruta)
+
+    def _abrir(self, ruta: str) -> TextIO:
+        f = self._archivos.get(ruta)
+        if f is None or f.closed:
+            carpeta = os.path.dirname(ruta)
+            if carpeta:
+                os.makedirs(carpeta, exist_ok=True)
+            f = open(ruta, "a", encoding="utf-8")
+            self._archivos[ruta] = f
+        return f
+
+    def _rotar(self, ruta: str) -> None:
+        """acciones.log → .1, .1 → .2, ...; la copia más vieja se descarta."""
+        self._archivos.pop(ruta).close()
+        if self.copias <= 0:
+            os.remove(ruta)
+            return
+        for i in range(self.copias - 1, 0, -1):
+            origen = f"{ruta}.{i}"
+            if os.path.exists(origen):
+                os.replace(origen, f"{ruta}.{i + 1}")
+        os.replace(ruta, f"{ruta}.1")
+
+
+# Instancia compartida por todo el proceso
+escritor = EscritorLogs()
+atexit.register(escritor.cerrar)
@@ -0,0 +1,101 @@
+# escritura_segura.py
+"""
+Escritura segura de catálogos cuando varios procesos (por ejemplo, la
+consola y la GUI) trabajan sobre la misma carpeta catalogos/.
+
+- bloqueo_exclusivo(ruta): lock advisory (fcntl.flock) sobre "<ruta>.lock".
+  Es un lock ENTRE PROCESOS: dentro de un mismo proceso, cada catálogo ya
+  serializa sus escrituras con su propio RLock.
+- sincronizar(f): flush + fsync; lo escrito sobrevive a un corte de luz.
+- reemplazar_atomico(temporal, destino): fsync del temporal, os.replace y
+  fsync de la carpeta. Ante un corte queda el archivo viejo o el nuevo,
+  nunca uno a medio escribir.
+
+En sistemas sin fcntl (Windows) el lock entre procesos no hace nada; el
+resto funciona igual.
+"""
+
+import os
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+EXTENSION_LOCK = ".lock"
+
+
+@contextmanager
+def bloqueo_exclusivo(ruta_datos: str) -> Iterator[None]:
+    """
+    Toma el lock exclusivo del archivo de datos (espera si otro proceso lo tiene).
+    OJO: no es reentrante dentro del mismo proceso (cada open() es un lock distinto).
+    Si mientras se esperaba el dueño anterior borró el .lock (eliminar_lock()),
+    el lock obtenido es el de un inodo huérfano: se suelta y se vuelve a intentar
+    con el archivo que está ahora en la ruta.
+    """
+    if fcntl is None:
+        yield
+        return
+    ruta_lock = ruta_datos + EXTENSION_LOCK
+    while True:
+        f = open(ruta_lock, "a")
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                vigente = os.fstat(f.fileno()).st_ino == os.stat(ruta_lock).st_ino
+            except FileNotFoundError:
+                vigente = False
+            if vigente:
+                break
+        except BaseException:
+            f.close()
+            raise
+        f.close()  # cerrar suelta el flock del inodo huérfano
+    try:
+        yield
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        f.close()
+
+
+def eliminar_lock(ruta_datos: str) -> None:
+    """
+    Borra el .lock. Llamar SOLO con bloqueo_exclusivo() tomado: quien estaba
+    esperando ese lock ve que el inodo ya no está en la ruta y reintenta
+    (borrarlo después de soltarlo dejaría a dos procesos "con el lock").
+    """
+    try:
+        os.remove(ruta_datos + EXTENSION_LOCK)
+    except FileNotFoundError:
+        pass
+
+
+def sincronizar(f: IO) -> None:
+    """Baja a disco lo escrito en f (buffer de Python + cache del sistema operativo)."""
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _sincronizar_carpeta(carpeta: str) -> None:
+    # el os.replace() queda firme recién cuando se sincroniza la carpeta (POSIX)
+    try:
+        fd = os.open(carpeta or ".", os.O_RDONLY)
+    except OSError:
+        return  # Windows no permite abrir carpetas: ahí el replace ya es durable
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def reemplazar_atomico(temporal: str, destino: str) -> None:
+    """Reemplaza destino por temporal de forma atómica y durable."""
+    with open(temporal, "rb+") as f:
+        os.fsync(f.fileno())
+    os.replace(temporal, destino)
+    _sincronizar_carpeta(os.path.dirname(destino))
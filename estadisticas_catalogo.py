@@ -0,0 +1,200 @@
+# estadisticas_catalogo.py
+"""
+Estadísticas de un catálogo mantenidas al día, sin recorrerlo.
+
+Estadisticas guarda los agregados (total, películas por año y por género);
+el resto sale de ahí: por década, año mínimo y máximo. Agregar o quitar una
+película es O(1).
+
+EstadisticasPersistentes las guarda en un sidecar "<catalogo>.txt.stats"
+(JSON) junto con la firma (tamaño, mtime) del .txt al que corresponden. Cada
+escritura del catálogo actualiza los agregados y la firma; solo si el sidecar
+no coincide con el .txt (cambio hecho por fuera, archivo reemplazado) se
+recalculan recorriendo el catálogo.
+"""
+
+import json
+import os
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from utils import firma_archivo
+
+
+class Estadisticas:
+    """Agregados de un conjunto de películas. El año 0 significa "sin año"."""
+
+    __slots__ = ("total", "por_anio", "por_genero")
+
+    def __init__(self, peliculas: Iterable = ()):
+        self.total = 0
+        self.por_anio: Dict[int, int] = {}
+        self.por_genero: Dict[str, int] = {}
+        for p in peliculas:
+            self.agregar(p.genero, p.anio)
+
+    def agregar(self, genero: str, anio: int) -> None:
+        self.total += 1
+        self.por_anio[anio] = self.por_anio.get(anio, 0) + 1
+        self.por_genero[genero] = self.por_genero.get(genero, 0) + 1
+
+    def quitar(self, genero: str, anio: int) -> None:
+        self.total -= 1
+        for conteos, clave in ((self.por_anio, anio), (self.por_genero, genero)):
+            n = conteos.get(clave, 0) - 1
+            if n > 0:
+                conteos[clave] = n
+            else:
+                conteos.pop(clave, None)
+
+    # --- derivados (recorren años o géneros distintos, nunca películas) ---
+
+    @property
+    def anio_min(self) -> Optional[int]:
+        return min((a for a in self.por_anio if a > 0), default=None)
+
+    @property
+    def anio_max(self) -> Optional[int]:
+        return max((a for a in self.por_anio if a > 0), default=None)
+
+    def por_decada(self) -> Dict[int, int]:
+        """{1990: n, 2000: m, ...} (las películas sin año no cuentan)."""
+        decadas: Dict[int, int] = {}
+        for anio, n in self.por_anio.items():
+            if anio > 0:
+                decadas[anio // 10 * 10] = decadas.get(anio // 10 * 10, 0) + n
+        return dict(sorted(decadas.items()))
+
+    def copia(self) -> "Estadisticas":
+        est = Estadisticas()
+        est.total, est.por_anio, est.por_genero = self.total, dict(self.por_anio), dict(self.por_genero)
+        return est
+
+    def a_dict(self) -> Dict[str, object]:
+        return {
+            "peliculas": self.total,
+            "anio_min": self.anio_min,
+            "anio_max": self.anio_max,
+            "sin_anio": self.por_anio.get(0, 0),
+            "por_decada": self.por_decada(),
+            "por_anio": dict(sorted((a, n) for a, n in self.por_anio.items() if a > 0)),
+            "por_genero": dict(sorted(self.por_genero.items())),
+        }
+
+    @classmethod
+    def desde_dict(cls, datos: dict) -> "Estadisticas":
+        est = cls()
+        est.por_anio = {int(a): int(n) for a, n in datos["por_anio"].items()}
+        if datos.get("sin_anio"):
+            est.por_anio[0] = int(datos["sin_anio"])
+        est.por_genero = {str(g): int(n) for g, n in datos["por_genero"].items()}
+        est.total = int(datos["peliculas"])
+        return est
+
+
+class EstadisticasPersistentes:
+    """Estadisticas de un .txt, con sidecar validado por firma (como IndiceNombres)."""
+
+    EXTENSION = ".stats"
+
+    def __init__(self, ruta_datos: str):
+        self.ruta_datos = ruta_datos
+        self.ruta_sidecar = ruta_datos + self.EXTENSION
+        self._estadisticas: Optional[Estadisticas] = None
+        self._firma: Optional[Tuple[int, int]] = None
+
+    def vigente_para(self, firma: Tuple[int, int]) -> bool:
+        """
+        True si hay estadísticas (en memoria o en el sidecar) para esa firma del
+        .txt. Leer el sidecar es barato: así una escritura las mantiene al día
+        aunque nadie las haya pedido todavía.
+        """
+        if self._estadisticas is not None and self._firma == firma:
+            return True
+        estadisticas = self._leer_sidecar(firma)
+        if estadisticas is None:
+            return False
+        self._estadisticas, self._firma = estadisticas, firma
+        return True
+
+    def asegurar(self, generar_peliculas: Callable[[], Iterable]) -> Estadisticas:
+        """Estadísticas del .txt actual: de memoria, del sidecar o recorriendo el catálogo."""
+        firma = firma_archivo(self.ruta_datos)
+        if not self.vigente_para(firma):
+            self._estadisticas = Estadisticas(generar_peliculas())
+            self._firma = firma
+            self._escribir_sidecar()
+        return self._estadisticas
+
+    # --- mantenimiento incremental (llamar DESPUÉS de escribir el .txt) ---
+
+    def actualizar(self, firma_previa: Tuple[int, int], altas: Optional[Iterable] = (),
+                   bajas: Optional[Iterable] = ()) -> None:
+        """
+        Aplica altas y bajas (películas) si las estadísticas correspondían al
+        archivo anterior al append. None en altas o bajas significa "hubo
+        cambios que no se conocen en detalle": las estadísticas se descartan
+        y se recalcularán la próxima vez que se pidan.
+        """
+        if not self.vigente_para(firma_previa):
+            return
+        if altas is None or bajas is None:
+            self.invalidar()
+            return
+        for p in altas:
+            self._estadisticas.agregar(p.genero, p.anio)
+        for p in bajas:
+            self._estadisticas.quitar(p.genero, p.anio)
+        self._firma = firma_archivo(self.ruta_datos)
+        self._escribir_sidecar()
+
+    def reanclar(self, firma_previa: Tuple[int, int]) -> None:
+        """El .txt se reescribió con el mismo contenido (compactación): solo cambia la firma."""
+        if self.vigente_para(firma_previa):
+            self._firma = firma_archivo(self.ruta_datos)
+            self._escribir_sidecar()
+
+    def mover(self, ruta_datos: str, firma_previa: Tuple[int, int]) -> None:
+        """
+        El catálogo pasó a otro archivo con el mismo contenido (comprimido o
+        descomprimido): cambia de sidecar conservando las estadísticas que
+        correspondían al archivo anterior. Llamar a reanclar() después.
+        """
+        self.vigente_para(firma_previa)  # que queden en memoria antes de borrar el sidecar
+        if os.path.exists(self.ruta_sidecar):
+            os.remove(self.ruta_sidecar)
+        self.ruta_datos = ruta_datos
+        self.ruta_sidecar = ruta_datos + self.EXTENSION
+
+    def invalidar(self) -> None:
+        self._estadisticas = self._firma = None
+
+    def eliminar(self) -> None:
+        self.invalidar()
+        if os.path.exists(self.ruta_sidecar):
+            os.remove(self.ruta_sidecar)
+
+    # --- sidecar ---
+
+    def _leer_sidecar(self, firma: Tuple[int, int]) -> Optional[Estadisticas]:
+        if firma == (-1, -1):
+            return None
+        try:
+            with open(self.ruta_sidecar, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+            if datos.get("version") != 1 or tuple(datos["firma"]) != firma:
+                return None
+            return Estadisticas.desde_dict(datos)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _escribir_sidecar(self) -> None:
+        if self._firma is None or self._firma == (-1, -1):
+            return
+        datos = {"version": 1, "firma": list(self._firma), **self._estadisticas.a_dict()}
+        temporal = self.ruta_sidecar + ".tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(datos, f, ensure_ascii=False)
+            os.replace(temporal, self.ruta_sidecar)
+        except OSError:
+            pass  # es solo un acelerador: sin sidecar se recalcula
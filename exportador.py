@@ -0,0 +1,214 @@
+# exportador.py
+"""
+Exportación de catálogos en streaming (el camino inverso de importador).
+
+Formatos (--formato):
+- jsonl    → un objeto {"catalogo", "nombre", "genero", "anio"} por línea
+- csv      → encabezado catalogo,nombre,genero,anio y una fila por película
+- columnas → una línea JSON por bloque de películas, con una lista por columna:
+             {"catalogo": ..., "filas": n, "nombre": [...], "anio": [...],
+              "genero": {"valores": [...], "codigos": [...]}}
+             (el género va como diccionario + códigos: se repite mucho)
+
+Las películas salen de iter_peliculas() de cada catálogo y se escriben por
+bloques de FILAS_POR_BLOQUE: la memoria usada no depende del tamaño del
+catálogo, nunca se arma la lista completa. Con --gzip (o si el destino
+termina en .gz) la salida se comprime mientras se escribe.
+
+Se pueden exportar varios catálogos (o todos) en una sola corrida: a un único
+archivo, con la columna "catalogo" para distinguirlos, o con --carpeta a un
+archivo por catálogo. Un archivo de destino se escribe en un temporal y se
+reemplaza al final: si la exportación falla, no queda un archivo a medias.
+
+Uso:
+    python exportador.py [catalogo ...] [--formato jsonl|csv|columnas] [--salida ARCHIVO|-] [--gzip]
+    python exportador.py --carpeta exportados/ --formato csv --gzip     # todos, uno por archivo
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+from contextlib import contextmanager
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional, TextIO
+
+from almacenamiento import CatalogoBase, nombres_catalogos
+from escritura_segura import reemplazar_atomico
+from pelicula import Pelicula
+from registro_catalogos import obtener_catalogo
+from utils import BASE_DIR_CATALOGOS
+
+FORMATOS = ("jsonl", "csv", "columnas")
+EXTENSIONES = {"jsonl": ".jsonl", "csv": ".csv", "columnas": ".columnas.jsonl"}
+FILAS_POR_BLOQUE = 10_000
+NIVEL_GZIP = 6            # el 9 por defecto de gzip comprime apenas más y tarda bastante más
+BUFFER_ESCRITURA = 1 << 20
+
+_json = json.JSONEncoder(ensure_ascii=False).encode
+
+
+class ResultadoExportacion(NamedTuple):
+    """Películas exportadas de un catálogo y a dónde fueron."""
+    catalogo: str
+    filas: int
+    destino: str
+
+
+# ===== Escritores (reciben un bloque de películas por llamada) =====
+
+def _bloque_jsonl(f: TextIO, catalogo: str, bloque: List[Pelicula]) -> None:
+    # mismo texto que json.dumps() de un dict, pero codificando solo el título:
+    # el catálogo y los géneros (que se repiten) se codifican una vez por bloque
+    prefijo = '{"catalogo": ' + _json(catalogo) + ', "nombre": '
+    generos = {g: _json(g) for g in {p.genero for p in bloque}}
+    f.write("".join(f'{prefijo}{_json(p.nombre)}, "genero": {generos[p.genero]}, "anio": {p.anio}}}\n'
+                    for p in bloque))
+
+
+def _bloque_csv(f: TextIO, catalogo: str, bloque: List[Pelicula]) -> None:
+    csv.writer(f, lineterminator="\n").writerows((catalogo, p.nombre, p.genero, p.anio) for p in bloque)
+
+
+def _bloque_columnas(f: TextIO, catalogo: str, bloque: List[Pelicula]) -> None:
+    codigos_genero = {}
+    codigos = [codigos_genero.setdefault(p.genero, len(codigos_genero)) for p in bloque]
+    f.write(_json({
+        "catalogo": catalogo,
+        "filas": len(bloque),
+        "nombre": [p.nombre for p in bloque],
+        "anio": [p.anio for p in bloque],
+        "genero": {"valores": list(codigos_genero), "codigos": codigos},
+    }) + "\n")
+
+
+_ESCRITORES = {"jsonl": _bloque_jsonl, "csv": _bloque_csv, "columnas": _bloque_columnas}
+_ENCABEZADOS = {"csv": "catalogo,nombre,genero,anio\n"}
+
+
+def _bloques(peliculas: Iterable[Pelicula], tamanio: int) -> Iterator[List[Pelicula]]:
+    it = iter(peliculas)
+    while True:
+        bloque = list(islice(it, tamanio))
+        if not bloque:
+            return
+        yield bloque
+
+
+# ===== Destino (archivo o stdout, con gzip opcional) =====
+
+@contextmanager
+def abrir_destino(ruta: str, comprimir: Optional[bool] = None) -> Iterator[TextIO]:
+    """
+    Flujo de texto UTF-8 hacia ruta ('-' = stdout). comprimir=None decide por
+    la extensión (.gz). Un archivo se escribe en "<ruta>.tmp" y recién al
+    cerrar sin errores reemplaza al destino.
+    """
+    if comprimir is None:
+        comprimir = ruta.endswith(".gz")
+    a_stdout = ruta == "-"
+    temporal = ruta + ".tmp"
+    crudo = sys.stdout.buffer if a_stdout else open(temporal, "wb", buffering=BUFFER_ESCRITURA)
+    try:
+        # mtime=0: el mismo catálogo exportado dos veces da el mismo .gz, byte a byte
+        binario = gzip.GzipFile(filename="", mode="wb", fileobj=crudo, compresslevel=NIVEL_GZIP,
+                                mtime=0) if comprimir else crudo
+        texto = io.TextIOWrapper(binario, encoding="utf-8", newline="")
+        yield texto
+        texto.flush()
+        texto.detach()  # cerrar el wrapper cerraría también stdout
+        if comprimir:
+            binario.close()  # escribe el final del gzip (no cierra crudo)
+        crudo.flush()
+        if not a_stdout:
+            crudo.close()
+            reemplazar_atomico(temporal, ruta)
+    except BaseException:
+        if not a_stdout:
+            crudo.close()
+            if os.path.exists(temporal):
+                os.remove(temporal)
+        raise
+
+
+# ===== Exportación =====
+
+def exportar(catalogos: Iterable[CatalogoBase], f: TextIO, formato: str,
+             filas_por_bloque: int = FILAS_POR_BLOQUE, destino: str = "") -> List[ResultadoExportacion]:
+    """Escribe en f las películas de todos los catálogos, en streaming."""
+    if formato not in _ESCRITORES:
+        raise ValueError(f"Formato desconocido: {formato}")
+    escribir_bloque = _ESCRITORES[formato]
+    f.write(_ENCABEZADOS.get(formato, ""))
+    resultados = []
+    for catalogo in catalogos:
+        filas = 0
+        for bloque in _bloques(catalogo.iter_peliculas(), filas_por_bloque):
+            escribir_bloque(f, catalogo.nombre, bloque)
+            filas += len(bloque)
+        resultados.append(ResultadoExportacion(catalogo.nombre, filas, destino))
+    return resultados
+
+
+def exportar_catalogos(nombres: Iterable[str], destino: str, formato: str = "jsonl",
+                       por_catalogo: bool = False, comprimir: Optional[bool] = None,
+                       filas_por_bloque: int = FILAS_POR_BLOQUE,
+                       base_dir: str = BASE_DIR_CATALOGOS) -> List[ResultadoExportacion]:
+    """
+    Exporta los catálogos nombrados (todos, si no se nombra ninguno) a un solo
+    archivo, o con por_catalogo=True a un archivo por catálogo dentro de la
+    carpeta destino ("<nombre>.jsonl", "<nombre>.csv.gz", ...).
+    """
+    existentes = nombres_catalogos(base_dir)
+    nombres = list(nombres) or existentes
+    for nombre in nombres:
+        if nombre not in existentes:
+            raise ValueError(f"No existe el catálogo '{nombre}'")
+    catalogos = (obtener_catalogo(n, base_dir) for n in nombres)
+
+    if not por_catalogo:
+        with abrir_destino(destino, comprimir) as f:
+            return exportar(catalogos, f, formato, filas_por_bloque, destino)
+
+    os.makedirs(destino, exist_ok=True)
+    sufijo = EXTENSIONES[formato] + (".gz" if comprimir else "")
+    resultados = []
+    for catalogo in catalogos:
+        ruta = os.path.join(destino, catalogo.nombre + sufijo)
+        with abrir_destino(ruta, comprimir) as f:
+            resultados += exportar([catalogo], f, formato, filas_por_bloque, ruta)
+    return resultados
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Exporta catálogos en streaming (JSONL / CSV / columnas).")
+    parser.add_argument("catalogos", nargs="*", help="catálogos a exportar (por defecto, todos)")
+    parser.add_argument("--formato", choices=FORMATOS, default="jsonl")
+    parser.add_argument("--salida", default="-", help="archivo de destino ('-' = stdout, .gz comprime)")
+    parser.add_argument("--carpeta", help="un archivo por catálogo dentro de esta carpeta")
+    parser.add_argument("--gzip", action="store_true", default=None, help="comprimir la salida con gzip")
+    parser.add_argument("--filas-por-bloque", type=int, default=FILAS_POR_BLOQUE)
+    args = parser.parse_args(argv)
+
+    por_catalogo = args.carpeta is not None
+    try:
+        resultados = exportar_catalogos(args.catalogos, args.carpeta if por_catalogo else args.salida,
+                                        args.formato, por_catalogo, args.gzip,
+                                        max(1, args.filas_por_bloque))
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    total = sum(r.filas for r in resultados)
+    # a stderr: stdout puede ser la exportación misma
+    print(f"✅ Exportadas {total} películas de {len(resultados)} catálogo(s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# filtro_bloom.py
+"""
+Filtro de Bloom persistente sobre las claves (títulos normalizados) de un catálogo.
+
+Para catálogos demasiado grandes para tener todas sus claves en un set en
+memoria (ver CatalogoPeliculas.MAX_CLAVES_EN_MEMORIA): responde "seguro que
+no está" o "quizás está". Casi todas las altas son títulos nuevos, así que
+casi siempre la respuesta es "no está" y no hace falta recorrer el archivo;
+solo un "quizás" se confirma con una pasada exacta.
+
+Sidecar "<catalogo>.txt.bloom":
+    cabecera fija (struct _CABECERA): marca, firma (tamaño, mtime) del archivo
+    de datos al que corresponde, bits, funciones de hash, claves cargadas,
+    capacidad y tasa de falsos positivos pedida
+    a continuación, los bits (m / 8 bytes)
+
+Se lee con mmap: consultar toca k páginas del archivo, no lo carga entero,
+así que en memoria quedan unos pocos KB aunque el filtro ocupe megas.
+Las altas prenden bits en el lugar y actualizan la firma de la cabecera. Las
+bajas no se pueden borrar de un Bloom: el filtro queda con claves de más (más
+"quizás", nunca un "no" equivocado) hasta la próxima compactación, que lo
+rearma con las claves vivas.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+from typing import Callable, Iterable, Optional, Tuple
+
+TASA_FALSOS_POSITIVOS = 0.01
+CAPACIDAD_MINIMA = 1024
+MARGEN_CAPACIDAD = 2  # se dimensiona para el doble de claves: deja crecer sin rearmarlo
+
+_CABECERA = struct.Struct("<4sqqQIQQd")  # marca, tamaño, mtime, bits, k, claves, capacidad, tasa
+_MARCA = b"BLM1"
+
+
+def dimensionar(capacidad: int, tasa: float) -> Tuple[int, int]:
+    """(bits, funciones de hash) óptimos para 'capacidad' claves con esa tasa de falsos positivos."""
+    capacidad = max(capacidad, 1)
+    bits = max(64, math.ceil(-capacidad * math.log(tasa) / (math.log(2) ** 2)))
+    bits = (bits + 7) // 8 * 8
+    return bits, max(1, round(bits / capacidad * math.log(2)))
+
+
+def _posiciones(clave: str, bits: int, k: int):
+    # doble hashing (Kirsch-Mitzenmacher): k posiciones a partir de dos hashes de 64 bits
+    resumen = hashlib.blake2b(clave.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(resumen[:8], "little")
+    h2 = int.from_bytes(resumen[8:], "little") | 1
+    return [(h1 + i * h2) % bits for i in range(k)]
+
+
+class FiltroBloom:
+    """Un filtro en memoria, para armarlo entero antes de guardarlo."""
+
+    def __init__(self, capacidad: int, tasa: float = TASA_FALSOS_POSITIVOS):
+        self.capacidad = capacidad
+        self.tasa = tasa
+        self.bits, self.k = dimensionar(capacidad, tasa)
+        self.arreglo = bytearray(self.bits // 8)
+        self.claves = 0
+
+    def agregar(self, clave: str) -> None:
+        arreglo = self.arreglo
+        for pos in _posiciones(clave, self.bits, self.k):
+            arreglo[pos >> 3] |= 1 << (pos & 7)
+        self.claves += 1
+
+
+class FiltroBloomPersistente:
+    """El filtro de un catálogo, validado contra la firma de su archivo de datos (como IndiceNombres)."""
+
+    EXTENSION = ".bloom"
+
+    def __init__(self, ruta_sidecar: str, tasa: float = TASA_FALSOS_POSITIVOS):
+        # el sidecar va junto a "<nombre>.txt" aunque el catálogo esté comprimido:
+        # la firma se recibe de afuera, la del archivo de datos que corresponda
+        self.ruta_sidecar = ruta_sidecar
+        self.tasa = tasa
+        self._f = None
+        self._mm: Optional[mmap.mmap] = None
+        self._bits = self._k = self.claves = self.capacidad = 0
+
+    # --- carga ---
+
+    def _firma_cabecera(self) -> Tuple[int, int]:
+        return tuple(_CABECERA.unpack_from(self._mm, 0)[1:3])
+
+    def vigente_para(self, firma: Tuple[int, int]) -> bool:
+        """True si el filtro corresponde al archivo de datos con esa firma (lo abre si hace falta)."""
+        if firma == (-1, -1):
+            return False
+        if self._mm is not None and self._firma_cabecera() == firma:
+            return True
+        self.cerrar()  # otro proceso pudo haberlo rearmado (archivo nuevo): se vuelve a abrir
+        try:
+            f = open(self.ruta_sidecar, "r+b")
+        except OSError:
+            return False
+        try:
+            mm = mmap.mmap(f.fileno(), 0)
+            marca, tam, mtime, bits, k, claves, capacidad, tasa = _CABECERA.unpack_from(mm, 0)
+        except (OSError, ValueError, struct.error):
+            f.close()
+            return False
+        # si cambió la tasa pedida, se rearma con el tamaño nuevo
+        if (marca != _MARCA or (tam, mtime) != firma or tasa != self.tasa
+                or len(mm) != _CABECERA.size + bits // 8):
+            mm.close()
+            f.close()
+            return False
+        self._f, self._mm = f, mm
+        self._bits, self._k, self.claves, self.capacidad = bits, k, claves, capacidad
+        return True
+
+    def asegurar(self, firma: Tuple[int, int], generar_claves: Callable[[], Iterable[str]],
+                 cantidad: int) -> "FiltroBloomPersistente":
+        """
+        Deja el filtro listo para esa firma: el sidecar si sirve; si no (falta,
+        quedó viejo o ya tiene más claves que su capacidad), lo rearma recorriendo
+        el catálogo, dimensionado para MARGEN_CAPACIDAD veces 'cantidad'.
+        """
+        if self.vigente_para(firma) and self.claves <= self.capacidad:
+            return self
+        filtro = self.nuevo(max(CAPACIDAD_MINIMA, cantidad * MARGEN_CAPACIDAD))
+        for clave in generar_claves():
+            filtro.agregar(clave)
+        self.guardar(filtro, firma)
+        return self
+
+    def nuevo(self, capacidad: Optional[int] = None) -> FiltroBloom:
+        """Filtro vacío con la tasa de este (y su capacidad, si no se indica otra)."""
+        return FiltroBloom(capacidad or self.capacidad or CAPACIDAD_MINIMA, self.tasa)
+
+    def guardar(self, filtro: FiltroBloom, firma: Tuple[int, int]) -> None:
+        """Reemplaza el sidecar por ese filtro (temporal + os.replace) y lo deja abierto."""
+        temporal = self.ruta_sidecar + ".tmp"
+        with open(temporal, "wb") as f:
+            f.write(_CABECERA.pack(_MARCA, firma[0], firma[1], filtro.bits, filtro.k, filtro.claves,
+                                   filtro.capacidad, filtro.tasa))
+            f.write(filtro.arreglo)
+        os.replace(temporal, self.ruta_sidecar)
+        self.cerrar()
+        self.vigente_para(firma)
+
+    # --- consultas ---
+
+    def __contains__(self, clave: str) -> bool:
+        """False: seguro que no está. True: quizás está (hay que confirmarlo)."""
+        mm = self._mm
+        base = _CABECERA.size
+        return all(mm[base + (pos >> 3)] & (1 << (pos & 7)) for pos in _posiciones(clave, self._bits, self._k))
+
+    # --- mantenimiento incremental (llamar DESPUÉS de escribir el archivo de datos) ---
+
+    def registrar(self, firma_previa: Tuple[int, int], firma: Tuple[int, int],
+                  altas: Iterable[str] = ()) -> None:
+        """
+        Agrega las claves nuevas y ancla el filtro a la firma nueva, si estaba
+        al día con el archivo anterior al append. Si no, queda inválido y se
+        rearmará cuando haga falta.
+        """
+        if not self.vigente_para(firma_previa):
+            return
+        mm, base, n = self._mm, _CABECERA.size, 0
+        for clave in altas:
+            for pos in _posiciones(clave, self._bits, self._k):
+                mm[base + (pos >> 3)] |= 1 << (pos & 7)
+            n += 1
+        self.claves += n
+        _CABECERA.pack_into(mm, 0, _MARCA, firma[0], firma[1], self._bits, self._k,
+                            self.claves, self.capacidad, self.tasa)
+
+    def cerrar(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._f.close()
+        self._f = self._mm = None
+
+    def eliminar(self) -> None:
+        self.cerrar()
+        if os.path.exists(self.ruta_sidecar):
+            os.remove(self.ruta_sidecar)
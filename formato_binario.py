@@ -0,0 +1,289 @@
+# formato_binario.py
+"""
+Formato binario compacto para catálogos (.catb), leído con mmap.
+
+Estructura (little-endian, secciones alineadas a 8 bytes):
+
+    cabecera   magic "CATB", versión, cantidad de géneros y de películas,
+               tamaño/mtime del .txt de origen y offsets de cada sección
+    géneros    tabla de géneros únicos: u16 largo + texto utf-8
+    offsets    u64[n + 1]  → el nombre i es nombres[off[i]:off[i + 1]]
+    códigos    u16[n]      → índice en la tabla de géneros
+    años       i32[n]      → año de estreno (0 = sin año)
+    nombres    todos los nombres en utf-8, uno detrás de otro
+
+Las películas se guardan en orden A→Z (sin importar mayúsculas), así que
+un .catb al día sirve también para listar y paginar en orden.
+
+Abrir el archivo no lee ni copia nada: offsets, códigos y años son vistas
+(memoryview) sobre el mmap; un nombre se decodifica recién cuando se pide.
+Los géneros se decodifican una sola vez y se comparten entre películas.
+
+Uso:
+    python formato_binario.py a-bin <catalogo>   # .txt → .catb
+    python formato_binario.py a-txt <catalogo> [--forzar]   # .catb → .txt
+                                 (--forzar: aunque el .txt haya cambiado desde a-bin)
+"""
+
+import mmap
+import struct
+import sys
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import compresion
+import orden_catalogo
+from escritura_segura import reemplazar_atomico
+from pelicula import Pelicula
+from utils import firma_archivo
+
+MAGIC = b"CATB"
+VERSION = 3  # v2: las películas se guardan ordenadas A→Z; v3: años i32 (antes u16)
+EXTENSION = ".catb"
+
+# magic, versión, n_generos, n_peliculas, fuente_tam, fuente_mtime,
+# off_generos, off_offsets, off_codigos, off_anios, off_nombres
+_CABECERA = struct.Struct("<4sHHIqq5Q")
+_ANIO_MIN, _ANIO_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def _alinear(n: int) -> int:
+    return (n + 7) & ~7
+
+
+# ===================== escritura =====================
+
+def escribir_binario(peliculas: Iterable[Pelicula], ruta_bin: str,
+                     firma_fuente: Tuple[int, int] = (-1, -1)) -> int:
+    """
+    Escribe las películas en formato .catb (temporal + escritura_segura.reemplazar_atomico).
+    firma_fuente: (tamaño, mtime) del .txt del que salieron, para poder
+    saber después si el binario sigue al día. Retorna cuántas escribió.
+    ValueError (sin tocar el .catb anterior) si una película no entra en el
+    formato: antes que guardar otro año, mejor seguir leyendo el .txt.
+    """
+    generos: List[str] = []
+    codigo_de = {}
+    offsets = [0]
+    codigos: List[int] = []
+    anios: List[int] = []
+    nombres = bytearray()
+
+    for p in peliculas:
+        codigo = codigo_de.get(p.genero)
+        if codigo is None:
+            codigo = codigo_de[p.genero] = len(generos)
+            generos.append(p.genero)
+        nombres += p.nombre.encode("utf-8")
+        offsets.append(len(nombres))
+        codigos.append(codigo)
+        if not _ANIO_MIN <= p.anio <= _ANIO_MAX:
+            raise ValueError(f"Año fuera de rango para el formato binario: {p.nombre} ({p.anio})")
+        anios.append(p.anio)
+
+    if len(generos) > 0xFFFF:
+        raise ValueError("Demasiados géneros distintos para el formato binario.")
+
+    n = len(codigos)
+    tabla_generos = b"".join(
+        struct.pack("<H", len(b)) + b for b in (g.encode("utf-8") for g in generos)
+    )
+    off_generos = _alinear(_CABECERA.size)
+    off_offsets = _alinear(off_generos + len(tabla_generos))
+    off_codigos = _alinear(off_offsets + 8 * (n + 1))
+    off_anios = _alinear(off_codigos + 2 * n)
+    off_nombres = _alinear(off_anios + 4 * n)
+
+    cabecera = _CABECERA.pack(
+        MAGIC, VERSION, len(generos), n, firma_fuente[0], firma_fuente[1],
+        off_generos, off_offsets, off_codigos, off_anios, off_nombres,
+    )
+    temporal = ruta_bin + ".tmp"
+    with open(temporal, "wb") as f:
+        for offset, bloque in (
+            (0, cabecera),
+            (off_generos, tabla_generos),
+            (off_offsets, struct.pack(f"<{n + 1}Q", *offsets)),
+            (off_codigos, struct.pack(f"<{n}H", *codigos)),
+            (off_anios, struct.pack(f"<{n}i", *anios)),
+            (off_nombres, bytes(nombres)),
+        ):
+            f.write(b"\0" * (offset - f.tell()))  # relleno de alineación
+            f.write(bloque)
+    reemplazar_atomico(temporal, ruta_bin)
+    return n
+
+
+def firma_fuente(ruta_bin: str) -> Optional[Tuple[int, int]]:
+    """Lee solo la cabecera y devuelve la firma del .txt de origen (o None si no es válido)."""
+    try:
+        with open(ruta_bin, "rb") as f:
+            datos = f.read(_CABECERA.size)
+    except OSError:
+        return None
+    if len(datos) < _CABECERA.size:
+        return None
+    campos = _CABECERA.unpack(datos)
+    if campos[0] != MAGIC or campos[1] != VERSION:
+        return None
+    return (campos[4], campos[5])
+
+
+def sellar_fuente(ruta_bin: str, firma: Tuple[int, int]) -> None:
+    """Actualiza en la cabecera la firma del .txt de origen (sin reescribir el resto)."""
+    with open(ruta_bin, "r+b") as f:
+        f.seek(struct.calcsize("<4sHHI"))
+        f.write(struct.pack("<qq", *firma))
+
+
+# ===================== lectura =====================
+
+class LectorBinario:
+    """
+    Acceso de solo lectura a un .catb vía mmap.
+    len(), nombre(i), genero(i), anio(i) son O(1); iter_peliculas() recorre todo.
+    """
+
+    def __init__(self, ruta_bin: str):
+        self.ruta = ruta_bin
+        self._f = open(ruta_bin, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # archivo vacío
+            self._f.close()
+            raise ValueError(f"{ruta_bin}: archivo binario vacío")
+        (magic, version, n_generos, n, tam, mtime,
+         off_generos, off_offsets, off_codigos, off_anios, off_nombres) = _CABECERA.unpack_from(self._mm, 0)
+        # las vistas de abajo usan el orden de bytes de la máquina
+        if magic != MAGIC or version != VERSION or sys.byteorder != "little":
+            self.cerrar()
+            raise ValueError(f"{ruta_bin}: no es un catálogo binario válido")
+        self.firma_fuente = (tam, mtime)
+        self._n = n
+
+        # tabla de géneros: se decodifica una sola vez (pocos valores, muy repetidos)
+        generos, pos = [], off_generos
+        for _ in range(n_generos):
+            (largo,) = struct.unpack_from("<H", self._mm, pos)
+            generos.append(sys.intern(self._mm[pos + 2:pos + 2 + largo].decode("utf-8")))
+            pos += 2 + largo
+        self.generos: Tuple[str, ...] = tuple(generos)
+
+        # vistas sin copia sobre el mmap
+        vista = memoryview(self._mm)
+        self._offsets = vista[off_offsets:off_offsets + 8 * (n + 1)].cast("Q")
+        self.codigos = vista[off_codigos:off_codigos + 2 * n].cast("H")
+        self.anios = vista[off_anios:off_anios + 4 * n].cast("i")
+        self._nombres = vista[off_nombres:]
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def offsets(self) -> memoryview:
+        """Vista u64[n + 1] con los límites de cada nombre dentro de nombres_utf8."""
+        return self._offsets
+
+    @property
+    def nombres_utf8(self) -> memoryview:
+        """Vista sobre el bloque de nombres en utf-8 (sin copiar)."""
+        return self._nombres
+
+    def nombre(self, i: int) -> str:
+        return str(self._nombres[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+    def genero(self, i: int) -> str:
+        return self.generos[self.codigos[i]]
+
+    def anio(self, i: int) -> int:
+        return self.anios[i]
+
+    def pelicula(self, i: int) -> Pelicula:
+        return Pelicula.confiable(self.nombre(i), self.genero(i), self.anios[i])
+
+    def iter_peliculas(self) -> Iterator[Pelicula]:
+        """Recorre todas las películas sin revalidar ni renormalizar los textos."""
+        confiable, generos = Pelicula.confiable, self.generos
+        nombres, offsets, codigos, anios = self._nombres, self._offsets, self.codigos, self.anios
+        for i in range(self._n):
+            yield confiable(str(nombres[offsets[i]:offsets[i + 1]], "utf-8"), generos[codigos[i]], anios[i])
+
+    def cerrar(self) -> None:
+        for vista in ("_offsets", "codigos", "anios", "_nombres"):
+            if hasattr(self, vista):
+                getattr(self, vista).release()
+        self._mm.close()
+        self._f.close()
+
+    def __enter__(self) -> "LectorBinario":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+
+# ===================== conversión .txt ↔ .catb =====================
+
+def txt_a_binario(catalogo) -> int:
+    """Compila el catálogo (.txt) a su .catb hermano, en orden A→Z. Retorna cuántas películas escribió."""
+    firma = firma_archivo(catalogo.ruta_archivo)
+    return escribir_binario(catalogo.iter_ordenado(), catalogo.ruta_binario, firma)
+
+
+def binario_a_txt(catalogo, forzar: bool = False) -> int:
+    """
+    Regenera el .txt del catálogo a partir de su .catb y vuelve a sellar el
+    binario con la firma del .txt nuevo (así sigue siendo válido). Como el
+    binario está ordenado, el .txt queda entero como tramo ordenado.
+    Si el .txt existe y no es el que se compiló (altas o bajas posteriores),
+    ValueError: se perderían esos cambios. forzar=True lo pisa igual.
+    Llamar con catalogo.bloqueo_escritura() tomado (reescribe el .txt).
+    """
+    temporal = catalogo.ruta_archivo + ".tmp"
+    n = 0
+    sufijo = compresion.sufijo(catalogo.ruta_archivo)  # un .txt.gz se regenera comprimido
+    with LectorBinario(catalogo.ruta_binario) as lector:
+        firma_txt = firma_archivo(catalogo.ruta_archivo)
+        if not forzar and firma_txt != (-1, -1) and firma_txt != lector.firma_fuente:
+            raise ValueError(f"{catalogo.ruta_archivo} cambió después de compilar {catalogo.ruta_binario}: "
+                             "se perderían esas altas y bajas (volvé a compilar, o usá --forzar)")
+        with compresion.abrir_escritura(temporal, "w", sufijo) as f:
+            for p in lector.iter_peliculas():
+                f.write(p.to_line() + "\n")
+                n += 1
+    reemplazar_atomico(temporal, catalogo.ruta_archivo)
+    firma = firma_archivo(catalogo.ruta_archivo)
+    orden_catalogo.escribir(catalogo.ruta_archivo, orden_catalogo.TramoOrdenado(firma[0], n))
+    sellar_fuente(catalogo.ruta_binario, firma)
+    return n
+
+
+def main(argv: Optional[list] = None) -> int:
+    from catalogo_peliculas import CatalogoPeliculas
+
+    argv = sys.argv[1:] if argv is None else argv
+    forzar = "--forzar" in argv
+    argv = [a for a in argv if a != "--forzar"]
+    if len(argv) != 2 or argv[0] not in ("a-bin", "a-txt") or (forzar and argv[0] != "a-txt"):
+        print("Uso: python formato_binario.py a-bin|a-txt <catalogo> [--forzar]")
+        return 2
+    catalogo = CatalogoPeliculas(argv[1])
+    if argv[0] == "a-bin":
+        try:
+            n = catalogo.compilar_binario()  # con el lock de escritura, como cualquier otra
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"✅ {n} película(s) → {catalogo.ruta_binario}")
+    else:
+        try:
+            with catalogo.bloqueo_escritura():
+                n = binario_a_txt(catalogo, forzar)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"✅ {n} película(s) → {catalogo.ruta_archivo}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,43 @@
 # gui_flet.py 
-import os
+import threading
+from bisect import bisect_left
 import flet as ft
 from pelicula import Pelicula
-from catalogo_peliculas import CatalogoPeliculas
-from utils import BASE_DIR_CATALOGOS, normalizar_espacios
+from almacenamiento import nombres_catalogos
+from registro_catalogos import obtener_catalogo
+from utils import BASE_DIR_CATALOGOS, a_minusculas, activar_volcado_metricas, normalizar_espacios
+
+TAMANIO_PAGINA = 48    # tarjetas que se arman por tanda (el resto llega al hacer scroll)
+MARGEN_SCROLL = 400    # px antes del final del grid en que se pide la tanda siguiente
+DEMORA_REFRESCO = 0.3  # s sin nuevos eventos antes de refrescar / buscar mientras se escribe
 
 # ===================== helpers de archivos =====================
 
 def listar_catalogos() -> list[str]:
-    if not os.path.exists(BASE_DIR_CATALOGOS):
-        os.makedirs(BASE_DIR_CATALOGOS, exist_ok=True)
-        return []
-    return sorted(
-        [f[:-4] for f in os.listdir(BASE_DIR_CATALOGOS) if f.endswith(".txt")],
-        key=str.lower,
-    )
+    # catálogos de cualquier motor (.txt, .sqlite)
+    return nombres_catalogos(BASE_DIR_CATALOGOS)
 
 def ruta_catalogo(nombre: str) -> str:
-    return os.path.join(BASE_DIR_CATALOGOS, f"{nombre}.txt")
-
-def reescribir_catalogo(catalogo: CatalogoPeliculas, peliculas: list[Pelicula]) -> None:
-    with open(catalogo.ruta_archivo, "w", encoding="utf-8") as f:
-        for p in peliculas:
-            f.write(p.to_line() + "\n")
+    return obtener_catalogo(nombre).ruta_archivo
+
+class Demorador:
+    """
+    Debounce: ejecuta la función recién cuando pasan 'demora' segundos sin
+    otro llamado (cada llamado nuevo reemplaza al pendiente).
+    """
+
+    def __init__(self, demora: float):
+        self.demora = demora
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+
+    def __call__(self, funcion, *args):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.demora, funcion, args)
+            self._timer.daemon = True
+            self._timer.start()
 
 # ===================== UI principal =====================
 
@@ -46,11 +61,12 @@ def chip(texto: str, color_bg: str) -> ft.Container:
         border_radius=16,
     )
 
-def make_toast(page: ft.Page, msg: str, ok: bool = True):
-    bg = "#B9F6CA" if ok else "#FF8A80"
-    page.snack_bar = ft.SnackBar(content=ft.Text(msg), bgcolor=bg, show_close_icon=True)
-    page.snack_bar.open = True
-    page.update()
+def make_toast(toast: ft.SnackBar, msg: str, ok: bool = True):
+    # se reusa un único SnackBar (ya en page.overlay): se actualiza solo ese control, no toda la página
+    toast.content.value = msg
+    toast.bgcolor = "#B9F6CA" if ok else "#FF8A80"
+    toast.open = True
+    toast.update()
 
 def main(page: ft.Page):
     # ---------- page setup ----------
@@ -63,6 +79,21 @@ def main(page: ft.Page):
 
     # ---------- estado ----------
     seleccionadas_keys: set[str] = set()  # para selección múltiple
+    pelis_en_grid: dict[str, Pelicula] = {}  # key → película mostrada (para eliminar sin releer)
+    claves_en_grid: list[str] = []           # keys en el mismo orden que grid.controls
+    # qué muestra el grid: catálogo, búsqueda activa ("" = listado A→Z) y total de películas
+    vista = {"catalogo": "", "consulta": "", "total": 0,
+             "generacion": 0,      # sube con cada carga: las cargas viejas se descartan
+             "pidiendo_mas": False, "tareas": 0}
+    # todo el trabajo con archivos corre fuera del hilo de la UI, de a una tarea por vez
+    # (así las altas/bajas se aplican en orden y el estado del grid no se pisa)
+    lock_trabajo = threading.Lock()
+    lock_tareas = threading.Lock()
+    # un demorador por acción: si compartieran uno, un refresco cancelaría la búsqueda pendiente (y al revés)
+    demorar_refresco = Demorador(DEMORA_REFRESCO)
+    demorar_busqueda = Demorador(DEMORA_REFRESCO)
+    toast = ft.SnackBar(content=ft.Text(""), show_close_icon=True)
+    page.overlay.append(toast)  # se envía con el page.add() del layout raíz
     grid = ft.GridView(
         expand=True,
         runs_count=4,              # cuántas columnas aprox (se adapta)
@@ -71,10 +102,12 @@ def main(page: ft.Page):
         spacing=14,
         run_spacing=14,
         padding=16,
+        on_scroll_interval=100,    # ms entre eventos de scroll (no saturar el handler)
     )
 
     def peli_key(p: Pelicula) -> str:
-        return f"{p.nombre}|{getattr(p, 'anio', 0)}"
+        # misma clave que usa el catálogo: también sirve para ubicar la tarjeta en el orden A→Z
+        return a_minusculas(p.nombre)
 
     # ---------- header "hero" ----------
     hero = ft.Container(
@@ -119,7 +152,11 @@ def main(page: ft.Page):
 
     btn_delete_sel = ft.OutlinedButton("Eliminar seleccionadas", icon="delete_outline")
 
+    # búsqueda (sin importar tildes ni mayúsculas); vacía = mostrar todo
+    tf_buscar = ft.TextField(label="Buscar título", width=308, bgcolor=PALETTE["panel"], prefix_icon="search")
+
     info_label = ft.Text("", size=12, color=PALETTE["muted"])
+    progreso = ft.ProgressBar(width=308, visible=False, color=PALETTE["accent"], bgcolor=PALETTE["accent_soft"])
 
     side_panel = ft.Container(
         width=340,
@@ -138,7 +175,10 @@ def main(page: ft.Page):
                 ft.Row([tf_anio], alignment=ft.MainAxisAlignment.START),
                 btn_add,
                 ft.Divider(),
+                tf_buscar,
+                ft.Divider(),
                 btn_delete_sel,
+                progreso,
                 info_label,
             ],
         ),
@@ -156,7 +196,7 @@ def main(page: ft.Page):
             else:
                 seleccionadas_keys.add(k)
                 btn_sel.icon = "check_box"
-            page.update()
+            btn_sel.update()  # solo el botón, no toda la página
 
         btn_sel = ft.IconButton(icon=("check_box" if checked else "check_box_outline_blank"))
         title = ft.Text(p.nombre, size=16, weight=ft.FontWeight.W_700, color=PALETTE["text"], no_wrap=False)
@@ -179,42 +219,172 @@ def main(page: ft.Page):
         )
 
     # ---------- carga del grid ----------
-    def cargar_grid(nombre_cat: str):
-        seleccionadas_keys.clear()
-        grid.controls = []
-        if not nombre_cat:
-            info_label.value = "Elegí o creá un catálogo para comenzar."
-            page.update()
+    # El grid es "virtual": solo tiene tarjetas para las películas cargadas hasta
+    # ahora (las primeras TAMANIO_PAGINA, A→Z) y pide la tanda siguiente al
+    # acercarse al final del scroll. Altas y bajas tocan solo sus tarjetas.
+
+    def actualizar_info():
+        if vista["consulta"]:
+            info_label.value = f"Búsqueda '{vista['consulta']}' — {vista['total']} resultado(s)"
+        else:
+            ruta = ruta_catalogo(vista["catalogo"])
+            info_label.value = f"Archivo: {ruta} — {vista['total']} película(s)"
+            if len(claves_en_grid) < vista["total"]:
+                info_label.value += f" · mostrando {len(claves_en_grid)}"
+
+    def insertar_tarjeta(i: int, p: Pelicula):
+        k = peli_key(p)
+        pelis_en_grid[k] = p
+        claves_en_grid.insert(i, k)
+        grid.controls.insert(i, tarjeta_pelicula(p))
+
+    def quitar_tarjetas(keys):
+        quitar = set(keys)
+        quedan = [i for i, k in enumerate(claves_en_grid) if k not in quitar]
+        grid.controls = [grid.controls[i] for i in quedan]
+        claves_en_grid[:] = [claves_en_grid[i] for i in quedan]
+        for k in quitar:
+            pelis_en_grid.pop(k, None)
+
+    def todas_cargadas() -> bool:
+        return len(claves_en_grid) >= vista["total"]
+
+    # ---------- trabajo en segundo plano ----------
+
+    def marcar_ocupado(delta: int, texto: str = ""):
+        with lock_tareas:
+            vista["tareas"] += delta
+            progreso.visible = vista["tareas"] > 0
+        if texto:
+            info_label.value = texto
+            info_label.update()
+        progreso.update()
+
+    def en_segundo_plano(trabajo, aplicar=None, texto: str = "Trabajando…"):
+        """
+        Corre trabajo() en un hilo (page.run_thread) con la barra de progreso
+        visible y, con su resultado, aplicar(resultado) para actualizar la UI.
+        Las tareas se ejecutan de a una (lock_trabajo).
+        """
+        def correr():
+            marcar_ocupado(+1, texto)
+            try:
+                with lock_trabajo:
+                    resultado = trabajo()
+                    if aplicar is not None:
+                        aplicar(resultado)
+            except Exception as ex:
+                make_toast(toast, f"❌ Error: {ex}", ok=False)
+            finally:
+                marcar_ocupado(-1)
+
+        page.run_thread(correr)
+
+    def cargar_grid(nombre_cat: str, consulta: str = ""):
+        vista["generacion"] += 1
+        generacion = vista["generacion"]
+        vigente = lambda: generacion == vista["generacion"]
+
+        def trabajo():
+            if not nombre_cat or not vigente():
+                return None  # sin catálogo, o ya hay una carga más nueva
+            cat = obtener_catalogo(nombre_cat)
+            if consulta:
+                pelis = cat.buscar(consulta, limite=200)  # ya viene ordenado por relevancia
+                return pelis, len(pelis)
+            pelis = cat.listar(0, TAMANIO_PAGINA)
+            return pelis, cat.cantidad()
+
+        def aplicar(resultado):
+            if not vigente():
+                return  # el usuario ya pidió otra cosa: esta carga quedó vieja
+            seleccionadas_keys.clear()
+            pelis_en_grid.clear()
+            claves_en_grid.clear()
+            grid.controls = []
+            vista.update(catalogo=nombre_cat or "", consulta=consulta, total=0)
+            if resultado is None:
+                info_label.value = "Elegí o creá un catálogo para comenzar."
+            else:
+                pelis, vista["total"] = resultado
+                for p in pelis:
+                    insertar_tarjeta(len(claves_en_grid), p)
+                actualizar_info()
+            grid.update()
+            info_label.update()
+
+        en_segundo_plano(trabajo, aplicar, f"⏳ Cargando '{nombre_cat}'…" if nombre_cat else "")
+
+    def cargar_mas():
+        """Agrega al final del grid la tanda siguiente del listado A→Z (en segundo plano)."""
+        if vista["consulta"] or not vista["catalogo"] or todas_cargadas() or vista["pidiendo_mas"]:
             return
-        cat = CatalogoPeliculas(nombre_cat)
-        pelis = cat.listar()
-        for p in pelis:
-            grid.controls.append(tarjeta_pelicula(p))
-        info_label.value = f"Archivo: {cat.ruta_archivo} — {len(pelis)} película(s)"
-        page.update()
+        vista["pidiendo_mas"] = True
+        generacion, nombre_cat = vista["generacion"], vista["catalogo"]
+
+        def trabajo():
+            # el offset se calcula acá (con el lock): ya incluye altas y bajas anteriores
+            try:
+                return obtener_catalogo(nombre_cat).listar(len(claves_en_grid), TAMANIO_PAGINA)
+            finally:
+                vista["pidiendo_mas"] = False
+
+        def aplicar(pelis):
+            if generacion != vista["generacion"]:
+                return
+            if not pelis:  # el archivo cambió por fuera: no hay más de las que creíamos
+                vista["total"] = len(claves_en_grid)
+            for p in pelis:
+                insertar_tarjeta(len(claves_en_grid), p)
+            actualizar_info()
+            grid.update()
+            info_label.update()
+
+        en_segundo_plano(trabajo, aplicar, "⏳ Cargando más películas…")
 
     # ===================== eventos =====================
 
-    def on_refresh(e):
+    def on_scroll_grid(e):
+        if e.max_scroll_extent is not None and e.pixels >= e.max_scroll_extent - MARGEN_SCROLL:
+            cargar_mas()
+
+    def refrescar():
         dd_catalogo.options = [ft.dropdown.Option(c) for c in listar_catalogos()]
-        page.update()
+        dd_catalogo.update()
         if dd_catalogo.value:
-            cargar_grid(dd_catalogo.value)
+            cargar_grid(dd_catalogo.value, vista["consulta"])
+
+    def on_refresh(e):
+        demorar_refresco(refrescar)  # varios clics seguidos = un solo refresco
 
     def on_change_catalogo(e):
+        tf_buscar.value = ""
+        tf_buscar.update()
+        # si el usuario cambia rápido de catálogo, las cargas anteriores se descartan solas
         cargar_grid(dd_catalogo.value)
 
+    def on_buscar(e):
+        if not dd_catalogo.value:
+            make_toast(toast, "Elegí un catálogo primero.", ok=False)
+            return
+        cargar_grid(dd_catalogo.value, normalizar_espacios(tf_buscar.value or ""))
+
+    def on_escribir_busqueda(e):
+        # buscar mientras se escribe, pero recién cuando se deja de tipear un momento
+        if dd_catalogo.value:
+            demorar_busqueda(on_buscar, e)
+
     def on_create_catalogo(e):
         nombre = normalizar_espacios(tf_new_cat.value or "")
         if not nombre:
-            make_toast(page, "El nombre del catálogo no puede estar vacío.", ok=False)
+            make_toast(toast, "El nombre del catálogo no puede estar vacío.", ok=False)
             return
-        path = ruta_catalogo(nombre)
-        if os.path.exists(path):
-            make_toast(page, "Ya existe un catálogo con ese nombre.", ok=False)
+        catalogo = obtener_catalogo(nombre)
+        if catalogo.existe():
+            make_toast(toast, "Ya existe un catálogo con ese nombre.", ok=False)
             return
-        open(path, "w", encoding="utf-8").close()
-        make_toast(page, f"Catálogo '{nombre}' creado.")
+        catalogo.crear()
+        make_toast(toast, f"Catálogo '{nombre}' creado.")
         dd_catalogo.options = [ft.dropdown.Option(c) for c in listar_catalogos()]
         dd_catalogo.value = nombre
         tf_new_cat.value = ""
@@ -223,11 +393,11 @@ def main(page: ft.Page):
 
     def on_add_pelicula(e):
         if not dd_catalogo.value:
-            make_toast(page, "Elegí un catálogo primero.", ok=False)
+            make_toast(toast, "Elegí un catálogo primero.", ok=False)
             return
         titulo = normalizar_espacios(tf_titulo.value or "")
         if not titulo:
-            make_toast(page, "El título no puede estar vacío.", ok=False)
+            make_toast(toast, "El título no puede estar vacío.", ok=False)
             return
         anio_str = (tf_anio.value or "").strip()
         anio = 0
@@ -235,35 +405,67 @@ def main(page: ft.Page):
             try:
                 anio = int(anio_str)
             except ValueError:
-                make_toast(page, "Año inválido. Se guardará sin año.", ok=False)
+                make_toast(toast, "Año inválido. Se guardará sin año.", ok=False)
                 anio = 0
 
-        genero = normalizar_espacios(dd_catalogo.value).capitalize()
+        nombre_cat = dd_catalogo.value
+        genero = normalizar_espacios(nombre_cat).capitalize()
         p = Pelicula(titulo, genero, anio)
-        cat = CatalogoPeliculas(dd_catalogo.value)
-        if cat.agregar(p):
-            make_toast(page, f"'{p.nombre}' agregada.")
+
+        def aplicar(agregada: bool):
+            if not agregada:
+                make_toast(toast, "Esa película ya existe en el catálogo.", ok=False)
+                return
+            if vista["catalogo"] == nombre_cat:
+                if vista["consulta"]:
+                    vista["total"] = len(claves_en_grid)  # los resultados de búsqueda no cambian
+                else:
+                    # la tarjeta nueva entra en su lugar A→Z, solo si cae dentro de lo ya cargado
+                    i = bisect_left(claves_en_grid, peli_key(p))
+                    cargada_entera = todas_cargadas()
+                    vista["total"] += 1
+                    if i < len(claves_en_grid) or cargada_entera:
+                        insertar_tarjeta(i, p)
+                actualizar_info()
+                grid.update()
+                info_label.update()
             tf_titulo.value = ""
             tf_anio.value = ""
-            page.update()
-            cargar_grid(dd_catalogo.value)
-        else:
-            make_toast(page, "Esa película ya existe en el catálogo.", ok=False)
+            tf_titulo.update()
+            tf_anio.update()
+            make_toast(toast, f"'{p.nombre}' agregada.")
+
+        en_segundo_plano(lambda: obtener_catalogo(nombre_cat).agregar(p), aplicar, "⏳ Guardando…")
 
     def on_delete_selected(e):
         if not dd_catalogo.value:
-            make_toast(page, "Elegí un catálogo primero.", ok=False)
+            make_toast(toast, "Elegí un catálogo primero.", ok=False)
             return
         if not seleccionadas_keys:
-            make_toast(page, "No hay tarjetas seleccionadas.", ok=False)
+            make_toast(toast, "No hay tarjetas seleccionadas.", ok=False)
             return
 
-        cat = CatalogoPeliculas(dd_catalogo.value)
-        actuales = cat.listar()
-        restantes = [p for p in actuales if peli_key(p) not in seleccionadas_keys]
-        reescribir_catalogo(cat, restantes)
-        make_toast(page, f"Eliminadas {len(seleccionadas_keys)} película(s).")
-        cargar_grid(dd_catalogo.value)
+        nombre_cat = dd_catalogo.value
+        a_borrar = [k for k in seleccionadas_keys if k in pelis_en_grid]
+        pelis = [pelis_en_grid[k] for k in a_borrar]
+
+        def aplicar(eliminadas: int):
+            if vista["catalogo"] == nombre_cat:
+                # solo se van las tarjetas borradas; el resto (y su selección) queda como estaba
+                quitar_tarjetas(a_borrar)
+                seleccionadas_keys.difference_update(a_borrar)
+                vista["total"] = len(claves_en_grid) if vista["consulta"] else max(0, vista["total"] - eliminadas)
+                actualizar_info()
+                grid.update()
+                info_label.update()
+            make_toast(toast, f"Eliminadas {eliminadas} película(s).")
+            if len(claves_en_grid) < TAMANIO_PAGINA:
+                # que no quede el grid casi vacío (sin scroll no llegaría otra tanda);
+                # cargar_mas() solo encola otra tarea, que corre apenas termine esta
+                cargar_mas()
+
+        en_segundo_plano(lambda: obtener_catalogo(nombre_cat).eliminar_muchos(pelis), aplicar,
+                         f"⏳ Eliminando {len(pelis)} película(s)…")
 
     # bind
     btn_refresh.on_click = on_refresh
@@ -271,6 +473,9 @@ def main(page: ft.Page):
     btn_crear_cat.on_click = on_create_catalogo
     btn_add.on_click = on_add_pelicula
     btn_delete_sel.on_click = on_delete_selected
+    tf_buscar.on_submit = on_buscar
+    tf_buscar.on_change = on_escribir_busqueda
+    grid.on_scroll = on_scroll_grid
 
     # ---------- layout raíz ----------
     page.add(
@@ -307,4 +512,5 @@ def main(page: ft.Page):
         page.update()
 
 if __name__ == "__main__":
+    activar_volcado_metricas()
     ft.app(target=main)
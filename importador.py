@@ -0,0 +1,159 @@
+# importador.py
+"""
+Importación masiva de películas a un catálogo.
+
+Formatos soportados (se detectan por extensión o con --formato):
+- .csv   → columnas nombre, genero, anio (con o sin encabezado)
+- .jsonl → un objeto {"nombre": ..., "genero": ..., "anio": ...} por línea
+- .txt   → el mismo formato de los catálogos: nombre | genero | anio
+
+Todo se procesa en streaming: se lee una fila por vez y se entrega a
+agregar_muchos() del catálogo, que escribe en un único append (motor txt)
+o en una única transacción (motor sqlite).
+
+Uso:
+    python importador.py <catalogo> <archivo|-> [--formato csv|jsonl|txt]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Iterable, Iterator, NamedTuple, Optional, TextIO
+
+from almacenamiento import CatalogoBase, abrir_catalogo
+from pelicula import Pelicula
+from utils import normalizar_espacios
+
+FORMATOS = ("csv", "jsonl", "txt")
+
+
+class ResultadoImportacion(NamedTuple):
+    """Conteos de una importación."""
+    agregadas: int
+    omitidas: int   # duplicadas (en el catálogo o dentro del mismo archivo)
+    invalidas: int  # filas que no se pudieron convertir en Pelicula
+
+
+# ===== Lectores (generadores de tuplas nombre, genero, anio) =====
+
+def _filas_csv(f: TextIO) -> Iterator[tuple]:
+    lector = csv.reader(f)
+    primera = next(lector, None)
+    if primera is None:
+        return
+    encabezado = [a.strip().lower() for a in primera]
+    if "nombre" in encabezado:
+        i_nom = encabezado.index("nombre")
+        i_gen = encabezado.index("genero") if "genero" in encabezado else None
+        i_anio = encabezado.index("anio") if "anio" in encabezado else None
+    else:
+        # sin encabezado: la primera fila ya es un dato
+        i_nom, i_gen, i_anio = 0, 1, 2
+        yield _tomar(primera, i_nom, i_gen, i_anio)
+    for fila in lector:
+        if fila:
+            yield _tomar(fila, i_nom, i_gen, i_anio)
+
+
+def _tomar(fila: list, i_nom: int, i_gen: Optional[int], i_anio: Optional[int]) -> tuple:
+    campo = lambda i: fila[i] if i is not None and i < len(fila) else None
+    return campo(i_nom), campo(i_gen), campo(i_anio)
+
+
+def _filas_jsonl(f: TextIO) -> Iterator[tuple]:
+    for linea in f:
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            obj = json.loads(linea)
+        except json.JSONDecodeError:
+            yield None, None, None  # se contará como inválida
+            continue
+        if not isinstance(obj, dict):
+            yield None, None, None
+            continue
+        yield obj.get("nombre"), obj.get("genero"), obj.get("anio")
+
+
+def _filas_txt(f: TextIO) -> Iterator[tuple]:
+    for linea in f:
+        partes = [p.strip() for p in linea.split("|")]
+        if not partes[0]:
+            if len(partes) > 1:
+                yield None, None, None
+            continue
+        yield partes[0], (partes[1] if len(partes) >= 3 else None), (partes[2] if len(partes) >= 3 else None)
+
+
+_LECTORES = {"csv": _filas_csv, "jsonl": _filas_jsonl, "txt": _filas_txt}
+
+
+def detectar_formato(ruta: str) -> str:
+    """Deduce el formato a partir de la extensión (por defecto: txt)."""
+    ext = os.path.splitext(ruta)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "txt"
+
+
+# ===== Importación =====
+
+def importar(catalogo: CatalogoBase, f: TextIO, formato: str,
+             genero_por_defecto: Optional[str] = None) -> ResultadoImportacion:
+    """
+    Importa desde un archivo ya abierto. Si una fila no trae género se usa
+    genero_por_defecto (por defecto, el nombre del catálogo, como en el menú).
+    """
+    if formato not in _LECTORES:
+        raise ValueError(f"Formato desconocido: {formato}")
+    if genero_por_defecto is None:
+        genero_por_defecto = normalizar_espacios(catalogo.nombre).capitalize()
+
+    invalidas = 0
+
+    def peliculas() -> Iterable[Pelicula]:
+        nonlocal invalidas
+        for nombre, genero, anio in _LECTORES[formato](f):
+            try:
+                pelicula = Pelicula(nombre or "", genero or genero_por_defecto, anio or 0)
+                catalogo.validar(pelicula)
+            except (ValueError, TypeError):
+                invalidas += 1
+                continue
+            yield pelicula
+
+    agregadas, omitidas = catalogo.agregar_muchos(peliculas())
+    return ResultadoImportacion(agregadas, omitidas, invalidas)
+
+
+def importar_archivo(catalogo: CatalogoBase, ruta: str, formato: Optional[str] = None,
+                     genero_por_defecto: Optional[str] = None) -> ResultadoImportacion:
+    """Abre la ruta (o stdin si es "-") e importa su contenido al catálogo."""
+    formato = formato or detectar_formato(ruta)
+    if ruta == "-":
+        return importar(catalogo, sys.stdin, formato, genero_por_defecto)
+    with open(ruta, "r", encoding="utf-8", newline="") as f:
+        return importar(catalogo, f, formato, genero_por_defecto)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Importa películas en lote a un catálogo.")
+    parser.add_argument("catalogo", help="nombre del catálogo destino")
+    parser.add_argument("archivo", help="archivo a importar ('-' para stdin)")
+    parser.add_argument("--formato", choices=FORMATOS, help="forzar formato (por defecto, según la extensión)")
+    parser.add_argument("--genero", help="género para las filas que no lo traen")
+    args = parser.parse_args(argv)
+
+    catalogo = abrir_catalogo(args.catalogo)
+    res = importar_archivo(catalogo, args.archivo, args.formato, args.genero)
+    print(f"✅ Agregadas: {res.agregadas} · Omitidas (duplicadas): {res.omitidas} · Inválidas: {res.invalidas}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
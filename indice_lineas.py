@@ -0,0 +1,170 @@
+# indice_lineas.py
+"""
+Índice de posiciones de línea de un catálogo .txt: en qué byte empieza cada
+línea no vacía (las mismas que cuenta CatalogoPeliculas._iter_lineas()).
+
+Sidecar "<catalogo>.txt.lineas":
+    cabecera fija (struct _CABECERA): marca, firma (tamaño, mtime) del .txt
+    al que corresponde y cantidad de líneas
+    a continuación, un u64 por línea con su byte de comienzo
+
+El sidecar y el .txt se leen con mmap: la línea i sale en O(1), sin recorrer
+el archivo, y en memoria quedan solo las páginas que se tocan. Así el tramo
+ordenado del catálogo se puede indexar por posición (una página del listado,
+obtener(i)) y contar sin parsearlo.
+
+Los appends agregan posiciones al final del sidecar (se escanean solo los
+bytes nuevos del .txt) y actualizan la firma. Si el .txt cambió por fuera, el
+sidecar queda viejo y se rearma con una pasada por bytes, sin parsear
+películas. Solo sirve para .txt sin comprimir: en un .gz / .xz no se puede
+saltar a un byte del texto.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, Optional, Tuple
+
+_CABECERA = struct.Struct("<4sIqqQ")  # marca, reservado, tamaño, mtime, líneas (32 bytes: alinea los u64)
+_MARCA = b"LIN1"
+
+
+def posiciones_de(datos: Iterable[bytes], inicio: int = 0) -> array:
+    """Byte de comienzo de cada línea no vacía de 'datos' (líneas en bytes que arrancan en 'inicio')."""
+    posiciones = array("Q")
+    pos = inicio
+    for crudo in datos:
+        if crudo.strip():
+            posiciones.append(pos)
+        pos += len(crudo)
+    return posiciones
+
+
+class IndiceLineas:
+    """Posiciones de línea de un .txt, con sidecar validado por firma (como IndiceNombres)."""
+
+    EXTENSION = ".lineas"
+
+    def __init__(self, ruta_datos: str):
+        self.ruta_datos = ruta_datos
+        self.ruta_sidecar = ruta_datos + self.EXTENSION
+        self._firma: Optional[Tuple[int, int]] = None
+        self._abiertos = []  # archivos con mmap abierto (sidecar y .txt)
+        self._mm_indice: Optional[mmap.mmap] = None
+        self._mm_datos: Optional[mmap.mmap] = None
+        self._posiciones: Optional[memoryview] = None
+        self._n = 0
+
+    # --- carga ---
+
+    def vigente_para(self, firma: Tuple[int, int]) -> bool:
+        """True si el sidecar corresponde al .txt con esa firma (lo abre si hace falta)."""
+        if firma == (-1, -1):
+            return False
+        if self._firma == firma:
+            return True
+        self.cerrar()  # otro proceso pudo haberlo extendido o rearmado: se vuelve a abrir
+        try:
+            with open(self.ruta_sidecar, "rb") as f:
+                marca, _, tam, mtime, n = _CABECERA.unpack(f.read(_CABECERA.size))
+        except (OSError, struct.error):
+            return False
+        if (marca != _MARCA or (tam, mtime) != firma or sys.byteorder != "little"
+                or os.path.getsize(self.ruta_sidecar) != _CABECERA.size + 8 * n):
+            return False
+        try:
+            self._abrir(n)
+        except (OSError, ValueError):
+            self.cerrar()
+            return False
+        self._firma = firma
+        return True
+
+    def _abrir(self, n: int) -> None:
+        self._n = n
+        if not n:
+            return  # .txt sin líneas: no hay nada que mapear (mmap no acepta archivos vacíos)
+        for ruta, destino in ((self.ruta_sidecar, "_mm_indice"), (self.ruta_datos, "_mm_datos")):
+            f = open(ruta, "rb")
+            self._abiertos.append(f)
+            setattr(self, destino, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        # vista sin copia (en el orden de bytes de la máquina, por eso se exige little-endian)
+        self._posiciones = memoryview(self._mm_indice)[_CABECERA.size:].cast("Q")
+
+    def asegurar(self, firma: Tuple[int, int]) -> "IndiceLineas":
+        """Deja el índice listo para el .txt con esa firma: el sidecar si sirve, o una pasada por bytes."""
+        if not self.vigente_para(firma):
+            with open(self.ruta_datos, "rb") as f:
+                posiciones = posiciones_de(f)
+            self.guardar(posiciones, firma)
+        return self
+
+    def guardar(self, posiciones: array, firma: Tuple[int, int]) -> None:
+        """Reemplaza el sidecar por esas posiciones (temporal + os.replace) y lo deja abierto."""
+        self.cerrar()
+        temporal = self.ruta_sidecar + ".tmp"
+        with open(temporal, "wb") as f:
+            f.write(_CABECERA.pack(_MARCA, 0, firma[0], firma[1], len(posiciones)))
+            posiciones.tofile(f)
+        os.replace(temporal, self.ruta_sidecar)
+        self.vigente_para(firma)
+
+    # --- consultas ---
+
+    def __len__(self) -> int:
+        return self._n
+
+    def linea(self, i: int) -> str:
+        """La línea i (sin el salto de línea ni espacios de los bordes)."""
+        fin = self._posiciones[i + 1] if i + 1 < self._n else len(self._mm_datos)
+        return self._mm_datos[self._posiciones[i]:fin].decode("utf-8").strip()
+
+    def lineas(self, desde: int = 0, hasta: Optional[int] = None) -> Iterator[str]:
+        """Las líneas desde..hasta (sin incluir), leídas en orden."""
+        for i in range(desde, self._n if hasta is None else min(hasta, self._n)):
+            yield self.linea(i)
+
+    # --- mantenimiento incremental (llamar DESPUÉS de escribir el .txt) ---
+
+    def registrar(self, firma_previa: Tuple[int, int], firma: Tuple[int, int]) -> None:
+        """
+        Agrega las posiciones de las líneas que el append sumó al final del .txt
+        y ancla el sidecar a la firma nueva, si estaba al día con el archivo
+        anterior. Si no, queda inválido y se rearmará cuando haga falta.
+        """
+        if not self.vigente_para(firma_previa):
+            return
+        n = self._n
+        self.cerrar()
+        try:
+            with open(self.ruta_datos, "rb") as f:
+                f.seek(firma_previa[0])
+                nuevas = posiciones_de(f, firma_previa[0])
+            with open(self.ruta_sidecar, "r+b") as f:
+                # primero las posiciones y después la cabecera: un corte en el medio deja la firma vieja
+                f.seek(_CABECERA.size + 8 * n)
+                nuevas.tofile(f)
+                f.truncate()
+                f.seek(0)
+                f.write(_CABECERA.pack(_MARCA, 0, firma[0], firma[1], n + len(nuevas)))
+        except OSError:
+            pass  # es solo un acelerador: si no se pudo, queda inválido y se rearma
+
+    def cerrar(self) -> None:
+        if self._posiciones is not None:
+            self._posiciones.release()
+        for mm in (self._mm_indice, self._mm_datos):
+            if mm is not None:
+                mm.close()
+        for f in self._abiertos:
+            f.close()
+        self._abiertos = []
+        self._mm_indice = self._mm_datos = self._posiciones = None
+        self._firma, self._n = None, 0
+
+    def eliminar(self) -> None:
+        self.cerrar()
+        if os.path.exists(self.ruta_sidecar):
+            os.remove(self.ruta_sidecar)
@@ -0,0 +1,183 @@
+# indice_nombres.py
+import os
+from typing import Callable, Iterable, Optional, Set, Tuple
+from utils import firma_archivo
+
+
+class IndiceNombres:
+    """
+    Índice persistente de nombres (ya normalizados) de un catálogo.
+
+    - En memoria: un set de claves → chequeo de duplicados en O(1).
+    - En disco: un archivo "<catalogo>.txt.idx" al lado del catálogo.
+        * Cabecera de ancho fijo con tamaño y mtime del .txt indexado.
+        * Luego un diario (append-only) de líneas "+clave" / "-clave".
+      Si la cabecera no coincide con el .txt actual, el índice se reconstruye.
+    """
+
+    EXTENSION = ".idx"
+    _FORMATO_CABECERA = "IDX1 {tam:020d} {mtime:020d}\n"
+    _LARGO_CABECERA = len(_FORMATO_CABECERA.format(tam=0, mtime=0))
+
+    def __init__(self, ruta_datos: str):
+        self.ruta_datos = ruta_datos
+        self.ruta_indice = ruta_datos + self.EXTENSION
+        self._claves: Optional[Set[str]] = None
+        self._firma: Optional[Tuple[int, int]] = None
+
+    # --- FIRMA DEL ARCHIVO DE DATOS ---
+
+    def _firma_datos(self) -> Tuple[int, int]:
+        """(tamaño, mtime en ns) del .txt; (-1, -1) si todavía no existe."""
+        return firma_archivo(self.ruta_datos)
+
+    def _cabecera(self, firma: Tuple[int, int]) -> str:
+        # los valores negativos (archivo inexistente) se guardan como 0
+        tam, mtime = (max(v, 0) for v in firma)
+        return self._FORMATO_CABECERA.format(tam=tam, mtime=mtime)
+
+    # --- CARGA / RECONSTRUCCIÓN ---
+
+    def vigente(self) -> bool:
+        """True si el set en memoria corresponde al .txt actual."""
+        return self._claves is not None and self._firma == self._firma_datos()
+
+    def asegurar(self, generar_claves: Callable[[], Iterable[str]]) -> "IndiceNombres":
+        """
+        Deja el índice listo para consultar:
+        1) si lo que hay en memoria sigue vigente, no hace nada;
+        2) si el sidecar en disco coincide con el .txt, lo carga;
+        3) si no, reconstruye recorriendo el catálogo y reescribe el sidecar.
+        """
+        if self.vigente():
+            return self
+        firma = self._firma_datos()
+        claves = self._leer_sidecar(firma)
+        if claves is None:
+            claves = set(generar_claves())
+            self._escribir_sidecar(claves, firma)
+        self._claves = claves
+        self._firma = firma
+        return self
+
+    def _leer_sidecar(self, firma: Tuple[int, int]) -> Optional[Set[str]]:
+        """Lee el sidecar si existe y su cabecera coincide; si no, None."""
+        if firma == (-1, -1) or not os.path.exists(self.ruta_indice):
+            return None
+        try:
+            with open(self.ruta_indice, "r", encoding="utf-8") as f:
+                if f.readline() != self._cabecera(firma):
+                    return None
+                claves: Set[str] = set()
+                for linea in f:
+                    linea = linea.rstrip("\n")
+                    if linea.startswith("+"):
+                        claves.add(linea[1:])
+                    elif linea.startswith("-"):
+                        claves.discard(linea[1:])
+                return claves
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _escribir_sidecar(self, claves: Iterable[str], firma: Tuple[int, int]) -> None:
+        """
+        Reescribe el sidecar completo (solo al reconstruir), vía temporal +
+        os.replace: un corte a mitad de camino nunca deja una cabecera válida
+        con la lista de claves incompleta.
+        """
+        temporal = self.ruta_indice + ".tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as f:
+                f.write(self._cabecera(firma))
+                for clave in claves:
+                    f.write(f"+{clave}\n")
+            os.replace(temporal, self.ruta_indice)
+        except OSError:
+            # el sidecar es solo un acelerador: si no se puede escribir, seguimos en memoria
+            pass
+
+    # --- CONSULTAS ---
+
+    def __contains__(self, clave: str) -> bool:
+        return self._claves is not None and clave in self._claves
+
+    def __iter__(self):
+        return iter(self._claves or ())
+
+    def __len__(self) -> int:
+        return len(self._claves) if self._claves is not None else 0
+
+    # --- MANTENIMIENTO INCREMENTAL ---
+
+    def registrar_alta(self, clave: str) -> None:
+        """Llamar DESPUÉS de escribir la película en el .txt."""
+        self._registrar("+", (clave,))
+
+    def registrar_altas(self, claves: Iterable[str]) -> None:
+        """Versión en lote de registrar_alta(): una sola escritura al sidecar."""
+        self._registrar("+", claves)
+
+    def registrar_baja(self, clave: str) -> None:
+        """Llamar DESPUÉS de registrar la baja en el .txt."""
+        self._registrar("-", (clave,))
+
+    def registrar_bajas(self, claves: Iterable[str]) -> None:
+        """Versión en lote de registrar_baja()."""
+        self._registrar("-", claves)
+
+    def _registrar(self, signo: str, claves: Iterable[str]) -> None:
+        if self._claves is None:
+            return
+        claves = list(claves)
+        if signo == "+":
+            self._claves.update(claves)
+        else:
+            self._claves.difference_update(claves)
+        firma_previa, self._firma = self._firma, self._firma_datos()
+        try:
+            # si el sidecar no estaba en sintonía con lo que teníamos en memoria,
+            # lo regeneramos entero; si no, basta con anotar las entradas y la cabecera
+            with open(self.ruta_indice, "r+", encoding="utf-8") as f:
+                if f.read(self._LARGO_CABECERA) != self._cabecera(firma_previa):
+                    raise FileNotFoundError
+                f.seek(0, os.SEEK_END)
+                f.write("".join(f"{signo}{clave}\n" for clave in claves))
+                f.seek(0)
+                f.write(self._cabecera(self._firma))
+        except FileNotFoundError:
+            self._escribir_sidecar(self._claves, self._firma)
+        except OSError:
+            pass
+
+    def sincronizar(self) -> None:
+        """
+        Reescribe el sidecar con lo que hay en memoria, anclado al .txt actual.
+        Se usa cuando el .txt se reescribe sin cambiar su contenido lógico
+        (por ejemplo, al compactar las bajas).
+        """
+        if self._claves is None:
+            return
+        self._firma = self._firma_datos()
+        self._escribir_sidecar(self._claves, self._firma)
+
+    def mover(self, ruta_datos: str) -> None:
+        """
+        Pasa a indexar otro archivo con el mismo contenido (el catálogo se
+        comprimió o descomprimió): borra el sidecar viejo. Llamar a
+        sincronizar() después, para anclar lo que hay en memoria al archivo nuevo.
+        """
+        if os.path.exists(self.ruta_indice):
+            os.remove(self.ruta_indice)
+        self.ruta_datos = ruta_datos
+        self.ruta_indice = ruta_datos + self.EXTENSION
+
+    def invalidar(self) -> None:
+        """Olvida lo que hay en memoria (se recargará en el próximo asegurar())."""
+        self._claves = None
+        self._firma = None
+
+    def eliminar(self) -> None:
+        """Borra el sidecar del disco (por ejemplo, al eliminar el catálogo)."""
+        self.invalidar()
+        if os.path.exists(self.ruta_indice):
+            os.remove(self.ruta_indice)
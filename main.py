@@ -4,9 +4,11 @@ Archivo principal de ejecución del proyecto:
 🎬 Catálogo de Películas — Proyecto Final ADA (So + Thel + Yami)
 
 Este script lanza la aplicación principal y define los metadatos del grupo.
+Con argumentos (python main.py list, add, search, ...) corre la línea de
+comandos sin menú de cli.py.
 """
 
-from app import main
+import sys
 
 # Identificación del grupo
 GRUPO = "main"
@@ -17,4 +19,8 @@ INTEGRANTES = [
 ]
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from cli import main as cli_main  # sin importar el menú: arranca más rápido
+        sys.exit(cli_main())
+    from app import main
     main()
@@ -0,0 +1,178 @@
+# metricas.py
+"""
+Registro de métricas en memoria para las operaciones decoradas con @medir_tiempo.
+
+Por cada operación (agregar, listar, ...) guarda:
+- cantidad de llamadas y de errores
+- suma, mínimo y máximo de la duración
+- un histograma de buckets fijos (en ms) → p50 / p90 / p99 aproximados
+
+El estado se vuelca a pedido (volcar()) o cada N segundos
+(iniciar_volcado_periodico()) en dos formatos:
+- JSON  → <base>.json
+- texto de Prometheus → <base>.prom
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+# Límites superiores de cada bucket, en milisegundos (el último es +Inf)
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class HistogramaLatencia:
+    """Histograma de buckets fijos: observar() es O(log buckets) y no guarda muestras."""
+
+    __slots__ = ("conteos", "llamadas", "errores", "suma_ms", "min_ms", "max_ms")
+
+    def __init__(self):
+        self.conteos: List[int] = [0] * (len(BUCKETS_MS) + 1)  # +1 → bucket +Inf
+        self.llamadas = 0
+        self.errores = 0
+        self.suma_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def observar(self, dur_ms: float, error: bool = False) -> None:
+        self.conteos[bisect_left(BUCKETS_MS, dur_ms)] += 1
+        self.llamadas += 1
+        if error:
+            self.errores += 1
+        self.suma_ms += dur_ms
+        if dur_ms < self.min_ms:
+            self.min_ms = dur_ms
+        if dur_ms > self.max_ms:
+            self.max_ms = dur_ms
+
+    def percentil(self, q: float) -> float:
+        """
+        Percentil aproximado (0 < q < 1): interpola linealmente dentro del bucket
+        donde cae, acotado por el mínimo y el máximo observados.
+        """
+        if not self.llamadas:
+            return 0.0
+        objetivo = q * self.llamadas
+        acumulado = 0
+        for i, n in enumerate(self.conteos):
+            if n and acumulado + n >= objetivo:
+                desde = BUCKETS_MS[i - 1] if i > 0 else 0.0
+                hasta = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+                valor = desde + (hasta - desde) * (objetivo - acumulado) / n
+                return min(max(valor, self.min_ms), self.max_ms)
+            acumulado += n
+        return self.max_ms
+
+    def a_dict(self) -> dict:
+        limites = [str(b) for b in BUCKETS_MS] + ["+Inf"]
+        return {
+            "llamadas": self.llamadas,
+            "errores": self.errores,
+            "total_ms": round(self.suma_ms, 3),
+            "min_ms": round(self.min_ms, 3) if self.llamadas else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "prom_ms": round(self.suma_ms / self.llamadas, 3) if self.llamadas else 0.0,
+            "p50_ms": round(self.percentil(0.50), 3),
+            "p90_ms": round(self.percentil(0.90), 3),
+            "p99_ms": round(self.percentil(0.99), 3),
+            "buckets": dict(zip(limites, self.conteos)),
+        }
+
+
+class RegistroMetricas:
+    """Un histograma por operación, protegido por un único lock."""
+
+    def __init__(self):
+        self._ops: Dict[str, HistogramaLatencia] = {}
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+        self._detener = threading.Event()
+
+    # --- CARGA ---
+
+    def observar(self, operacion: str, dur_ms: float, error: bool = False) -> None:
+        with self._lock:
+            hist = self._ops.get(operacion)
+            if hist is None:
+                hist = self._ops[operacion] = HistogramaLatencia()
+            hist.observar(dur_ms, error)
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._ops.clear()
+
+    # --- LECTURA ---
+
+    def snapshot(self) -> dict:
+        """Foto del estado actual como dict (lo que se vuelca a JSON)."""
+        with self._lock:
+            ops = {nombre: h.a_dict() for nombre, h in sorted(self._ops.items())}
+        return {"generado": time.strftime("%Y-%m-%d %H:%M:%S"), "operaciones": ops}
+
+    def a_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def a_prometheus(self) -> str:
+        """Formato de texto de Prometheus (duraciones en segundos, como pide la convención)."""
+        with self._lock:
+            ops = sorted((nombre, list(h.conteos), h.suma_ms, h.llamadas, h.errores)
+                         for nombre, h in self._ops.items())
+        hist = "catalogo_operacion_duracion_segundos"
+        lineas = [
+            f"# HELP {hist} Duración de las operaciones del catálogo.",
+            f"# TYPE {hist} histogram",
+        ]
+        for nombre, conteos, suma_ms, llamadas, _ in ops:
+            acumulado = 0
+            for limite, n in zip(list(BUCKETS_MS) + [None], conteos):
+                acumulado += n
+                le = "+Inf" if limite is None else repr(limite / 1000)
+                lineas.append(f'{hist}_bucket{{operacion="{nombre}",le="{le}"}} {acumulado}')
+            lineas.append(f'{hist}_sum{{operacion="{nombre}"}} {suma_ms / 1000:.6f}')
+            lineas.append(f'{hist}_count{{operacion="{nombre}"}} {llamadas}')
+        err = "catalogo_operacion_errores_total"
+        lineas += [f"# HELP {err} Llamadas que terminaron con excepción.", f"# TYPE {err} counter"]
+        for nombre, _, _, _, errores in ops:
+            lineas.append(f'{err}{{operacion="{nombre}"}} {errores}')
+        return "\n".join(lineas) + "\n"
+
+    # --- VOLCADO ---
+
+    def volcar(self, ruta_base: str) -> None:
+        """Escribe <ruta_base>.json y <ruta_base>.prom (reemplazo atómico)."""
+        if not self._ops:
+            return
+        carpeta = os.path.dirname(ruta_base)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        for ext, contenido in ((".json", self.a_json()), (".prom", self.a_prometheus())):
+            temporal = f"{ruta_base}{ext}.tmp"
+            with open(temporal, "w", encoding="utf-8") as f:
+                f.write(contenido)
+            os.replace(temporal, ruta_base + ext)
+
+    def iniciar_volcado_periodico(self, ruta_base: str, intervalo_s: float) -> None:
+        """Vuelca cada intervalo_s segundos en un hilo daemon (idempotente)."""
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+
+        def _bucle():
+            while not self._detener.wait(intervalo_s):
+                try:
+                    self.volcar(ruta_base)
+                except OSError:
+                    pass
+
+        self._hilo = threading.Thread(target=_bucle, name="volcado-metricas", daemon=True)
+        self._hilo.start()
+
+    def detener_volcado_periodico(self) -> None:
+        self._detener.set()
+
+
+# Instancia compartida por todo el proceso
+registro = RegistroMetricas()
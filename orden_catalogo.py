@@ -0,0 +1,71 @@
+# orden_catalogo.py
+"""
+Marca del "tramo ordenado" de un catálogo.
+
+Después de compactar, el .txt queda ordenado A→Z. Las altas posteriores se
+agregan al final (la "cola", sin orden). El sidecar "<catalogo>.txt.orden"
+recuerda hasta qué byte llega el tramo ordenado y cuántas líneas tiene, así
+listar en orden solo necesita ordenar la cola y mezclarla con el tramo.
+
+Como las altas no tocan el comienzo del archivo, la marca sigue valiendo
+mientras el tramo no cambie. Para detectar reescrituras externas se guarda
+un crc32 de los últimos bytes del tramo y se compara al leer la marca.
+"""
+
+import os
+import zlib
+from typing import NamedTuple, Optional
+
+EXTENSION = ".orden"
+_BYTES_TESTIGO = 256  # cuántos bytes del final del tramo entran en el crc
+
+
+class TramoOrdenado(NamedTuple):
+    fin: int      # byte donde termina el tramo ordenado (= donde empieza la cola)
+    lineas: int   # líneas no vacías dentro del tramo
+
+
+def _testigo(ruta_datos: str, fin: int) -> Optional[int]:
+    """crc32 de los últimos bytes del tramo; None si el archivo es más corto que 'fin'."""
+    try:
+        with open(ruta_datos, "rb") as f:
+            desde = max(0, fin - _BYTES_TESTIGO)
+            f.seek(desde)
+            datos = f.read(fin - desde)
+    except OSError:
+        return None
+    if len(datos) != fin - desde:
+        return None
+    return zlib.crc32(datos)
+
+
+def leer(ruta_datos: str) -> Optional[TramoOrdenado]:
+    """Devuelve el tramo ordenado si la marca existe y sigue correspondiendo al .txt."""
+    try:
+        with open(ruta_datos + EXTENSION, "r", encoding="utf-8") as f:
+            etiqueta, fin, lineas, crc = f.read().split()
+        fin, lineas, crc = int(fin), int(lineas), int(crc)
+    except (OSError, ValueError):
+        return None
+    if etiqueta != "ORD1" or _testigo(ruta_datos, fin) != crc:
+        return None
+    return TramoOrdenado(fin, lineas)
+
+
+def escribir(ruta_datos: str, tramo: TramoOrdenado) -> None:
+    """Guarda la marca para el .txt tal como está ahora."""
+    crc = _testigo(ruta_datos, tramo.fin)
+    if crc is None:
+        return
+    temporal = ruta_datos + EXTENSION + ".tmp"
+    try:
+        with open(temporal, "w", encoding="utf-8") as f:
+            f.write(f"ORD1 {tramo.fin} {tramo.lineas} {crc}\n")
+        os.replace(temporal, ruta_datos + EXTENSION)
+    except OSError:
+        pass
+
+
+def eliminar(ruta_datos: str) -> None:
+    if os.path.exists(ruta_datos + EXTENSION):
+        os.remove(ruta_datos + EXTENSION)
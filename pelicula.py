@@ -1,14 +1,16 @@
 # pelicula.py
+import sys
 from dataclasses import dataclass
 from utils import normalizar_espacios
 
 # ======== CLASE BASE ========
 
-@dataclass
+@dataclass(slots=True)
 class Film:
     """
     Clase base para representar una filmación o película genérica.
     Atributo privado: __nombre
+    slots=True: las instancias no tienen __dict__ (menos memoria por película).
     """
 
     __nombre: str  # atributo privado
@@ -25,6 +27,10 @@ class Film:
         """Propiedad solo lectura para acceder al nombre."""
         return self.__nombre
 
+    def _fijar_nombre(self, nombre: str) -> None:
+        """Asigna el nombre SIN validar (solo para datos que ya salieron de nuestros archivos)."""
+        self.__nombre = nombre
+
     # ---- Conversión para guardar / leer ----
     def to_line(self) -> str:
         """Convierte la filmación en una línea de texto para guardar en archivo."""
@@ -42,12 +48,17 @@ class Film:
 
 # ======== SUBCLASE PELICULA ========
 
-@dataclass
+# género tal como viene en el archivo → género normalizado e internado
+# (hay pocos géneros distintos: se normaliza cada uno una sola vez)
+_GENEROS_NORMALIZADOS: dict = {}
+
+@dataclass(slots=True)
 class Pelicula(Film):
     """
     Subclase concreta de Film que representa una Película.
     Hereda el atributo privado __nombre y agrega:
-    - género
+    - género (internado con sys.intern: todas las películas de un mismo
+      género comparten el mismo string)
     - año de estreno
     """
 
@@ -55,8 +66,9 @@ class Pelicula(Film):
     anio: int = 0
 
     def __init__(self, nombre: str, genero: str = "Desconocido", anio: int = 0):
-        super().__init__(nombre)
-        self.genero = normalizar_espacios(genero or "Desconocido").capitalize()
+        # ojo: con slots=True dataclass recrea la clase y super() sin argumentos falla
+        Film.__init__(self, nombre)
+        self.genero = sys.intern(normalizar_espacios(genero or "Desconocido").capitalize())
         try:
             self.anio = int(anio)
         except ValueError:
@@ -85,6 +97,38 @@ class Pelicula(Film):
         else:
             return Pelicula(partes[0])
 
+    @staticmethod
+    def from_line_confiable(linea: str) -> "Pelicula":
+        """
+        Camino rápido de from_line() para líneas escritas por to_line() en
+        NUESTROS archivos: "nombre | Genero | anio" ya normalizado.
+        No vuelve a normalizar ni capitalizar; ante cualquier línea con otra
+        forma (catálogos viejos, años raros, '|' de más) usa from_line().
+        """
+        partes = linea.split(" | ")
+        if len(partes) == 3 and partes[2].isdigit() and linea.count("|") == 2:
+            nombre, genero, anio = partes
+            genero_ok = _GENEROS_NORMALIZADOS.get(genero)
+            if genero_ok is None:
+                genero_ok = _GENEROS_NORMALIZADOS[genero] = sys.intern(
+                    normalizar_espacios(genero or "Desconocido").capitalize())
+            if "  " not in nombre and not nombre.endswith(" "):
+                return Pelicula.confiable(nombre, genero_ok, int(anio))
+        return Pelicula.from_line(linea)
+
+    @classmethod
+    def confiable(cls, nombre: str, genero: str, anio: int) -> "Pelicula":
+        """
+        Crea una Pelicula sin normalizar ni validar nada.
+        Solo para datos que ya pasaron por el constructor al guardarse
+        (por ejemplo, al leer un catálogo binario): evita repetir el trabajo.
+        """
+        p = cls.__new__(cls)
+        p._fijar_nombre(nombre)
+        p.genero = genero
+        p.anio = anio
+        return p
+
     def __str__(self) -> str:
         """Muestra nombre, género y año al listar."""
         if self.anio > 0:
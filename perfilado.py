@@ -0,0 +1,142 @@
+# perfilado.py
+"""
+Perfilado por muestreo de las operaciones decoradas con @medir_tiempo.
+
+Apagado por defecto. Se enciende con variables de entorno (las lee utils al
+importarse) o llamando a perfilador.configurar():
+
+    CATALOGO_PERFIL=agregar,listar     operaciones a muestrear ("*" = todas)
+    CATALOGO_PERFIL_FRACCION=0.01      fracción de llamadas que se perfilan (0..1)
+
+Cada llamada muestreada corre bajo cProfile y tracemalloc, y deja en
+catalogos/perfiles/<operacion>/:
+    <id>.pstats       → python -m pstats <archivo>  (o snakeviz, etc.)
+    <id>.tracemalloc  → tracemalloc.Snapshot.load(<archivo>)
+    <id>.txt          → resumen legible: funciones más caras y líneas que más asignaron,
+                        con cuántas llamadas llevaba la operación y cuántas se muestrearon
+
+Apagado, el costo por llamada es leer un atributo (perfilador.operaciones is
+None), así que puede quedar siempre compilado. Se perfila una llamada por vez
+en todo el proceso (tracemalloc es global): si otra muestra está en curso, la
+llamada corre normal.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, Optional
+
+# cProfile, pstats, tracemalloc y random se importan recién al encender el
+# perfilado: apagado, importar este módulo (y utils) no los carga.
+
+FRACCION_POR_DEFECTO = 0.01
+FRAMES_TRACEMALLOC = 10   # profundidad de la pila que se guarda por asignación
+TOP_RESUMEN = 25          # renglones de cada tabla del resumen .txt
+
+
+class Perfilador:
+    """Decide qué llamadas se muestrean y guarda el perfil de cada muestra."""
+
+    def __init__(self):
+        self.operaciones: Optional[FrozenSet[str]] = None  # None = apagado
+        self.fraccion = FRACCION_POR_DEFECTO
+        self.carpeta = os.path.join("catalogos", "perfiles")
+        self._azar = None  # random.Random, se crea en configurar()
+        self._ocupado = threading.Lock()  # una muestra a la vez
+        self._lock = threading.Lock()     # protege los contadores
+        self._llamadas: Dict[str, int] = {}
+        self._muestras: Dict[str, int] = {}
+
+    def configurar(self, operaciones: Iterable[str], fraccion: float = FRACCION_POR_DEFECTO,
+                   carpeta: Optional[str] = None) -> None:
+        """Enciende el muestreo para esas operaciones ("*" = todas)."""
+        import random
+        self._azar = random.Random()
+        self.fraccion = min(1.0, max(0.0, fraccion))
+        if carpeta:
+            self.carpeta = carpeta
+        operaciones = frozenset(o.strip() for o in operaciones if o.strip())
+        self.operaciones = operaciones or None
+
+    def apagar(self) -> None:
+        self.operaciones = None
+
+    def contadores(self) -> Dict[str, Dict[str, int]]:
+        """{operacion: {"llamadas": n, "muestras": m}} desde que se encendió."""
+        with self._lock:
+            return {op: {"llamadas": n, "muestras": self._muestras.get(op, 0)}
+                    for op, n in self._llamadas.items()}
+
+    # ===================== muestreo =====================
+
+    def elegir(self, operacion: str) -> bool:
+        """Cuenta la llamada y decide si se perfila (solo se llama si el perfilador está encendido)."""
+        operaciones = self.operaciones
+        if operaciones is None or ("*" not in operaciones and operacion not in operaciones):
+            return False
+        with self._lock:
+            self._llamadas[operacion] = self._llamadas.get(operacion, 0) + 1
+        return self._azar.random() < self.fraccion
+
+    def perfilar(self, operacion: str, func, args: tuple, kwargs: dict):
+        """Ejecuta func(*args, **kwargs) perfilada (o normal, si ya hay otra muestra en curso)."""
+        if not self._ocupado.acquire(blocking=False):
+            return func(*args, **kwargs)
+        import cProfile
+        import tracemalloc
+        perfil = cProfile.Profile()
+        memoria = not tracemalloc.is_tracing()  # si alguien más ya lo usa, no lo tocamos
+        try:
+            if memoria:
+                tracemalloc.start(FRAMES_TRACEMALLOC)
+            perfil.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                perfil.disable()
+                snapshot, pico = None, 0
+                if memoria:
+                    snapshot, pico = tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                self._guardar(operacion, perfil, snapshot, pico)
+        finally:
+            self._ocupado.release()
+
+    # ===================== volcado =====================
+
+    def _guardar(self, operacion: str, perfil, snapshot, pico: int) -> None:
+        with self._lock:
+            muestra = self._muestras[operacion] = self._muestras.get(operacion, 0) + 1
+            llamadas = self._llamadas.get(operacion, 0)
+        carpeta = os.path.join(self.carpeta, operacion)
+        base = os.path.join(carpeta, f"{time.strftime('%Y%m%d-%H%M%S')}_{os.getpid()}_{muestra}")
+        try:
+            os.makedirs(carpeta, exist_ok=True)
+            perfil.dump_stats(base + ".pstats")
+            if snapshot is not None:
+                snapshot.dump(base + ".tracemalloc")
+            with open(base + ".txt", "w", encoding="utf-8") as f:
+                f.write(self._resumen(operacion, llamadas, muestra, perfil, snapshot, pico))
+        except OSError:
+            pass  # el perfilado nunca hace fallar la operación
+
+    def _resumen(self, operacion: str, llamadas: int, muestra: int, perfil, snapshot, pico: int) -> str:
+        import io
+        import pstats
+        import tracemalloc
+        texto = io.StringIO()
+        texto.write(f"operación: {operacion}\n")
+        texto.write(f"llamadas vistas: {llamadas} · muestra nº {muestra} · fracción {self.fraccion:g}\n\n")
+        pstats.Stats(perfil, stream=texto).sort_stats("cumulative").print_stats(TOP_RESUMEN)
+        if snapshot is not None:
+            filtrado = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+            estadisticas = filtrado.statistics("lineno")
+            total = sum(s.size for s in estadisticas)
+            texto.write(f"\npico de memoria: {pico / 1024:.1f} KiB · "
+                        f"asignada y todavía viva al terminar: {total / 1024:.1f} KiB\n")
+            for s in estadisticas[:TOP_RESUMEN]:
+                texto.write(f"  {s.size / 1024:10.1f} KiB  {s.count:8d} bloques  {s.traceback[0]}\n")
+        return texto.getvalue()
+
+
+perfilador = Perfilador()
@@ -0,0 +1,121 @@
+# registro_catalogos.py
+"""
+Registro de catálogos compartido por todo el proceso.
+
+obtener_catalogo("Infantiles") devuelve SIEMPRE la misma instancia del
+catálogo para ese nombre (con el motor que corresponda, ver almacenamiento), así sus caches (películas ordenadas,
+índice de búsqueda, nombres, bajas) sobreviven entre llamadas: volver a un
+catálogo ya abierto casi no toca el disco. Cada cache se valida contra la
+firma del archivo (tamaño, mtime, inodo), así que un cambio hecho por otro
+proceso se detecta igual.
+
+Para que la memoria no crezca sin límite, el registro lleva un orden LRU y,
+cuando la suma de los caches supera el presupuesto, libera los de los
+catálogos usados hace más tiempo. El presupuesto se configura con la
+variable de entorno CATALOGO_MEMORIA_MB (por defecto 256).
+
+La suma se lleva al día sin recorrer todos los catálogos: un catálogo solo
+cambia de tamaño mientras se lo usa, así que en cada obtener() se vuelven a
+medir el catálogo pedido y el que se había pedido antes. Recién si el total
+pasa el presupuesto se miden los que tienen caches y se libera.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from almacenamiento import CatalogoBase, abrir_catalogo
+from utils import BASE_DIR_CATALOGOS
+
+try:
+    PRESUPUESTO_MEMORIA = int(float(os.environ.get("CATALOGO_MEMORIA_MB", "256")) * 1024 * 1024)
+except ValueError:
+    PRESUPUESTO_MEMORIA = 256 * 1024 * 1024
+
+
+class RegistroCatalogos:
+    """Una instancia de catálogo por (carpeta, nombre), con caches bajo presupuesto LRU."""
+
+    def __init__(self, presupuesto_bytes: int = PRESUPUESTO_MEMORIA):
+        self.presupuesto_bytes = presupuesto_bytes
+        self._catalogos: "OrderedDict[Tuple[str, str], CatalogoBase]" = OrderedDict()
+        self._lock = threading.Lock()
+        # última medida de cada catálogo con caches (los que miden 0 no figuran) y su suma
+        self._memoria: Dict[Tuple[str, str], int] = {}
+        self._total = 0
+        self._ultimo: Optional[Tuple[str, str]] = None  # el último entregado (pudo crecer desde entonces)
+
+    def obtener(self, nombre: str, base_dir: str = BASE_DIR_CATALOGOS) -> CatalogoBase:
+        """Instancia compartida del catálogo (la crea la primera vez)."""
+        nombre = (nombre or "catalogo").strip()
+        clave = (os.path.abspath(base_dir), nombre)
+        with self._lock:
+            catalogo = self._catalogos.get(clave)
+            if catalogo is None:
+                catalogo = self._catalogos[clave] = abrir_catalogo(nombre, base_dir)
+            self._catalogos.move_to_end(clave)  # el más recién usado va al final
+            if self._ultimo is not None and self._ultimo != clave:
+                self._medir(self._ultimo)
+            self._medir(clave)
+            self._ultimo = clave
+            if self._total > self.presupuesto_bytes:
+                self._ajustar(clave)
+            return catalogo
+
+    def _medir(self, clave: Tuple[str, str]) -> None:
+        """Actualiza la medida de un catálogo (y el total). Con self._lock tomado."""
+        catalogo = self._catalogos.get(clave)
+        ocupado = catalogo.memoria_estimada() if catalogo is not None else 0
+        self._total += ocupado - self._memoria.pop(clave, 0)
+        if ocupado:
+            self._memoria[clave] = ocupado
+
+    def _ajustar(self, en_uso: Tuple[str, str]) -> None:
+        """Libera caches, del menos al más recién usado, hasta entrar en el presupuesto."""
+        for clave in list(self._memoria):  # solo los que tienen caches: pudieron cambiar
+            self._medir(clave)
+        for clave, catalogo in list(self._catalogos.items()):
+            if self._total <= self.presupuesto_bytes:
+                return
+            if clave == en_uso or clave not in self._memoria:
+                continue
+            if catalogo.liberar_memoria():
+                self._medir(clave)
+
+    def memoria_estimada(self) -> int:
+        """Bytes aproximados que ocupan, en total, los caches de los catálogos registrados."""
+        with self._lock:
+            return sum(c.memoria_estimada() for c in self._catalogos.values())
+
+    def abiertos(self) -> List[str]:
+        """Nombres de los catálogos registrados, del menos al más recién usado."""
+        with self._lock:
+            return [nombre for _, nombre in self._catalogos]
+
+    def descartar(self, nombre: str, base_dir: str = BASE_DIR_CATALOGOS) -> None:
+        """Saca el catálogo del registro (por ejemplo, después de eliminarlo o migrarlo de motor)."""
+        clave = (os.path.abspath(base_dir), (nombre or "catalogo").strip())
+        with self._lock:
+            catalogo = self._catalogos.pop(clave, None)
+            self._medir(clave)  # ya no está: sale del total
+        if catalogo is not None:
+            catalogo.liberar_memoria()
+
+    def vaciar(self) -> None:
+        with self._lock:
+            catalogos = list(self._catalogos.values())
+            self._catalogos.clear()
+            self._memoria.clear()
+            self._total, self._ultimo = 0, None
+        for catalogo in catalogos:
+            catalogo.liberar_memoria()
+
+
+# Registro global del proceso
+registro = RegistroCatalogos()
+
+
+def obtener_catalogo(nombre: str, base_dir: str = BASE_DIR_CATALOGOS) -> CatalogoBase:
+    """Atajo para registro.obtener(): la instancia compartida de ese catálogo."""
+    return registro.obtener(nombre, base_dir)
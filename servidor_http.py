@@ -0,0 +1,288 @@
+# servidor_http.py
+"""
+API HTTP de solo lectura sobre los catálogos (solo biblioteca estándar).
+
+    python servidor_http.py [--host 127.0.0.1] [--puerto 8000]
+
+Rutas (todas devuelven JSON):
+    GET /catalogos                                   → catálogos y cantidad de películas
+    GET /catalogos/<nombre>/peliculas?offset=0&limite=50
+                                                     → una página del listado A→Z
+    GET /catalogos/<nombre>/estadisticas             → total, por año / década / género
+    GET /buscar?q=<texto>[&catalogo=<nombre>][&limite=20][&exacta=1]
+                                                     → búsqueda por título (uno o todos los catálogos)
+
+Rendimiento:
+- Un hilo por conexión (ThreadingHTTPServer) y HTTP/1.1 con keep-alive: un
+  cliente reutiliza la conexión para muchas consultas.
+- Los catálogos salen del registro compartido (registro_catalogos): sus
+  caches (películas ordenadas, índices de búsqueda y de nombres) se arman
+  una vez y se reutilizan en todas las consultas, sin releer los .txt.
+- Cada respuesta lleva un ETag armado con la firma de los archivos de datos
+  (tamaño, mtime, inodo). Si el cliente manda If-None-Match y nada cambió,
+  se responde 304 sin cuerpo. Además las respuestas ya armadas se guardan
+  en un cache LRU en memoria, indexado por URL y validado por ETag: pedir
+  otra vez la misma página cuesta un stat() por catálogo.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from almacenamiento import CatalogoBase, nombres_catalogos
+from escritor_logs import escritor
+from registro_catalogos import obtener_catalogo
+from utils import BASE_DIR_CATALOGOS
+
+HOST_POR_DEFECTO = "127.0.0.1"
+PUERTO_POR_DEFECTO = 8000
+LIMITE_POR_DEFECTO = 50
+LIMITE_MAXIMO = 1000
+MAX_RESPUESTAS_EN_CACHE = 512
+SEGUNDOS_INACTIVIDAD = 30  # una conexión keep-alive ociosa se cierra después de esto
+
+
+class ErrorHttp(Exception):
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class CacheRespuestas:
+    """URL → (ETag, cuerpo ya serializado), con tope LRU de entradas."""
+
+    def __init__(self, maximo: int = MAX_RESPUESTAS_EN_CACHE):
+        self.maximo = maximo
+        self._entradas: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: str, etag: str) -> Optional[bytes]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada[0] != etag:
+                return None
+            self._entradas.move_to_end(clave)
+            return entrada[1]
+
+    def guardar(self, clave: str, etag: str, cuerpo: bytes) -> None:
+        with self._lock:
+            self._entradas[clave] = (etag, cuerpo)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+
+
+# ===================== API (sin nada de HTTP) =====================
+
+def _pelicula_json(pelicula) -> Dict[str, object]:
+    return {"nombre": pelicula.nombre, "genero": pelicula.genero, "anio": pelicula.anio}
+
+
+def _entero(parametros: Dict[str, List[str]], nombre: str, por_defecto: int,
+            minimo: int = 0, maximo: Optional[int] = None) -> int:
+    valor = parametros.get(nombre, [None])[0]
+    if valor is None:
+        return por_defecto
+    try:
+        valor = int(valor)
+    except ValueError:
+        raise ErrorHttp(400, f"'{nombre}' tiene que ser un número entero")
+    valor = max(minimo, valor)
+    return valor if maximo is None else min(valor, maximo)
+
+
+class ApiCatalogos:
+    """
+    Resuelve cada ruta en (ETag, función que arma la respuesta). El ETag sale
+    solo de stat(), así que un 304 o un acierto del cache no tocan los datos.
+    """
+
+    def __init__(self, base_dir: str = BASE_DIR_CATALOGOS):
+        self.base_dir = base_dir
+
+    def _catalogo(self, nombre: str) -> CatalogoBase:
+        # solo nombres que existen en la carpeta: nada de rutas armadas a mano ("../")
+        if nombre not in nombres_catalogos(self.base_dir):
+            raise ErrorHttp(404, f"No existe el catálogo '{nombre}'")
+        return obtener_catalogo(nombre, self.base_dir)
+
+    @staticmethod
+    def _etag(*firmas) -> str:
+        return '"' + hashlib.blake2b(repr(firmas).encode(), digest_size=12).hexdigest() + '"'
+
+    def _etag_todos(self) -> Tuple[str, List[CatalogoBase]]:
+        catalogos = [obtener_catalogo(n, self.base_dir) for n in nombres_catalogos(self.base_dir)]
+        return self._etag(*((c.nombre, c.firma()) for c in catalogos)), catalogos
+
+    def resolver(self, ruta: str, parametros: Dict[str, List[str]]) -> Tuple[str, Callable[[], object]]:
+        partes = [unquote(p) for p in ruta.strip("/").split("/") if p]
+
+        if partes == ["catalogos"]:
+            etag, catalogos = self._etag_todos()
+            return etag, lambda: {"catalogos": [{"nombre": c.nombre, "peliculas": c.cantidad()}
+                                                for c in catalogos]}
+
+        if len(partes) == 3 and partes[0] == "catalogos" and partes[2] == "peliculas":
+            catalogo = self._catalogo(partes[1])
+            offset = _entero(parametros, "offset", 0)
+            limite = _entero(parametros, "limite", LIMITE_POR_DEFECTO, minimo=1, maximo=LIMITE_MAXIMO)
+
+            def pagina():
+                return {
+                    "catalogo": catalogo.nombre,
+                    "total": catalogo.cantidad(),
+                    "offset": offset,
+                    "limite": limite,
+                    "peliculas": [_pelicula_json(p) for p in catalogo.listar(offset, limite)],
+                }
+            return self._etag(catalogo.nombre, catalogo.firma()), pagina
+
+        if len(partes) == 3 and partes[0] == "catalogos" and partes[2] == "estadisticas":
+            catalogo = self._catalogo(partes[1])
+            return self._etag(catalogo.nombre, catalogo.firma()), lambda: {
+                "catalogo": catalogo.nombre, **catalogo.estadisticas().a_dict()}
+
+        if partes == ["buscar"]:
+            consulta = parametros.get("q", [""])[0].strip()
+            if not consulta:
+                raise ErrorHttp(400, "Falta el parámetro 'q'")
+            limite = _entero(parametros, "limite", 20, minimo=1, maximo=LIMITE_MAXIMO)
+            aproximada = parametros.get("exacta", ["0"])[0] in ("0", "", "false")
+            nombre = parametros.get("catalogo", [None])[0]
+            if nombre is not None:
+                catalogo = self._catalogo(nombre)
+                return self._etag(catalogo.nombre, catalogo.firma()), lambda: {"resultados": [
+                    {"catalogo": catalogo.nombre, "puntaje": round(puntaje, 2), **_pelicula_json(p)}
+                    for p, puntaje in catalogo.buscar_con_puntaje(consulta, limite, aproximada)
+                ]}
+            from biblioteca import BibliotecaCatalogos
+            etag, _ = self._etag_todos()
+            return etag, lambda: {"resultados": [
+                {"catalogo": c.catalogo, "puntaje": round(c.puntaje, 2), **_pelicula_json(c.pelicula)}
+                for c in BibliotecaCatalogos(self.base_dir).buscar(consulta, limite, aproximada)
+            ]}
+
+        raise ErrorHttp(404, f"No existe la ruta /{'/'.join(partes)}")
+
+
+# ===================== HTTP =====================
+
+def _fmt_acceso(ts: float, cliente: str, linea: str, estado: int, ms: float) -> str:
+    fecha = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+    return f"[{fecha}] {cliente} \"{linea}\" {estado} {ms:.1f}ms\n"
+
+
+class ManejadorApi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (cada respuesta lleva Content-Length)
+    disable_nagle_algorithm = True  # encabezados y cuerpo salen en dos write(): sin esto, +40 ms por respuesta
+    timeout = SEGUNDOS_INACTIVIDAD
+    server_version = "CatalogoPeliculas/1"
+
+    # los configura crear_servidor()
+    api: ApiCatalogos
+    cache: CacheRespuestas
+    ruta_log: str
+
+    def do_GET(self):
+        self._atender(con_cuerpo=True)
+
+    def do_HEAD(self):
+        self._atender(con_cuerpo=False)
+
+    def _no_permitido(self):
+        self._responder(405, json.dumps({"error": "API de solo lectura"}).encode(), extra={"Allow": "GET, HEAD"})
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = _no_permitido
+
+    def _atender(self, con_cuerpo: bool) -> None:
+        inicio = time.perf_counter()
+        url = urlsplit(self.path)
+        clave = url.path + ("?" + url.query if url.query else "")
+        try:
+            etag, armar = self.api.resolver(url.path, parse_qs(url.query))
+            if etag in self._etags_cliente():
+                self._responder(304, b"", etag=etag, con_cuerpo=False)
+                return
+            cuerpo = self.cache.obtener(clave, etag)
+            if cuerpo is None:
+                cuerpo = json.dumps(armar(), ensure_ascii=False).encode("utf-8")
+                # si los datos cambiaron mientras se armaba, la respuesta no se cachea
+                # ni se etiqueta: no se sabe a cuál de las dos versiones corresponde
+                etag_final, _ = self.api.resolver(url.path, parse_qs(url.query))
+                if etag_final == etag:
+                    self.cache.guardar(clave, etag, cuerpo)
+                else:
+                    etag = None
+            self._responder(200, cuerpo, etag=etag, con_cuerpo=con_cuerpo)
+        except ErrorHttp as e:
+            self._responder(e.estado, json.dumps({"error": str(e)}, ensure_ascii=False).encode("utf-8"),
+                            con_cuerpo=con_cuerpo)
+        finally:
+            escritor.encolar(self.ruta_log, _fmt_acceso, time.time(), self.client_address[0],
+                             self.requestline, getattr(self, "_estado", 0),
+                             (time.perf_counter() - inicio) * 1000)
+
+    def _etags_cliente(self) -> List[str]:
+        encabezado = self.headers.get("If-None-Match", "")
+        return [e.strip().removeprefix("W/") for e in encabezado.split(",") if e.strip()]
+
+    def _responder(self, estado: int, cuerpo: bytes, etag: Optional[str] = None,
+                   con_cuerpo: bool = True, extra: Optional[Dict[str, str]] = None) -> None:
+        self._estado = estado
+        self.send_response(estado)
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")  # el cliente puede guardarla, pero revalida
+        if estado != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(cuerpo)))
+        for nombre, valor in (extra or {}).items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        if con_cuerpo and estado != 304:
+            self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        pass  # el acceso se registra en _atender(), por el escritor en segundo plano
+
+
+def crear_servidor(host: str = HOST_POR_DEFECTO, puerto: int = PUERTO_POR_DEFECTO,
+                   base_dir: str = BASE_DIR_CATALOGOS) -> ThreadingHTTPServer:
+    """Servidor listo para serve_forever() (puerto 0 = uno libre cualquiera)."""
+    manejador = type("Manejador", (ManejadorApi,), {
+        "api": ApiCatalogos(base_dir),
+        "cache": CacheRespuestas(),
+        "ruta_log": os.path.join(base_dir, "http.log"),
+    })
+    servidor = ThreadingHTTPServer((host, puerto), manejador)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="API HTTP de solo lectura de los catálogos.")
+    parser.add_argument("--host", default=HOST_POR_DEFECTO)
+    parser.add_argument("--puerto", type=int, default=PUERTO_POR_DEFECTO)
+    args = parser.parse_args(argv)
+
+    servidor = crear_servidor(args.host, args.puerto)
+    print(f"🌐 API en http://{args.host}:{servidor.server_address[1]}/catalogos (Ctrl+C para salir)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Servidor detenido.")
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
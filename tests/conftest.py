@@ -0,0 +1,19 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# los módulos del proyecto están en la raíz (sin paquete)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from registro_catalogos import registro  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def carpeta_temporal(tmp_path, monkeypatch):
+    """Cada prueba corre en su propia carpeta: catalogos/ y los logs se crean ahí."""
+    monkeypatch.chdir(tmp_path)
+    registro.vaciar()  # las instancias compartidas apuntan a rutas relativas
+    yield tmp_path
+    registro.vaciar()
@@ -0,0 +1,53 @@
+# tests/test_catalogo_sqlite.py
+import os
+import threading
+
+import pytest
+
+import catalogo_sqlite
+from catalogo_peliculas import CatalogoPeliculas
+from catalogo_sqlite import CatalogoSQLite, migrar_desde_txt
+from pelicula import Pelicula
+
+
+def test_lote_deshecho_no_deja_fantasmas_en_la_busqueda(monkeypatch):
+    monkeypatch.setattr(catalogo_sqlite, "TAMANIO_LOTE", 2)
+    catalogo = CatalogoSQLite("Drama")
+    catalogo.agregar(Pelicula("Titanic", "Drama", 1997))
+    assert [p.nombre for p in catalogo.buscar("titanic")] == ["Titanic"]  # arma el índice de búsqueda
+
+    def peliculas():
+        yield Pelicula("Fantasma Uno", "Drama", 2001)
+        yield Pelicula("Fantasma Dos", "Drama", 2002)  # este lote ya se insertó cuando falla el siguiente
+        raise OSError("se cortó la lectura")
+
+    with pytest.raises(OSError):
+        catalogo.agregar_muchos(peliculas())
+    assert catalogo.cantidad() == 1
+    assert catalogo.buscar("fantasma") == []
+    assert catalogo.agregar_muchos([Pelicula("Fantasma Uno", "Drama", 2001)]).agregadas == 1
+    assert [p.nombre for p in catalogo.buscar("fantasma")] == ["Fantasma Uno"]
+    catalogo.cerrar()
+
+
+def test_migrar_bloquea_las_escrituras_al_txt(monkeypatch):
+    CatalogoPeliculas("Drama").agregar_muchos([Pelicula("Titanic", "Drama", 1997),
+                                               Pelicula("Zelig", "Drama", 1983)])
+    escritor = []
+    original = CatalogoSQLite.agregar_muchos
+
+    def copiar_mientras_otro_escribe(self, peliculas):
+        # otra instancia = otro lock de archivo, como si fuera otro proceso
+        hilo = threading.Thread(target=CatalogoPeliculas("Drama").agregar,
+                                args=(Pelicula("Tardía", "Drama", 2024),))
+        hilo.start()
+        hilo.join(0.3)
+        escritor.append(hilo)
+        assert hilo.is_alive()  # espera a que termine la migración
+        return original(self, peliculas)
+
+    monkeypatch.setattr(CatalogoSQLite, "agregar_muchos", copiar_mientras_otro_escribe)
+    assert migrar_desde_txt("Drama") == 2
+    escritor[0].join(5)
+    with open(os.path.join("catalogos", "Drama.txt.migrado"), encoding="utf-8") as f:
+        assert "Tardía" not in f.read()  # no quedó escondida en el respaldo
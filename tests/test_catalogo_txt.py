@@ -0,0 +1,172 @@
+# tests/test_catalogo_txt.py
+"""Ida y vuelta del motor txt: lo que se escribe se vuelve a leer igual."""
+
+import io
+import os
+
+import pytest
+
+from catalogo_peliculas import CatalogoPeliculas
+from importador import importar
+from pelicula import Pelicula
+
+
+def nombres(catalogo):
+    return [p.nombre for p in catalogo.iter_ordenado()]
+
+
+def test_titulo_reservado_no_se_pierde_como_baja():
+    catalogo = CatalogoPeliculas("Drama")
+    with pytest.raises(ValueError):
+        catalogo.agregar(Pelicula("#baja", "Drama", 2000))
+    resultado = catalogo.agregar_muchos([Pelicula("#baja", "Drama", 2000), Pelicula("Otra", "Drama", 2001)])
+    assert tuple(resultado) == (1, 1)
+    assert catalogo.cantidad() == 1
+    assert nombres(CatalogoPeliculas("Drama")) == ["Otra"]
+
+
+def test_importador_cuenta_titulo_reservado_como_invalido():
+    catalogo = CatalogoPeliculas("Drama")
+    resultado = importar(catalogo, io.StringIO("#baja | Drama | 2000\nBuena | Drama | 2001\n"), "txt")
+    assert tuple(resultado) == (1, 0, 1)
+    assert nombres(catalogo) == ["Buena"]
+
+
+def test_titulos_parecidos_a_la_marca_se_guardan():
+    catalogo = CatalogoPeliculas("Drama")
+    for titulo in ("#Alive", "#bajas", "#BAJA"):
+        assert catalogo.agregar(Pelicula(titulo, "Drama", 2020))
+    catalogo.compactar()
+    assert sorted(nombres(CatalogoPeliculas("Drama"))) == ["#Alive", "#BAJA", "#bajas"]
+
+
+# --- altas, bajas, compactación y sidecars ---
+
+def cargar(catalogo, n=30):
+    return catalogo.agregar_muchos([Pelicula(f"Película {i:02d}", "Drama", 1990 + i) for i in range(n)])
+
+
+def foto(catalogo):
+    """Todo lo que el catálogo responde, para comparar una instancia con otra."""
+    return (nombres(catalogo), catalogo.cantidad(), [p.nombre for p in catalogo.listar(5, 3)],
+            catalogo.obtener(-1).nombre, catalogo.contiene("película 03"), catalogo.contiene("PELÍCULA 04"),
+            catalogo.estadisticas().a_dict(), [p.nombre for p in catalogo.buscar("pelicula 2", 3)])
+
+
+def sidecars(catalogo):
+    carpeta = catalogo.base_dir
+    return sorted(a for a in os.listdir(carpeta)
+                  if a.startswith(os.path.basename(catalogo.ruta_archivo) + ".") and not a.endswith(".lock"))
+
+
+def test_altas_bajas_compactar_y_reabrir():
+    catalogo = CatalogoPeliculas("Drama")
+    assert tuple(cargar(catalogo)) == (30, 0)
+    assert tuple(cargar(catalogo, 2)) == (0, 2)  # ya estaban
+    assert catalogo.agregar(Pelicula("Amélie", "Drama", 2001))
+    assert catalogo.eliminar(Pelicula("película 03"))
+    assert not catalogo.eliminar(Pelicula("No Está"))
+    assert catalogo.eliminar_muchos([Pelicula("Película 10"), Pelicula("Película 11")]) == 2
+    esperado = foto(catalogo)
+    assert esperado[:4] == (["Amélie"] + [f"Película {i:02d}" for i in range(30) if i not in (3, 10, 11)],
+                            28, ["Película 05", "Película 06", "Película 07"], "Película 29")
+    assert esperado[4:6] == (False, True)
+    assert foto(CatalogoPeliculas("Drama")) == esperado
+
+    assert catalogo.compactar()
+    assert not catalogo.compactar()  # ya no hay bajas ni cola
+    with open(catalogo.ruta_archivo, encoding="utf-8") as f:
+        lineas = f.read().splitlines()
+    assert len(lineas) == 28 and not any(l.startswith("#baja") for l in lineas)
+    assert foto(catalogo) == esperado
+    assert foto(CatalogoPeliculas("Drama")) == esperado
+
+    # una baja y un alta de nuevo después de compactar (cola sobre el tramo ordenado)
+    assert catalogo.agregar(Pelicula("Película 03", "Drama", 1993))
+    assert catalogo.eliminar(Pelicula("Amélie"))
+    reabierto = CatalogoPeliculas("Drama")
+    assert nombres(reabierto)[:4] == ["Película 00", "Película 01", "Película 02", "Película 03"]
+    assert reabierto.obtener(0).nombre == "Película 00" and reabierto.cantidad() == 28
+    with pytest.raises(IndexError):
+        reabierto.obtener(28)
+
+
+@pytest.mark.parametrize("dano", ["borrar", "corromper"])
+def test_sidecars_danados_se_rearman(dano):
+    catalogo = CatalogoPeliculas("Drama")
+    cargar(catalogo)
+    catalogo.eliminar(Pelicula("Película 07"))
+    catalogo.compactar()
+    catalogo.agregar(Pelicula("Zelig", "Drama", 1983))  # cola después del tramo ordenado
+    esperado = foto(catalogo)
+    lista = sidecars(catalogo)
+    assert {"Drama.txt.idx", "Drama.txt.lineas", "Drama.txt.orden", "Drama.txt.stats"} <= set(lista)
+
+    for archivo in lista:
+        ruta = os.path.join(catalogo.base_dir, archivo)
+        if dano == "borrar":
+            os.remove(ruta)
+        else:
+            with open(ruta, "wb") as f:
+                f.write(b"\x00basura" * 7)
+    assert foto(CatalogoPeliculas("Drama")) == esperado
+    # se vuelven a escribir todos menos .orden, que solo lo arma compactar() (sin él todo es cola)
+    assert set(lista) - {"Drama.txt.orden"} <= set(sidecars(catalogo))
+
+
+def test_sidecars_viejos_no_se_usan_si_el_txt_cambio_por_fuera():
+    catalogo = CatalogoPeliculas("Drama")
+    cargar(catalogo)
+    catalogo.compactar()
+    foto(catalogo)  # deja todos los sidecars al día
+    with open(catalogo.ruta_archivo, "a", encoding="utf-8") as f:  # "otro programa" agrega y da de baja
+        f.write("Agregada A Mano | Drama | 2024\n#baja | película 00\n")
+    otro = CatalogoPeliculas("Drama")
+    assert otro.cantidad() == 30
+    assert otro.contiene("agregada a mano") and not otro.contiene("película 00")
+    assert nombres(otro)[0] == "Agregada A Mano" and otro.obtener(1).nombre == "Película 01"
+    assert otro.estadisticas().a_dict()["peliculas"] == 30
+
+
+def test_filtro_bloom_en_catalogo_grande(monkeypatch):
+    monkeypatch.setattr(CatalogoPeliculas, "MAX_CLAVES_EN_MEMORIA", 10)
+    catalogo = CatalogoPeliculas("Drama")
+    cargar(catalogo)
+    assert tuple(cargar(catalogo, 3)) == (0, 3)
+    assert catalogo.eliminar(Pelicula("Película 07"))
+    assert catalogo.agregar(Pelicula("Película 07", "Drama", 2007))  # la baja ya no la bloquea
+    assert "Drama.txt.bloom" in sidecars(catalogo)
+    esperado = foto(catalogo)
+    os.remove(os.path.join(catalogo.base_dir, "Drama.txt.bloom"))
+    otro = CatalogoPeliculas("Drama")
+    assert not otro.agregar(Pelicula("PELÍCULA 12"))
+    assert foto(otro) == esperado
+
+
+@pytest.mark.parametrize("sufijo", [".gz", ".xz"])
+def test_catalogo_comprimido_ida_y_vuelta(sufijo):
+    catalogo = CatalogoPeliculas("Drama")
+    cargar(catalogo)
+    catalogo.eliminar(Pelicula("Película 05"))
+    esperado = foto(catalogo)
+
+    assert catalogo.cambiar_compresion(sufijo)
+    assert not catalogo.cambiar_compresion(sufijo)
+    assert catalogo.ruta_archivo.endswith(".txt" + sufijo)
+    assert not os.path.exists(catalogo.ruta_base)
+    assert "Drama.txt.lineas" not in os.listdir(catalogo.base_dir)  # en un comprimido no sirve
+    assert foto(catalogo) == esperado
+    assert foto(CatalogoPeliculas("Drama")) == esperado
+
+    # se sigue agregando y dando de baja sobre el archivo comprimido
+    assert catalogo.agregar(Pelicula("Película 05", "Drama", 1995))
+    assert catalogo.eliminar(Pelicula("Película 06"))
+    assert catalogo.compactar()
+    reabierto = CatalogoPeliculas("Drama")
+    assert reabierto.ruta_archivo.endswith(sufijo)
+    assert "Película 05" in nombres(reabierto) and not reabierto.contiene("Película 06")
+
+    assert reabierto.cambiar_compresion("")
+    assert nombres(CatalogoPeliculas("Drama")) == nombres(reabierto)
+    assert [p.nombre for p in CatalogoPeliculas("Drama").listar(4, 3)] == ["Película 04", "Película 05",
+                                                                            "Película 07"]
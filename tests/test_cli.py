@@ -0,0 +1,95 @@
+# tests/test_cli.py
+import io
+import json
+
+import pytest
+
+import cli
+
+
+def correr(*argv):
+    """Corre un comando; retorna (código, registros de salida, texto de stderr)."""
+    salida, errores = io.StringIO(), io.StringIO()
+    codigo = cli.ejecutar(cli.crear_parser(), list(argv), cli.Salida("jsonl", salida), errores)
+    return codigo, [json.loads(l) for l in salida.getvalue().splitlines()], errores.getvalue()
+
+
+@pytest.fixture
+def infantiles():
+    for titulo, anio in (("Toy Story", "1995"), ("Shrek", "2001"), ("Cars", "2006")):
+        assert correr("add", "Infantiles", titulo, "--anio", anio)[0] == 0
+
+
+@pytest.mark.parametrize("opciones", [("--offset", "-1"), ("--limite", "-1")])
+def test_list_rechaza_paginas_negativas(infantiles, opciones):
+    codigo, registros, errores = correr("list", "Infantiles", *opciones)
+    assert codigo == 1 and registros == []
+    assert "negativos" in errores
+
+
+def test_list_pagina(infantiles):
+    codigo, registros, _ = correr("list", "Infantiles", "--offset", "1", "--limite", "1")
+    assert codigo == 0
+    assert [r["nombre"] for r in registros] == ["Shrek"]
+    assert correr("list", "Infantiles", "--limite", "0")[:2] == (0, [])
+
+
+@pytest.mark.parametrize("argv", [
+    ("volar",),                                      # comando inexistente
+    ("add", "Infantiles"),                           # falta el título
+    ("add", "Infantiles", "Up", "--anio", "dos mil"),
+    ("list", "--offset", "uno"),
+    ("--formato", "xml", "list"),
+])
+def test_uso_incorrecto_sale_con_2(argv):
+    assert correr(*argv)[0] == 2
+
+
+@pytest.mark.parametrize("argv", [
+    ("add", "Infantiles", "   "),                    # título vacío
+    ("add", "Infantiles", "#baja"),                  # se leería como una baja
+    ("delete", "NoExiste", "Shrek"),
+    ("list", "NoExiste"),
+    ("stats", "NoExiste"),
+    ("search", "shrek", "--catalogo", "NoExiste"),
+])
+def test_errores_del_comando_salen_con_1(argv):
+    codigo, registros, errores = correr(*argv)
+    assert codigo == 1 and registros == []
+    assert errores.startswith("error: ")
+
+
+def test_add_y_delete_informan_cada_titulo(infantiles):
+    assert correr("add", "Infantiles", "shrek")[1][0]["agregada"] is False  # ya estaba
+    codigo, registros, _ = correr("delete", "Infantiles", "Shrek", "Coco")
+    assert codigo == 0
+    assert {r["nombre"]: r["eliminada"] for r in registros} == {"Shrek": True, "Coco": False}
+
+
+def test_batch_sigue_despues_de_un_error(infantiles):
+    salida, errores = io.StringIO(), io.StringIO()
+    entrada = ["# comentario\n", "list Infantiles --offset -5\n", "list Infantiles --limite 1\n", "batch\n"]
+    codigo = cli.ejecutar_lote(cli.crear_parser(), entrada, cli.Salida("tsv", salida), errores)
+    assert codigo == 1
+    assert salida.getvalue() == "Infantiles\tCars\tInfantiles\t2006\n"
+    assert "línea 2" in errores.getvalue() and "línea 4" in errores.getvalue()
+
+
+def test_list_de_catalogos_ordenado():
+    for nombre in ("Terror", "accion", "Drama", "Comedia"):
+        correr("add", nombre, "Algo")
+    codigo, registros, _ = correr("list")
+    assert codigo == 0
+    assert [r["catalogo"] for r in registros] == ["accion", "Comedia", "Drama", "Terror"]
+
+
+def test_list_pagina_usa_listar(infantiles, monkeypatch):
+    from catalogo_peliculas import CatalogoPeliculas
+    pedidas = []
+    original = CatalogoPeliculas.listar
+    monkeypatch.setattr(CatalogoPeliculas, "listar",
+                        lambda self, offset=0, limite=None: pedidas.append((offset, limite))
+                        or original(self, offset, limite))
+    registros = correr("list", "Infantiles", "--offset", "2", "--limite", "5")[1]
+    assert [r["nombre"] for r in registros] == ["Toy Story"]
+    assert pedidas == [(2, 5)]  # la página sale de listar(), no de recorrer desde el principio
@@ -0,0 +1,43 @@
+# tests/test_escritura_segura.py
+import threading
+
+import pytest
+
+from escritura_segura import EXTENSION_LOCK, bloqueo_exclusivo, eliminar_lock
+
+fcntl = pytest.importorskip("fcntl")
+
+
+def lock_libre(ruta_lock) -> bool:
+    with open(ruta_lock, "a") as f:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        return True
+
+
+def test_quien_esperaba_un_lock_borrado_toma_el_nuevo(tmp_path):
+    # cada open() es un lock distinto: dos hilos compiten como dos procesos
+    ruta = str(tmp_path / "Drama.txt")
+    ruta_lock = ruta + EXTENSION_LOCK
+    adentro, soltar = threading.Event(), threading.Event()
+
+    def esperar_y_tomar():
+        with bloqueo_exclusivo(ruta):
+            adentro.set()
+            soltar.wait(5)
+
+    with bloqueo_exclusivo(ruta):
+        hilo = threading.Thread(target=esperar_y_tomar)
+        hilo.start()
+        assert not adentro.wait(0.2)  # espera el lock
+        eliminar_lock(ruta)  # como eliminar_catalogo(): con el lock todavía tomado
+    assert adentro.wait(5)
+    try:
+        assert not lock_libre(ruta_lock)  # un tercero no puede entrar al mismo tiempo
+    finally:
+        soltar.set()
+        hilo.join()
+    assert lock_libre(ruta_lock)
@@ -0,0 +1,55 @@
+# tests/test_formato_binario.py
+import os
+
+import pytest
+
+import formato_binario
+from catalogo_peliculas import CatalogoPeliculas
+from formato_binario import binario_a_txt
+from pelicula import Pelicula
+
+
+def test_binario_conserva_anios_fuera_de_u16():
+    catalogo = CatalogoPeliculas("Drama")
+    catalogo.agregar_muchos([Pelicula("Antigua", "Drama", -500), Pelicula("Futura", "Drama", 70000),
+                             Pelicula("Normal", "Drama", 1999)])
+    assert catalogo.compilar_binario() == 3
+    assert catalogo._lector_binario() is not None  # ahora se lee del .catb
+    assert {p.nombre: p.anio for p in catalogo.iter_peliculas()} == {"Antigua": -500, "Futura": 70000,
+                                                                     "Normal": 1999}
+
+
+def test_binario_rechaza_anio_que_no_entra():
+    catalogo = CatalogoPeliculas("Drama")
+    catalogo.agregar(Pelicula("Rara", "Drama", 10 ** 12))
+    with pytest.raises(ValueError):
+        catalogo.compilar_binario()
+    assert not os.path.exists(catalogo.ruta_binario)
+    assert [p.anio for p in catalogo.iter_peliculas()] == [10 ** 12]
+
+
+def test_a_txt_no_pisa_cambios_posteriores_al_binario(capsys):
+    catalogo = CatalogoPeliculas("Drama")
+    catalogo.agregar_muchos([Pelicula("Titanic", "Drama", 1997), Pelicula("Zelig", "Drama", 1983)])
+    catalogo.compilar_binario()
+    catalogo.agregar(Pelicula("Amélie", "Drama", 2001))
+    catalogo.eliminar(Pelicula("Zelig"))
+    esperado = [p.nombre for p in catalogo.iter_ordenado()]
+
+    with pytest.raises(ValueError):
+        with catalogo.bloqueo_escritura():
+            binario_a_txt(catalogo)
+    assert formato_binario.main(["a-txt", "Drama"]) == 1
+    assert "--forzar" in capsys.readouterr().out
+    assert [p.nombre for p in CatalogoPeliculas("Drama").iter_ordenado()] == esperado
+
+    assert formato_binario.main(["a-txt", "Drama", "--forzar"]) == 0
+    assert [p.nombre for p in CatalogoPeliculas("Drama").iter_ordenado()] == ["Titanic", "Zelig"]
+
+
+def test_a_txt_con_binario_al_dia():
+    catalogo = CatalogoPeliculas("Drama")
+    catalogo.agregar_muchos([Pelicula("Zelig", "Drama", 1983), Pelicula("Titanic", "Drama", 1997)])
+    catalogo.compilar_binario()
+    assert formato_binario.main(["a-txt", "Drama"]) == 0
+    assert [p.nombre for p in CatalogoPeliculas("Drama").iter_ordenado()] == ["Titanic", "Zelig"]
@@ -0,0 +1,24 @@
+# tests/test_metricas.py
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROGRAMA = ("from catalogo_peliculas import CatalogoPeliculas\n"
+            "from pelicula import Pelicula\n"
+            "CatalogoPeliculas('Drama').agregar(Pelicula('Titanic', 'Drama', 1997))\n")
+
+
+def correr(tmp_path, **entorno):
+    env = {k: v for k, v in os.environ.items() if not k.startswith("CATALOGO_METRICAS")}
+    env.update(entorno, PYTHONPATH=RAIZ)
+    subprocess.run([sys.executable, "-c", PROGRAMA], cwd=tmp_path, env=env, check=True)
+    return sorted(a for a in os.listdir(tmp_path / "catalogos") if a.startswith("metricas"))
+
+
+def test_importar_no_vuelca_metricas_al_salir(tmp_path):
+    assert correr(tmp_path) == []
+
+
+def test_volcado_opt_in(tmp_path):
+    assert correr(tmp_path, CATALOGO_METRICAS="1") == ["metricas.json", "metricas.prom"]
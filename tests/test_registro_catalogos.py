@@ -0,0 +1,36 @@
+# tests/test_registro_catalogos.py
+from catalogo_peliculas import CatalogoPeliculas
+from pelicula import Pelicula
+from registro_catalogos import RegistroCatalogos
+
+
+def con_caches(registro, nombre):
+    catalogo = registro.obtener(nombre)
+    catalogo.agregar_muchos([Pelicula(f"{nombre} {i}", "Drama", 2000) for i in range(20)])
+    catalogo.listar()  # arma las películas ordenadas en memoria
+    catalogo.buscar(nombre)  # y el índice de búsqueda
+    return catalogo
+
+
+def test_libera_el_menos_usado_al_pasar_el_presupuesto():
+    registro = RegistroCatalogos(presupuesto_bytes=1)
+    viejo = con_caches(registro, "Viejo")
+    assert viejo.memoria_estimada()
+    nuevo = registro.obtener("Nuevo")  # mide lo que creció "Viejo" desde que se lo pidió
+    assert viejo.memoria_estimada() == 0
+    con_caches(registro, "Nuevo")
+    registro.obtener("Nuevo")
+    assert nuevo.memoria_estimada()  # el que está en uso no se libera
+    assert registro.memoria_estimada() == nuevo.memoria_estimada()
+
+
+def test_obtener_no_mide_todos_los_catalogos(monkeypatch):
+    registro = RegistroCatalogos()
+    for i in range(50):
+        registro.obtener(f"Catalogo {i}")
+    medidas = []
+    original = CatalogoPeliculas.memoria_estimada
+    monkeypatch.setattr(CatalogoPeliculas, "memoria_estimada", lambda self: medidas.append(self) or original(self))
+    for i in range(50):
+        registro.obtener(f"Catalogo {i}")
+    assert len(medidas) <= 2 * 50  # el pedido y el anterior, no los 50 cada vez
@@ -0,0 +1,95 @@
+# tests/test_servidor_http.py
+import http.client
+import json
+import threading
+
+import pytest
+
+from pelicula import Pelicula
+from registro_catalogos import obtener_catalogo
+from servidor_http import crear_servidor
+
+
+@pytest.fixture
+def pedir():
+    """Servidor en un puerto libre; pedir(ruta, ...) → (estado, encabezados, cuerpo)."""
+    catalogo = obtener_catalogo("Drama")
+    catalogo.agregar_muchos([Pelicula("Titanic", "Drama", 1997), Pelicula("Amélie", "Drama", 2001),
+                             Pelicula("Zelig", "Drama", 1983)])
+    servidor = crear_servidor("127.0.0.1", 0)
+    hilo = threading.Thread(target=servidor.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    hilo.start()
+    conexion = http.client.HTTPConnection("127.0.0.1", servidor.server_address[1], timeout=5)
+
+    def pedir(ruta, metodo="GET", **encabezados):
+        conexion.request(metodo, ruta, headers={k.replace("_", "-"): v for k, v in encabezados.items()})
+        respuesta = conexion.getresponse()
+        cuerpo = respuesta.read()  # keep-alive: hay que leerla entera antes del próximo pedido
+        return respuesta.status, respuesta.headers, cuerpo
+
+    yield pedir
+    conexion.close()
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_listado_y_pagina(pedir):
+    estado, encabezados, cuerpo = pedir("/catalogos")
+    assert estado == 200 and encabezados["Content-Type"].startswith("application/json")
+    assert json.loads(cuerpo) == {"catalogos": [{"nombre": "Drama", "peliculas": 3}]}
+
+    estado, _, cuerpo = pedir("/catalogos/Drama/peliculas?offset=1&limite=1")
+    pagina = json.loads(cuerpo)
+    assert estado == 200 and pagina["total"] == 3
+    assert [p["nombre"] for p in pagina["peliculas"]] == ["Titanic"]
+    assert json.loads(pedir("/catalogos/Drama/peliculas?limite=0")[2])["limite"] == 1  # se acota al mínimo
+
+
+def test_etag_y_304(pedir):
+    estado, encabezados, cuerpo = pedir("/catalogos/Drama/peliculas")
+    etag = encabezados["ETag"]
+    assert estado == 200 and etag and encabezados["Cache-Control"] == "no-cache"
+
+    estado, encabezados, cuerpo_304 = pedir("/catalogos/Drama/peliculas", If_None_Match=etag)
+    assert estado == 304 and cuerpo_304 == b"" and encabezados["ETag"] == etag
+    assert pedir("/catalogos/Drama/peliculas", If_None_Match=f'"otro", W/{etag}')[0] == 304
+    assert pedir("/catalogos/Drama/peliculas", If_None_Match='"otro"')[0] == 200
+
+    # un cambio en el catálogo cambia el ETag y la respuesta (no se sirve la vieja del cache)
+    obtener_catalogo("Drama").agregar(Pelicula("Babel", "Drama", 2006))
+    estado, encabezados, cuerpo_nuevo = pedir("/catalogos/Drama/peliculas", If_None_Match=etag)
+    assert estado == 200 and encabezados["ETag"] != etag
+    assert json.loads(cuerpo_nuevo)["total"] == 4 and cuerpo_nuevo != cuerpo
+
+
+def test_head_sin_cuerpo(pedir):
+    estado, encabezados, cuerpo = pedir("/catalogos/Drama/estadisticas", metodo="HEAD")
+    assert estado == 200 and cuerpo == b""
+    assert int(encabezados["Content-Length"]) == len(pedir("/catalogos/Drama/estadisticas")[2])
+
+
+@pytest.mark.parametrize("ruta, estado", [
+    ("/catalogos/NoExiste/peliculas", 404),
+    ("/catalogos/..%2Fcatalogos%2FDrama/peliculas", 404),
+    ("/otra/ruta", 404),
+    ("/catalogos/Drama/peliculas?offset=uno", 400),
+    ("/buscar", 400),
+    ("/buscar?q=titanic&catalogo=NoExiste", 404),
+])
+def test_errores(pedir, ruta, estado):
+    obtenido, encabezados, cuerpo = pedir(ruta)
+    assert obtenido == estado and "ETag" not in encabezados
+    assert "error" in json.loads(cuerpo)
+
+
+def test_solo_lectura(pedir):
+    estado, encabezados, _ = pedir("/catalogos", metodo="POST")
+    assert estado == 405 and encabezados["Allow"] == "GET, HEAD"
+    assert pedir("/catalogos")[0] == 200  # la conexión sigue viva
+
+
+def test_buscar(pedir):
+    estado, _, cuerpo = pedir("/buscar?q=titanc")
+    assert estado == 200
+    assert [r["nombre"] for r in json.loads(cuerpo)["resultados"]][:1] == ["Titanic"]
+    assert json.loads(pedir("/buscar?q=titanc&exacta=1&catalogo=Drama")[2]) == {"resultados": []}
@@ -1,31 +1,113 @@
 # utils.py
+import atexit
 import os
+import reprlib
 import time
 from functools import wraps
-from typing import Callable
+from typing import Callable, Tuple
+from escritor_logs import escritor
+from metricas import registro as registro_metricas
+from perfilado import perfilador
 
-# Carpeta base donde se guardan catálogos y logs
+# Carpeta base donde se guardan catálogos y logs (la crea quien escribe en
+# ella, no el import: importar utils no toca el disco)
 BASE_DIR_CATALOGOS = "catalogos"
-os.makedirs(BASE_DIR_CATALOGOS, exist_ok=True)
+
+# Métricas: el volcado a disco es opt-in. Lo activan los programas (app.py,
+# gui_flet.py) con activar_volcado_metricas(), o cualquier proceso con
+# CATALOGO_METRICAS=1; importar utils (tests, otros scripts) no escribe nada.
+RUTA_METRICAS = os.path.join(BASE_DIR_CATALOGOS, "metricas")
+_volcado_metricas_activo = False
+
+
+def activar_volcado_metricas(ruta_base: str = RUTA_METRICAS) -> None:
+    """
+    Vuelca las métricas al salir y, si CATALOGO_METRICAS_INTERVALO tiene un
+    número de segundos, también periódicamente. La ruta se fija como absoluta
+    ahora: un chdir posterior no cambia dónde se escribe. Idempotente.
+    """
+    global _volcado_metricas_activo
+    if _volcado_metricas_activo:
+        return
+    _volcado_metricas_activo = True
+    ruta_base = os.path.abspath(ruta_base)
+    atexit.register(registro_metricas.volcar, ruta_base)
+    try:
+        intervalo = float(os.environ.get("CATALOGO_METRICAS_INTERVALO", "0"))
+    except ValueError:
+        intervalo = 0.0
+    if intervalo > 0:
+        registro_metricas.iniciar_volcado_periodico(ruta_base, intervalo)
+
+
+if os.environ.get("CATALOGO_METRICAS", "") not in ("", "0"):
+    activar_volcado_metricas()
+
+# Perfilado por muestreo (ver perfilado.py): apagado salvo que CATALOGO_PERFIL
+# nombre operaciones ("agregar,listar" o "*").
+if os.environ.get("CATALOGO_PERFIL"):
+    try:
+        _fraccion_perfil = float(os.environ.get("CATALOGO_PERFIL_FRACCION", "0.01"))
+    except ValueError:
+        _fraccion_perfil = 0.01
+    perfilador.configurar(os.environ["CATALOGO_PERFIL"].split(","), _fraccion_perfil,
+                          os.path.join(BASE_DIR_CATALOGOS, "perfiles"))
 
 # ===== Lambdas útiles =====
 normalizar_espacios: Callable[[str], str] = lambda s: " ".join(s.split())
 a_minusculas: Callable[[str], str] = lambda s: s.lower()
 
+# ===== Archivos =====
+def firma_archivo(ruta: str) -> Tuple[int, int]:
+    """
+    (tamaño, mtime en ns) de un archivo; (-1, -1) si no existe.
+    Sirve para saber si un cache/sidecar sigue correspondiendo al archivo.
+    """
+    try:
+        st = os.stat(ruta)
+    except FileNotFoundError:
+        return (-1, -1)
+    return (st.st_size, st.st_mtime_ns)
+
+def firma_identidad(ruta: str) -> Tuple[int, int, int]:
+    """
+    (tamaño, mtime en ns, inodo); (-1, -1, -1) si no existe.
+    Como firma_archivo(), pero detecta también que el archivo fue reemplazado
+    por otro (os.replace) aunque coincidan tamaño y mtime.
+    """
+    try:
+        st = os.stat(ruta)
+    except FileNotFoundError:
+        return (-1, -1, -1)
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+# ===== Formato de logs (se ejecuta en el hilo escritor, no en la llamada) =====
+# reprlib acota el largo: un argumento enorme (una lista de 100k películas,
+# un generador, un catálogo) no se convierte entero en texto.
+_repr_corto = reprlib.Repr()
+_repr_corto.maxstring = 80
+_repr_corto.maxother = 80
+_repr_corto.maxlist = _repr_corto.maxtuple = _repr_corto.maxdict = 5
+
+def _fmt_accion(ts: float, nombre_func: str, args: tuple, kwargs: dict, estado: str) -> str:
+    fecha = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+    return f"[{fecha}] {nombre_func} args={_repr_corto.repr(args)} kwargs={_repr_corto.repr(kwargs)} -> {estado}\n"
+
 # ===== Decoradores =====
 def log_accion(nombre_archivo_log: str = "acciones.log"):
     """
     Decorador que registra en catalogos/<archivo_log>:
     - nombre de la función
-    - args/kwargs simples
+    - args/kwargs simples (recortados con reprlib)
     - timestamp
+    La escritura la hace el hilo de escritor_logs: la llamada solo encola.
     """
     ruta_log = os.path.join(BASE_DIR_CATALOGOS, nombre_archivo_log)
 
     def _decorador(func):
         @wraps(func)
         def _wrapper(*args, **kwargs):
-            ts = time.strftime("%Y-%m-%d %H:%M:%S")
+            ts = time.time()
             try:
                 resultado = func(*args, **kwargs)
                 estado = "OK"
@@ -34,24 +116,32 @@ def log_accion(nombre_archivo_log: str = "acciones.log"):
                 estado = f"ERROR: {e}"
                 raise
             finally:
-                with open(ruta_log, "a", encoding="utf-8") as f:
-                    f.write(f"[{ts}] {func.__name__} args={repr(args)} kwargs={repr(kwargs)} -> {estado}\n")
+                escritor.encolar(ruta_log, _fmt_accion, ts, func.__name__, args, kwargs, estado)
         return _wrapper
     return _decorador
 
 def medir_tiempo(func):
     """
     Decorador simple para medir el tiempo de ejecución de una función.
-    Loggea en catalogos/tiempos.log
+    Alimenta el registro de metricas.py (conteos + histograma por operación);
+    con activar_volcado_metricas() el resumen se vuelca en catalogos/metricas.json
+    y catalogos/metricas.prom.
+    Si el perfilado está encendido para la operación, una fracción de las
+    llamadas corre bajo cProfile + tracemalloc (ver perfilado.py).
     """
-    ruta_log = os.path.join(BASE_DIR_CATALOGOS, "tiempos.log")
+    operacion = func.__name__
 
     @wraps(func)
     def _wrapper(*args, **kwargs):
         inicio = time.perf_counter()
-        resultado = func(*args, **kwargs)
-        dur = (time.perf_counter() - inicio) * 1000  # ms
-        with open(ruta_log, "a", encoding="utf-8") as f:
-            f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {func.__name__}: {dur:.2f} ms\n")
-        return resultado
+        error = True
+        try:
+            if perfilador.operaciones is not None and perfilador.elegir(operacion):
+                resultado = perfilador.perfilar(operacion, func, args, kwargs)
+            else:
+                resultado = func(*args, **kwargs)
+            error = False
+            return resultado
+        finally:
+            registro_metricas.observar(operacion, (time.perf_counter() - inicio) * 1000, error)  # ms
     return _wrapper